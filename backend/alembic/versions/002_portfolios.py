@@ -0,0 +1,64 @@
+"""Multiple portfolios
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "portfolios",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO portfolios (id, name, created_at) VALUES (1, 'Default', now())")
+    op.execute("SELECT setval('portfolios_id_seq', 1)")
+
+    op.add_column(
+        "portfolio_items",
+        sa.Column("portfolio_id", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.alter_column("portfolio_items", "portfolio_id", server_default=None)
+    op.create_foreign_key(
+        "portfolio_items_portfolio_id_fkey",
+        "portfolio_items",
+        "portfolios",
+        ["portfolio_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.drop_constraint("portfolio_items_contract_id_key", "portfolio_items", type_="unique")
+    op.create_unique_constraint(
+        "portfolio_items_portfolio_id_contract_id_key",
+        "portfolio_items",
+        ["portfolio_id", "contract_id"],
+    )
+    op.create_index("ix_portfolio_items_contract_id", "portfolio_items", ["contract_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_portfolio_items_contract_id", "portfolio_items")
+    op.drop_constraint(
+        "portfolio_items_portfolio_id_contract_id_key", "portfolio_items", type_="unique"
+    )
+    op.execute("DELETE FROM portfolio_items WHERE portfolio_id <> 1")
+    op.create_unique_constraint(
+        "portfolio_items_contract_id_key", "portfolio_items", ["contract_id"]
+    )
+    op.drop_constraint("portfolio_items_portfolio_id_fkey", "portfolio_items", type_="foreignkey")
+    op.drop_column("portfolio_items", "portfolio_id")
+    op.drop_table("portfolios")
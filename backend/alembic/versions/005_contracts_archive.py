@@ -0,0 +1,54 @@
+"""Contracts archive
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, energy_type, quantity_mwh, price_per_mwh, delivery_start, delivery_end, "
+    "location, status, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contracts_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("energy_type", sa.String(50), nullable=False),
+        sa.Column("quantity_mwh", sa.Numeric(12, 2), nullable=False),
+        sa.Column("price_per_mwh", sa.Numeric(10, 2), nullable=False),
+        sa.Column("delivery_start", sa.Date(), nullable=False),
+        sa.Column("delivery_end", sa.Date(), nullable=False),
+        sa.Column("location", sa.String(100), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "AVAILABLE", "RESERVED", "SOLD", name="contractstatus", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_contracts_archive_status", "contracts_archive", ["status"])
+
+
+def downgrade() -> None:
+    op.execute(f"INSERT INTO contracts ({COLUMNS}) SELECT {COLUMNS} FROM contracts_archive")
+    op.drop_index("ix_contracts_archive_status", "contracts_archive")
+    op.drop_table("contracts_archive")
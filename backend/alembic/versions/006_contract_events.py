@@ -0,0 +1,79 @@
+"""Contract events and checkpoints
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATE = (
+    "json_build_object("
+    "'energy_type', energy_type, "
+    "'quantity_mwh', quantity_mwh::text, "
+    "'price_per_mwh', price_per_mwh::text, "
+    "'delivery_start', delivery_start::text, "
+    "'delivery_end', delivery_end::text, "
+    "'location', location, "
+    "'status', initcap(status::text))"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contract_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("contract_id", sa.Integer(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("changes", sa.JSON(), nullable=False),
+        sa.Column("state", sa.JSON(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("contract_id", "seq"),
+    )
+    op.create_index("ix_contract_events_occurred_at", "contract_events", ["occurred_at"])
+    op.create_table(
+        "contract_checkpoints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("through_event_id", sa.Integer(), nullable=False),
+        sa.Column("through_occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_contract_checkpoints_through_occurred_at",
+        "contract_checkpoints",
+        ["through_occurred_at"],
+    )
+    op.create_table(
+        "contract_checkpoint_states",
+        sa.Column("checkpoint_id", sa.Integer(), nullable=False),
+        sa.Column("contract_id", sa.Integer(), nullable=False),
+        sa.Column("state", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["checkpoint_id"], ["contract_checkpoints.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("checkpoint_id", "contract_id"),
+    )
+    # Existing contracts start their history with a synthetic "created" event.
+    for table in ("contracts", "contracts_archive"):
+        op.execute(
+            "INSERT INTO contract_events (contract_id, seq, kind, changes, state, occurred_at) "
+            f"SELECT id, 1, 'created', {STATE}, {STATE}, created_at FROM {table} ORDER BY id"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("contract_checkpoint_states")
+    op.drop_index("ix_contract_checkpoints_through_occurred_at", "contract_checkpoints")
+    op.drop_table("contract_checkpoints")
+    op.drop_index("ix_contract_events_occurred_at", "contract_events")
+    op.drop_table("contract_events")
@@ -0,0 +1,40 @@
+"""Reference contracts from saved-search matches and index them for purging
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM saved_search_matches m "
+        "WHERE NOT EXISTS (SELECT 1 FROM contracts c WHERE c.id = m.contract_id)"
+    )
+    op.create_foreign_key(
+        "saved_search_matches_contract_id_fkey",
+        "saved_search_matches",
+        "contracts",
+        ["contract_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index("ix_saved_search_matches_contract_id", "saved_search_matches", ["contract_id"])
+    op.create_index("ix_saved_search_matches_matched_at", "saved_search_matches", ["matched_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_search_matches_matched_at", "saved_search_matches")
+    op.drop_index("ix_saved_search_matches_contract_id", "saved_search_matches")
+    op.drop_constraint(
+        "saved_search_matches_contract_id_fkey", "saved_search_matches", type_="foreignkey"
+    )
@@ -0,0 +1,14 @@
+from app.core.config import get_settings
+from app.core.invalidation import CONTRACTS_TOPIC, PORTFOLIOS_TOPIC, invalidation_bus
+from app.core.singleflight import SingleFlight
+from app.core.ttl_cache import TTLCache
+
+contracts_flight = SingleFlight("contracts")
+portfolio_flight = SingleFlight("portfolio")
+FLIGHTS = (contracts_flight, portfolio_flight)
+facets_cache = TTLCache("facets", get_settings().FACETS_CACHE_SECONDS)
+
+invalidation_bus.subscribe(CONTRACTS_TOPIC, contracts_flight.forget)
+invalidation_bus.subscribe(CONTRACTS_TOPIC, portfolio_flight.forget)
+invalidation_bus.subscribe(PORTFOLIOS_TOPIC, portfolio_flight.forget)
+invalidation_bus.subscribe(CONTRACTS_TOPIC, facets_cache.clear)
@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import weakref
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.db import get_db
+from app.services import idempotency_service
+
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+class Idempotency:
+    def __init__(
+        self,
+        db: AsyncSession,
+        key: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        replay: Optional[Response] = None,
+    ):
+        self.db = db
+        self.key = key
+        self.fingerprint = fingerprint
+        self.replay = replay
+
+    async def save(self, result: BaseModel, status_code: int) -> BaseModel:
+        if self.key is not None:
+            await idempotency_service.save_record(
+                self.db,
+                self.key,
+                self.fingerprint,
+                status_code,
+                result.model_dump_json(),
+                get_settings().IDEMPOTENCY_TTL_SECONDS,
+            )
+        return result
+
+
+async def idempotent_request(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
+):
+    if idempotency_key is None:
+        yield Idempotency(db)
+        return
+
+    body = await request.body()
+    fingerprint = hashlib.sha256(
+        b"\n".join([request.method.encode(), request.url.path.encode(), body])
+    ).hexdigest()
+    lock = _locks.setdefault(idempotency_key, asyncio.Lock())
+    async with lock:
+        await idempotency_service.lock_key(db, idempotency_key)
+        record = await idempotency_service.get_record(db, idempotency_key)
+        if record is not None and record.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        replay = None
+        if record is not None:
+            replay = Response(
+                content=record.response_body,
+                status_code=record.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+        yield Idempotency(db, idempotency_key, fingerprint, replay)
+        await db.commit()
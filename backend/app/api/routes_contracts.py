@@ -1,27 +1,68 @@
-from datetime import date
+import json
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.db import get_db
+from app.api.coalescing import contracts_flight, facets_cache
+from app.api.idempotency import Idempotency, idempotent_request
+from app.core.db import get_db, get_session_factory
 from app.schemas.contract import (
+    ContractBatchUpdate,
+    ContractBatchUpdateResponse,
     ContractCreate,
+    ContractFacetsResponse,
     ContractListResponse,
     ContractResponse,
     ContractUpdate,
 )
-from app.services import contract_service
+from app.services import contract_service, export_service, history_service
+from app.services.contract_index import contract_index
 from app.services.portfolio_service import get_portfolio_item_by_contract
 
 router = APIRouter()
 
 
 @router.post("", response_model=ContractResponse, status_code=status.HTTP_201_CREATED)
-async def create_contract(data: ContractCreate, db: AsyncSession = Depends(get_db)):
+async def create_contract(
+    data: ContractCreate,
+    db: AsyncSession = Depends(get_db),
+    idempotency: Idempotency = Depends(idempotent_request),
+):
+    if idempotency.replay is not None:
+        return idempotency.replay
     contract = await contract_service.create_contract(db, data.model_dump())
-    return contract
+    return await idempotency.save(
+        ContractResponse.model_validate(contract), status.HTTP_201_CREATED
+    )
+
+
+@router.patch("/batch", response_model=ContractBatchUpdateResponse)
+async def batch_update_contracts(data: ContractBatchUpdate, db: AsyncSession = Depends(get_db)):
+    if data.items is not None:
+        items = [item.model_dump(exclude_none=True) for item in data.items]
+        updated, skipped = await contract_service.batch_update_contracts(db, items)
+    else:
+        where = data.where.model_dump(exclude={"limit", "offset", "sort_by", "sort_dir"})
+        where["energy_types"] = where.pop("energy_type")
+        updated, skipped = await contract_service.update_matching_contracts(
+            db,
+            where,
+            data.set.model_dump(exclude_none=True) if data.set else {},
+            {name: (a.op, a.value) for name, a in data.adjust.items()},
+        )
+    return ContractBatchUpdateResponse(updated=updated, skipped=skipped)
+
+
+def _normalize(value):
+    if isinstance(value, Decimal):
+        return value.normalize()
+    if isinstance(value, list):
+        return tuple(sorted(set(value)))
+    return value
 
 
 @router.get("", response_model=ContractListResponse)
@@ -39,10 +80,9 @@ async def list_contracts(
     offset: int = Query(0, ge=0),
     sort_by: str = Query("id", pattern="^(price_per_mwh|quantity_mwh|delivery_start|id)$"),
     sort_dir: str = Query("asc", pattern="^(asc|desc)$"),
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
-    contracts, total = await contract_service.list_contracts(
-        db,
+    filters = dict(
         energy_types=energy_type,
         price_min=price_min,
         price_max=price_max,
@@ -57,24 +97,183 @@ async def list_contracts(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
-    return ContractListResponse(items=contracts, total=total, limit=limit, offset=offset)
+
+    if contract_index.supports(**filters):
+        contracts, total = contract_index.search(**filters)
+        return ContractListResponse(items=contracts, total=total, limit=limit, offset=offset)
+
+    async def load() -> ContractListResponse:
+        async with session_factory() as db:
+            contracts, total = await contract_service.list_contracts(db, **filters)
+            return ContractListResponse(items=contracts, total=total, limit=limit, offset=offset)
+
+    key = tuple((name, _normalize(value)) for name, value in filters.items())
+    return await contracts_flight.do(key, load)
+
+
+@router.get("/facets", response_model=ContractFacetsResponse)
+async def contract_facets(
+    energy_type: Optional[list[str]] = Query(None),
+    price_min: Optional[Decimal] = None,
+    price_max: Optional[Decimal] = None,
+    qty_min: Optional[Decimal] = None,
+    qty_max: Optional[Decimal] = None,
+    location: Optional[str] = None,
+    delivery_start_min: Optional[date] = None,
+    delivery_end_max: Optional[date] = None,
+    status_filter: Optional[str] = Query("Available", alias="status"),
+    price_bucket: Decimal = Query(Decimal("10"), gt=0),
+    qty_bucket: Decimal = Query(Decimal("100"), gt=0),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    filters = dict(
+        energy_types=energy_type,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        location=location,
+        delivery_start_min=delivery_start_min,
+        delivery_end_max=delivery_end_max,
+        status=status_filter,
+        price_bucket=price_bucket,
+        qty_bucket=qty_bucket,
+    )
+    key = tuple((name, _normalize(value)) for name, value in filters.items())
+    cached = facets_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = facets_cache.generation
+
+    async def load() -> ContractFacetsResponse:
+        async with session_factory() as db:
+            facets = await contract_service.facet_counts(db, **filters)
+            return ContractFacetsResponse(**facets)
+
+    response = await contracts_flight.do(("facets", key), load)
+    facets_cache.set(key, response, generation)
+    return response
+
+
+@router.get("/export")
+async def export_contracts(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet|arrow)$"),
+    energy_type: Optional[list[str]] = Query(None),
+    price_min: Optional[Decimal] = None,
+    price_max: Optional[Decimal] = None,
+    qty_min: Optional[Decimal] = None,
+    qty_max: Optional[Decimal] = None,
+    location: Optional[str] = None,
+    delivery_start_min: Optional[date] = None,
+    delivery_end_max: Optional[date] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    if export_format in export_service.COLUMNAR_FORMATS and not export_service.pyarrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{export_format} export requires pyarrow",
+        )
+
+    async def body():
+        async with session_factory() as db:
+            chunks = contract_service.stream_contracts(
+                db,
+                chunk_size=export_service.EXPORT_CHUNK_SIZE,
+                energy_types=energy_type,
+                price_min=price_min,
+                price_max=price_max,
+                qty_min=qty_min,
+                qty_max=qty_max,
+                location=location,
+                delivery_start_min=delivery_start_min,
+                delivery_end_max=delivery_end_max,
+                status=status_filter,
+            )
+            async for data in export_service.export_rows(chunks, export_format):
+                yield data
+
+    media_type, extension = export_service.EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="contracts.{extension}"'},
+    )
+
+
+def _ndjson(records) -> bytes:
+    return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode()
+
+
+@router.get("/as-of")
+async def contracts_as_of(
+    at: datetime, session_factory: async_sessionmaker = Depends(get_session_factory)
+):
+    async def body():
+        async with session_factory() as db:
+            async for chunk in history_service.stream_states_as_of(db, at):
+                yield _ndjson({"id": contract_id, **state} for contract_id, state in chunk)
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+async def _get_live_contract_or_error(db: AsyncSession, contract_id: int):
+    contract = await contract_service.get_contract(db, contract_id)
+    if contract:
+        return contract
+    if await contract_service.get_archived_contract(db, contract_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Archived contracts are read-only"
+        )
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
 
 
 @router.get("/{contract_id}", response_model=ContractResponse)
 async def get_contract(contract_id: int, db: AsyncSession = Depends(get_db)):
     contract = await contract_service.get_contract(db, contract_id)
+    if not contract:
+        contract = await contract_service.get_archived_contract(db, contract_id)
     if not contract:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
     return contract
 
 
+@router.get("/{contract_id}/history")
+async def get_contract_history(
+    contract_id: int,
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    # Deleted contracts have no row left, only their history.
+    exists = (
+        await contract_service.get_contract(db, contract_id)
+        or await contract_service.get_archived_contract(db, contract_id)
+        or await history_service.has_history(db, contract_id)
+    )
+    if not exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
+
+    async def body():
+        async with session_factory() as db:
+            async for rows in history_service.stream_history(db, contract_id):
+                yield _ndjson(
+                    {
+                        "seq": seq,
+                        "kind": kind,
+                        "changes": changes,
+                        "occurred_at": occurred_at.isoformat(),
+                    }
+                    for seq, kind, changes, occurred_at in rows
+                )
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
 @router.put("/{contract_id}", response_model=ContractResponse)
 async def update_contract(
     contract_id: int, data: ContractUpdate, db: AsyncSession = Depends(get_db)
 ):
-    contract = await contract_service.get_contract(db, contract_id)
-    if not contract:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
+    contract = await _get_live_contract_or_error(db, contract_id)
     update_data = data.model_dump(exclude_unset=True)
     if "delivery_start" in update_data or "delivery_end" in update_data:
         start = update_data.get("delivery_start", contract.delivery_start)
@@ -90,9 +289,7 @@ async def update_contract(
 
 @router.delete("/{contract_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contract(contract_id: int, db: AsyncSession = Depends(get_db)):
-    contract = await contract_service.get_contract(db, contract_id)
-    if not contract:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
+    contract = await _get_live_contract_or_error(db, contract_id)
     portfolio_item = await get_portfolio_item_by_contract(db, contract_id)
     if portfolio_item:
         raise HTTPException(
@@ -0,0 +1,92 @@
+import asyncio
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.coalescing import FLIGHTS, facets_cache
+from app.core.config import get_settings
+from app.core.profiler import Sampler, request_profiles, token_matches
+from app.services.contract_index import contract_index
+from app.services.search_index import search_index
+
+router = APIRouter()
+_profile_lock = asyncio.Lock()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    # Without a configured token the admin endpoints do not exist.
+    expected = get_settings().ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not token_matches(expected, x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.get("/singleflight")
+async def singleflight_stats():
+    return {flight.name: flight.stats() for flight in FLIGHTS}
+
+
+@router.get("/admission")
+async def admission_stats(request: Request):
+    return request.app.state.admission.stats()
+
+
+@router.get("/contract-index")
+async def contract_index_stats():
+    return contract_index.stats()
+
+
+@router.get("/facets-cache")
+async def facets_cache_stats():
+    return facets_cache.stats()
+
+
+@router.get("/search-index")
+async def search_index_stats():
+    return search_index.stats()
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(10, gt=0),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    interval_ms: float = Query(5, ge=1, le=100),
+):
+    """Sample this worker's threads for ``seconds``; one profile at a time per worker."""
+    if seconds > get_settings().PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"seconds must be at most {get_settings().PROFILE_MAX_SECONDS}",
+        )
+    if _profile_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profile already running")
+    async with _profile_lock:
+        sampler = Sampler(interval_ms / 1000, label_threads=True).start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            sampler.stop()
+    pid = os.getpid()
+    return _render(sampler, format, f"worker {pid}", f"profile-{pid}")
+
+
+@router.get("/profile/{profile_id}", dependencies=[Depends(require_admin)])
+async def request_profile(
+    profile_id: str, format: Literal["collapsed", "speedscope"] = "collapsed"
+):
+    """A recent ``X-Profile`` request profile taken by this worker."""
+    sampler = request_profiles.get(profile_id)
+    if sampler is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return _render(sampler, format, f"request {profile_id}", f"profile-{profile_id}")
+
+
+def _render(sampler: Sampler, format: str, name: str, filename: str):
+    headers = {"X-Profile-Samples": str(sampler.samples), "X-Worker-Pid": str(os.getpid())}
+    if format == "speedscope":
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.speedscope.json"'
+        return JSONResponse(sampler.speedscope(name), headers=headers)
+    return PlainTextResponse(sampler.collapsed(), headers=headers)
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.db import get_db
+from app.schemas.job import JobCreate, JobResponse
+from app.services import job_service
+from app.services.export_service import EXPORT_FORMATS
+from app.services.job_runner import JobRunner
+
+router = APIRouter()
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    return request.app.state.job_runner
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(data: JobCreate, runner: JobRunner = Depends(get_job_runner)):
+    try:
+        job_service.validate_job_params(data.kind, data.params)
+        return await runner.submit(data.kind, data.params)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+
+@router.post("/import", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_import(request: Request, runner: JobRunner = Depends(get_job_runner)):
+    """Import the request body, a JSON array of contracts."""
+    try:
+        name = await job_service.store_import(request.stream(), get_settings().IMPORT_MAX_BYTES)
+    except job_service.UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Import file too large"
+        )
+    return await runner.submit("import_contracts", {"file": name})
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await job_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/file")
+async def download_export(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await job_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    path = job_service.export_file(job)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No export file")
+    media_type = EXPORT_FORMATS[job.params.get("format", "csv")][0]
+    return FileResponse(path, media_type=media_type, filename=path.name)
@@ -1,37 +1,91 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.db import get_db
+from app.api.coalescing import portfolio_flight
+from app.api.idempotency import Idempotency, idempotent_request
+from app.core.db import get_db, get_session_factory
 from app.models.contract import ContractStatus
-from app.schemas.portfolio import PortfolioItemCreate, PortfolioItemResponse, PortfolioResponse
+from app.schemas.portfolio import (
+    PortfolioCreate,
+    PortfolioItemCreate,
+    PortfolioItemResponse,
+    PortfolioMetricsBatchRequest,
+    PortfolioMetricsEntry,
+    PortfolioResponse,
+    PortfolioSummary,
+)
 from app.services import contract_service, portfolio_service
 
 router = APIRouter()
 
 
-@router.post("/items", response_model=PortfolioItemResponse, status_code=status.HTTP_201_CREATED)
-async def add_to_portfolio(data: PortfolioItemCreate, db: AsyncSession = Depends(get_db)):
+async def _get_portfolio_or_404(db: AsyncSession, portfolio_id: int):
+    portfolio = await portfolio_service.get_portfolio_by_id(db, portfolio_id)
+    if not portfolio:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found")
+    return portfolio
+
+
+@router.post("", response_model=PortfolioSummary, status_code=status.HTTP_201_CREATED)
+async def create_portfolio(data: PortfolioCreate, db: AsyncSession = Depends(get_db)):
+    return await portfolio_service.create_portfolio(db, data.name)
+
+
+@router.post("/metrics", response_model=list[PortfolioMetricsEntry])
+async def get_portfolio_metrics_batch(
+    data: PortfolioMetricsBatchRequest, db: AsyncSession = Depends(get_db)
+):
+    metrics = await portfolio_service.get_portfolio_metrics_batch(db, data.portfolio_ids)
+    return [
+        PortfolioMetricsEntry(portfolio_id=portfolio_id, metrics=metrics[portfolio_id])
+        for portfolio_id in dict.fromkeys(data.portfolio_ids)
+        if portfolio_id in metrics
+    ]
+
+
+@router.post(
+    "/{portfolio_id}/items",
+    response_model=PortfolioItemResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_to_portfolio(
+    portfolio_id: int,
+    data: PortfolioItemCreate,
+    db: AsyncSession = Depends(get_db),
+    idempotency: Idempotency = Depends(idempotent_request),
+):
+    if idempotency.replay is not None:
+        return idempotency.replay
+    await _get_portfolio_or_404(db, portfolio_id)
     contract = await contract_service.get_contract(db, data.contract_id)
     if not contract:
+        if await contract_service.get_archived_contract(db, data.contract_id):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Contract is archived")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
     if contract.status != ContractStatus.AVAILABLE:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Contract is {contract.status.value}, only Available contracts can be added",
         )
-    existing = await portfolio_service.get_portfolio_item_by_contract(db, data.contract_id)
+    existing = await portfolio_service.get_portfolio_item(db, portfolio_id, data.contract_id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Contract already in portfolio"
         )
-    item = await portfolio_service.add_to_portfolio(db, contract)
+    item = await portfolio_service.add_to_portfolio(db, portfolio_id, contract)
     await db.refresh(item, ["contract"])
-    return item
+    return await idempotency.save(
+        PortfolioItemResponse.model_validate(item), status.HTTP_201_CREATED
+    )
 
 
-@router.delete("/items/{contract_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_from_portfolio(contract_id: int, db: AsyncSession = Depends(get_db)):
-    item = await portfolio_service.get_portfolio_item_by_contract(db, contract_id)
+@router.delete("/{portfolio_id}/items/{contract_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_from_portfolio(
+    portfolio_id: int, contract_id: int, db: AsyncSession = Depends(get_db)
+):
+    item = await portfolio_service.get_portfolio_item(db, portfolio_id, contract_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contract not in portfolio"
@@ -39,7 +93,21 @@ async def remove_from_portfolio(contract_id: int, db: AsyncSession = Depends(get
     await portfolio_service.remove_from_portfolio(db, item)
 
 
-@router.get("", response_model=PortfolioResponse)
-async def get_portfolio(db: AsyncSession = Depends(get_db)):
-    items, metrics = await portfolio_service.get_portfolio(db)
-    return PortfolioResponse(items=items, metrics=metrics)
+@router.get("/{portfolio_id}", response_model=PortfolioResponse)
+async def get_portfolio(
+    portfolio_id: int, session_factory: async_sessionmaker = Depends(get_session_factory)
+):
+    async def load() -> Optional[PortfolioResponse]:
+        async with session_factory() as db:
+            portfolio = await portfolio_service.get_portfolio_by_id(db, portfolio_id)
+            if not portfolio:
+                return None
+            items, metrics = await portfolio_service.get_portfolio(db, portfolio_id)
+            return PortfolioResponse(
+                id=portfolio.id, name=portfolio.name, items=items, metrics=metrics
+            )
+
+    response = await portfolio_flight.do(portfolio_id, load)
+    if response is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found")
+    return response
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_db
+from app.schemas.saved_search import (
+    SavedSearchCreate,
+    SavedSearchMatchResponse,
+    SavedSearchResponse,
+)
+from app.services import saved_search_service
+
+router = APIRouter()
+
+
+async def _get_saved_search_or_404(db: AsyncSession, search_id: int):
+    search = await saved_search_service.get_saved_search(db, search_id)
+    if not search:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved search not found")
+    return search
+
+
+@router.post("", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED)
+async def create_saved_search(data: SavedSearchCreate, db: AsyncSession = Depends(get_db)):
+    criteria = data.criteria.model_dump(mode="json", exclude_none=True)
+    return await saved_search_service.create_saved_search(db, data.name, criteria)
+
+
+@router.get("/{search_id}", response_model=SavedSearchResponse)
+async def get_saved_search(search_id: int, db: AsyncSession = Depends(get_db)):
+    return await _get_saved_search_or_404(db, search_id)
+
+
+@router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_saved_search(search_id: int, db: AsyncSession = Depends(get_db)):
+    search = await _get_saved_search_or_404(db, search_id)
+    await saved_search_service.delete_saved_search(db, search)
+
+
+@router.get("/{search_id}/matches", response_model=list[SavedSearchMatchResponse])
+async def list_matches(
+    search_id: int,
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    await _get_saved_search_or_404(db, search_id)
+    return await saved_search_service.list_matches(db, search_id, after_id, limit)
+
+
+@router.delete("/{search_id}/matches", status_code=status.HTTP_204_NO_CONTENT)
+async def acknowledge_matches(
+    search_id: int,
+    through_id: int = Query(..., ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    await _get_saved_search_or_404(db, search_id)
+    await saved_search_service.acknowledge_matches(db, search_id, through_id)
@@ -0,0 +1,182 @@
+import json
+import math
+import re
+import time
+from typing import Callable, Optional
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.pool import PoolWaitMonitor, pool_wait
+
+EXEMPT_PATHS = frozenset({"/health", "/ready"})
+_PORTFOLIO_READ = re.compile(r"^/portfolio/\d+/?$")
+
+
+def classify(method: str, path: str, query_string: bytes, deep_offset: int) -> Optional[str]:
+    """Name of the capped route class for expensive requests, or None."""
+    path = path.rstrip("/") or "/"
+    if method == "GET" and path == "/contracts":
+        params = parse_qs(query_string.decode("latin-1"))
+        try:
+            offset = int(params.get("offset", ["0"])[0])
+        except ValueError:
+            offset = 0
+        if offset >= deep_offset or params.get("location", [""])[0]:
+            return "contracts.search"
+        return None
+    if method == "GET" and path == "/contracts/facets":
+        return "contracts.search"
+    if method == "GET" and path == "/contracts/export":
+        return "contracts.export"
+    if method == "GET" and _PORTFOLIO_READ.match(path):
+        return "portfolio.read"
+    if method == "POST" and path == "/portfolio/metrics":
+        return "portfolio.metrics"
+    return None
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def acquire(self, client: str, now: float) -> float:
+        """Take a token for ``client``; returns 0 or the seconds until one is available."""
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._prune(now)
+            bucket = self._buckets[client] = TokenBucket(self.burst, now)
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+        bucket.updated = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / self.rate
+
+    def _prune(self, now: float) -> None:
+        refill = self.burst / self.rate
+        self._buckets = {
+            client: bucket
+            for client, bucket in self._buckets.items()
+            if now - bucket.updated < refill
+        }
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        route_limits: dict[str, int],
+        pool_wait_threshold: float,
+        retry_after: int = 1,
+        deep_offset: int = 1000,
+        monitor: PoolWaitMonitor = pool_wait,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limiter = RateLimiter(rate, burst) if rate > 0 else None
+        self.route_limits = route_limits
+        self.pool_wait_threshold = pool_wait_threshold
+        self.retry_after = retry_after
+        self.deep_offset = deep_offset
+        self.monitor = monitor
+        self.clock = clock
+        self.inflight: dict[str, int] = {}
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed: dict[str, int] = {}
+
+    def stats(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": dict(self.shed),
+            "inflight": dict(self.inflight),
+            "pool_wait_ms": round(self.monitor.current() * 1000, 1),
+        }
+
+    def reset(self) -> None:
+        if self.limiter is not None:
+            self.limiter.reset()
+        self.inflight.clear()
+        self.shed.clear()
+        self.admitted = 0
+        self.rate_limited = 0
+
+    def admit(self, client: str, route: Optional[str]) -> Optional[tuple[int, int]]:
+        """Reserve a slot, or return the (status, retry_after) to reject with."""
+        now = self.clock()
+        if self.limiter is not None:
+            wait = self.limiter.acquire(client, now)
+            if wait:
+                self.rate_limited += 1
+                return 429, max(1, math.ceil(wait))
+        if route is not None:
+            limit = self.route_limits.get(route)
+            overloaded = self.monitor.current(now) > self.pool_wait_threshold
+            if overloaded or (limit is not None and self.inflight.get(route, 0) >= limit):
+                self.shed[route] = self.shed.get(route, 0) + 1
+                return 503, self.retry_after
+            self.inflight[route] = self.inflight.get(route, 0) + 1
+        self.admitted += 1
+        return None
+
+    def release(self, route: Optional[str]) -> None:
+        if route is not None:
+            self.inflight[route] -= 1
+
+
+async def _reject(send: Send, status_code: int, retry_after: int) -> None:
+    detail = "Too many requests" if status_code == 429 else "Server busy, retry later"
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route = classify(
+            scope["method"], scope["path"], scope["query_string"], self.controller.deep_offset
+        )
+        client = scope["client"][0] if scope.get("client") else ""
+        rejection = self.controller.admit(client, route)
+        if rejection is not None:
+            await _reject(send, *rejection)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route)
@@ -0,0 +1,124 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        token, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(token.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = "content-encoding" in headers or not content_type.startswith(
+                    COMPRESSIBLE_TYPES
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = (
+                    _BrotliCompressor(self.brotli_quality)
+                    if encoding == "br"
+                    else _GzipCompressor(self.gzip_level)
+                )
+                body = compressor.compress(body) if more_body else compressor.finish(body)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+            else:
+                body = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,10 +1,31 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import time
+from typing import AsyncIterator
+
+from sqlalchemy import Row, Select, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import get_settings
+from app.core.pool import TimedQueuePool
+
+
+def _pool_options(database_url: str) -> dict:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {"poolclass": TimedQueuePool}
+
 
 settings = get_settings()
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = create_async_engine(
+    settings.DATABASE_URL, echo=settings.DEBUG, **_pool_options(settings.DATABASE_URL)
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -20,3 +41,42 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> async_sessionmaker:
+    return async_session
+
+
+async def stream_partitions(
+    db: AsyncSession, query: Select, chunk_size: int
+) -> AsyncIterator[list[Row]]:
+    result = await db.stream(query.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+def get_engine() -> AsyncEngine:
+    return engine
+
+
+async def ping(db_engine: AsyncEngine) -> None:
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def wait_for_db(db_engine: AsyncEngine, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while True:
+        try:
+            await ping(db_engine)
+            return
+        except Exception:
+            if time.monotonic() + delay > deadline:
+                raise
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2)
+
+
+async def warm_pool(db_engine: AsyncEngine, connections: int) -> None:
+    await asyncio.gather(*(ping(db_engine) for _ in range(connections)))
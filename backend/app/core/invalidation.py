@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "app_invalidation"
+CONTRACTS_TOPIC = "contracts"
+PORTFOLIOS_TOPIC = "portfolios"
+SAVED_SEARCHES_TOPIC = "saved_searches"
+RECONNECT_MAX_DELAY = 30
+
+
+class InvalidationBus:
+    def __init__(self):
+        self._handlers: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._dsn: Optional[str] = None
+        self._connection = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    @property
+    def listening(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def subscribe(self, topic: str, handler: Callable[[], None]) -> None:
+        self._handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: Callable[[], None]) -> None:
+        if handler in self._handlers.get(topic, []):
+            self._handlers[topic].remove(handler)
+
+    async def start(self, database_url: str) -> None:
+        url = make_url(database_url)
+        if url.get_backend_name() != "postgresql":
+            return
+        self._dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        await self._connect()
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+    async def publish(self, topic: str, db: Optional[AsyncSession] = None) -> None:
+        if not self.listening:
+            self.dispatch(topic)
+        elif db is not None:
+            await db.execute(select(func.pg_notify(CHANNEL, topic)))
+        else:
+            await self._connection.execute("SELECT pg_notify($1, $2)", CHANNEL, topic)
+
+    def dispatch(self, topic: str) -> None:
+        for handler in list(self._handlers.get(topic, [])):
+            try:
+                handler()
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", topic)
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        self._connection = await asyncpg.connect(self._dsn)
+        await self._connection.add_listener(CHANNEL, self._on_notify)
+        self._connection.add_termination_listener(self._on_terminated)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.dispatch(payload)
+
+    def _on_terminated(self, connection) -> None:
+        if self._connection is connection:
+            logger.warning("Invalidation listener disconnected, reconnecting")
+            self._connection = None
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1
+        while True:
+            try:
+                await self._connect()
+            except Exception:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            for topic in list(self._handlers):
+                self.dispatch(topic)
+            self._reconnect_task = None
+            return
+
+
+invalidation_bus = InvalidationBus()
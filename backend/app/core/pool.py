@@ -0,0 +1,38 @@
+import time
+from typing import Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolWaitMonitor:
+    """Decaying average of connection checkout time, in seconds."""
+
+    def __init__(self, half_life: float = 1.0, weight: float = 0.3):
+        self.half_life = half_life
+        self.weight = weight
+        self._value = 0.0
+        self._at = 0.0
+
+    def current(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        return self._value * 0.5 ** ((now - self._at) / self.half_life)
+
+    def observe(self, seconds: float, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._value = self.current(now) * (1 - self.weight) + seconds * self.weight
+        self._at = now
+
+    def reset(self) -> None:
+        self._value = 0.0
+
+
+pool_wait = PoolWaitMonitor()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - start)
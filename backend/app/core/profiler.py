@@ -0,0 +1,278 @@
+import asyncio
+import base64
+import os
+import secrets
+import sys
+import threading
+import uuid
+import weakref
+import zlib
+from collections import Counter, OrderedDict
+from functools import partial
+from typing import Callable, Optional, Union
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+REQUEST_SAMPLE_INTERVAL = 0.001
+# Proxies and servers commonly cap a response header at 4-8 KB; a larger profile
+# is only available by id.
+MAX_PROFILE_HEADER_BYTES = 4096
+STORED_PROFILES = 32
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Written by the event loop whenever a task steps; read from the sampler thread to
+# attribute a sample to a request. Missing on interpreters that store it elsewhere,
+# in which case request profiles keep every sample taken on the loop thread.
+_current_tasks: Optional[dict] = getattr(asyncio.tasks, "_current_tasks", None)
+
+Frame = Union[str, object]
+
+
+def token_matches(expected: Optional[str], provided: Optional[str]) -> bool:
+    if not expected or provided is None:
+        return False
+    return secrets.compare_digest(expected.encode(), provided.encode())
+
+
+class Sampler:
+    """Reads Python stacks every ``interval`` seconds from a background thread.
+
+    Samples every thread but its own, or only ``thread_ids``; ``keep``, called on
+    the sampler thread, can drop a sample. Stacks are counted as tuples of code
+    objects (with a leading thread label when ``label_threads``) and only turned
+    into names when rendered, so a sample costs a frame walk and a dict update.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        thread_ids: Optional[set[int]] = None,
+        keep: Optional[Callable[[], bool]] = None,
+        label_threads: bool = False,
+    ):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.keep = keep
+        self.label_threads = label_threads
+        self.counts: Counter[tuple[Frame, ...]] = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Sampler":
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "Sampler":
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            if self.keep is not None and not self.keep():
+                continue
+            names = {t.ident: t.name for t in threading.enumerate()} if self.label_threads else {}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if self.label_threads:
+                    stack.append(f"thread {names.get(ident, ident)}")
+                stack.reverse()
+                self.counts[tuple(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format: ``root;...;leaf count`` per line."""
+        return "".join(
+            ";".join(_describe(frame)[0] for frame in stack) + f" {count}\n"
+            for stack, count in self.counts.most_common()
+        )
+
+    def speedscope(self, name: str) -> dict:
+        frames: list[dict] = []
+        index: dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.counts.most_common():
+            sample = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    label, filename, line = _describe(frame)
+                    frames.append({"name": label, "file": filename, "line": line})
+                sample.append(index[frame])
+            samples.append(sample)
+            weights.append(round(count * self.interval * 1000, 3))
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "energy-marketplace",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+def _describe(frame: Frame) -> tuple[str, Optional[str], Optional[int]]:
+    if isinstance(frame, str):
+        return frame, None, None
+    filename = frame.co_filename
+    if filename.startswith(_ROOT):
+        filename = os.path.relpath(filename, _ROOT)
+    else:
+        filename = os.path.basename(filename)
+    line = frame.co_firstlineno
+    return f"{frame.co_qualname} ({filename}:{line})", filename, line
+
+
+# Tasks spawned by a profiled request (singleflight loads, gathers) are followed
+# through the loop's task factory, installed only while a request profile runs.
+_tracked: dict[asyncio.AbstractEventLoop, list[weakref.WeakSet]] = {}
+_previous_factories: dict[asyncio.AbstractEventLoop, Optional[Callable]] = {}
+
+
+def _task_factory(previous, loop, coro, **kwargs):
+    if previous is None:
+        task = asyncio.Task(coro, loop=loop, **kwargs)
+    else:
+        task = previous(loop, coro, **kwargs)
+    parent = asyncio.current_task(loop)
+    if parent is not None:
+        for tasks in _tracked.get(loop, ()):
+            if parent in tasks:
+                tasks.add(task)
+    return task
+
+
+def _track(loop: asyncio.AbstractEventLoop, tasks: weakref.WeakSet) -> None:
+    if loop not in _tracked:
+        previous = loop.get_task_factory()
+        _previous_factories[loop] = previous
+        loop.set_task_factory(partial(_task_factory, previous))
+    _tracked.setdefault(loop, []).append(tasks)
+
+
+def _untrack(loop: asyncio.AbstractEventLoop, tasks: weakref.WeakSet) -> None:
+    tracked = _tracked[loop]
+    tracked.remove(tasks)
+    if not tracked:
+        del _tracked[loop]
+        loop.set_task_factory(_previous_factories.pop(loop))
+
+
+def _running_in(loop: asyncio.AbstractEventLoop, tasks: weakref.WeakSet) -> bool:
+    return _current_tasks is None or _current_tasks.get(loop) in tasks
+
+
+def encode_profile(collapsed: str) -> str:
+    return base64.b64encode(zlib.compress(collapsed.encode())).decode()
+
+
+class ProfileStore:
+    """The last ``size`` request profiles of this worker, by id."""
+
+    def __init__(self, size: int = STORED_PROFILES):
+        self.size = size
+        self._profiles: OrderedDict[str, Sampler] = OrderedDict()
+
+    def add(self, sampler: Sampler) -> str:
+        profile_id = uuid.uuid4().hex
+        self._profiles[profile_id] = sampler
+        while len(self._profiles) > self.size:
+            self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Sampler]:
+        return self._profiles.get(profile_id)
+
+
+request_profiles = ProfileStore()
+
+
+class RequestProfilingMiddleware:
+    """Profiles a single request sent with ``X-Profile`` and a valid ``X-Admin-Token``.
+
+    Only samples taken while the request's task, or a task it spawned, is running
+    on the event loop are kept. The profile covers the request up to its response
+    headers. It is stored under ``X-Profile-Id`` for GET /debug/profile/{id} and,
+    when it fits in ``max_header_bytes``, also returned in ``X-Profile`` as
+    zlib-compressed, base64-encoded collapsed stacks. Not installed at all unless
+    ADMIN_TOKEN is set.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str,
+        interval: float = REQUEST_SAMPLE_INTERVAL,
+        max_header_bytes: int = MAX_PROFILE_HEADER_BYTES,
+        store: ProfileStore = request_profiles,
+    ):
+        self.app = app
+        self.token = token
+        self.interval = interval
+        self.max_header_bytes = max_header_bytes
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if "x-profile" not in headers or not token_matches(
+            self.token, headers.get("x-admin-token")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        tasks = weakref.WeakSet([asyncio.current_task()])
+        _track(loop, tasks)
+        sampler = Sampler(
+            self.interval,
+            thread_ids={threading.get_ident()},
+            keep=partial(_running_in, loop, tasks),
+        ).start()
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            finished = True
+            sampler.stop()
+            _untrack(loop, tasks)
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start" and not finished:
+                finish()
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("X-Profile-Id", self.store.add(sampler))
+                response_headers.append("X-Profile-Samples", str(sampler.samples))
+                response_headers.append("X-Worker-Pid", str(os.getpid()))
+                encoded = encode_profile(sampler.collapsed())
+                if len(encoded) <= self.max_header_bytes:
+                    response_headers.append("X-Profile", encoded)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            if not finished:
+                finish()
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.db import ping, warm_pool
+
+Warmer = Callable[[], Awaitable[None]]
+
+
+class Readiness:
+    def __init__(self):
+        self.warmers: list[Warmer] = []
+        self.warmed = False
+        self._lock = asyncio.Lock()
+
+    def register(self, warmer: Warmer) -> None:
+        self.warmers.append(warmer)
+
+    async def check(self, db_engine: AsyncEngine, pool_connections: int) -> None:
+        if self.warmed:
+            await ping(db_engine)
+            return
+        async with self._lock:
+            if self.warmed:
+                return
+            await warm_pool(db_engine, pool_connections)
+            for warmer in self.warmers:
+                await warmer()
+            self.warmed = True
+
+
+readiness = Readiness()
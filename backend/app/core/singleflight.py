@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def saved(self) -> int:
+        return self.calls - self.executions
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "saved": self.saved,
+            "inflight": len(self._inflight),
+        }
+
+    def forget(self) -> None:
+        self._inflight.clear()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._discard(key, done))
+        return await asyncio.shield(task)
+
+    def _discard(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
@@ -0,0 +1,49 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire after ``ttl`` seconds.
+
+    ``clear`` bumps a generation counter; a value computed before the clear is
+    dropped by ``set`` instead of being cached stale.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "generation": self.generation,
+        }
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if generation != self.generation or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
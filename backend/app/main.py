@@ -1,12 +1,31 @@
+import inspect
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.api.routes_contracts import router as contracts_router
+from app.api.routes_debug import router as debug_router
+from app.api.routes_jobs import router as jobs_router
 from app.api.routes_portfolio import router as portfolio_router
+from app.api.routes_saved_searches import router as saved_searches_router
+from app.core.admission import AdmissionController, AdmissionMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
+from app.core.db import async_session, engine, get_engine
+from app.core.invalidation import invalidation_bus
+from app.core.profiler import RequestProfilingMiddleware
+from app.core.readiness import readiness
+from app.core.responses import ORJSONResponse
+from app.services.contract_index import contract_index, numpy_available
+from app.services.job_runner import JobRunner
+from app.services.job_service import JOB_HANDLERS, RESUMABLE_JOB_KINDS
+from app.services.search_index import search_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,8 +34,48 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting Energy Marketplace API")
+    settings = get_settings()
+    await invalidation_bus.start(settings.DATABASE_URL)
+    # The leader holds one connection for its advisory lock; a dedicated unpooled
+    # engine keeps it out of the request pool.
+    lock_engine = (
+        create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        if engine.dialect.name == "postgresql"
+        else None
+    )
+    app.state.job_runner = JobRunner(
+        async_session,
+        JOB_HANDLERS,
+        resumable=RESUMABLE_JOB_KINDS,
+        concurrency=settings.JOB_CONCURRENCY,
+        process_workers=settings.JOB_PROCESS_WORKERS,
+        lock_engine=lock_engine,
+        schedule=settings.JOB_SCHEDULE,
+    )
+    await app.state.job_runner.start()
+    if settings.CONTRACT_INDEX_ENABLED:
+        if numpy_available():
+            await contract_index.start(async_session, settings.CONTRACT_INDEX_RECONCILE_SECONDS)
+        else:
+            logger.warning("CONTRACT_INDEX_ENABLED is set but numpy is not installed")
+    await search_index.start(async_session, settings.SAVED_SEARCH_RECONCILE_SECONDS)
     yield
     logger.info("Shutting down Energy Marketplace API")
+    await search_index.stop()
+    if contract_index.enabled:
+        await contract_index.stop()
+    await app.state.job_runner.stop()
+    if lock_engine is not None:
+        await lock_engine.dispose()
+    await invalidation_bus.stop()
+
+
+def _response_class_options() -> dict:
+    # Newer FastAPI releases serialize response models straight to JSON bytes in
+    # pydantic-core, which is faster than orjson; a custom default class disables that.
+    if "dump_json" in inspect.signature(serialize_response).parameters:
+        return {}
+    return {"default_response_class": ORJSONResponse}
 
 
 def create_app() -> FastAPI:
@@ -26,7 +85,17 @@ def create_app() -> FastAPI:
         description="API for browsing and managing energy supply contracts",
         version="1.0.0",
         lifespan=lifespan,
+        **_response_class_options(),
+    )
+    app.state.admission = AdmissionController(
+        rate=settings.RATE_LIMIT_PER_SECOND,
+        burst=settings.RATE_LIMIT_BURST,
+        route_limits=settings.ROUTE_CONCURRENCY,
+        pool_wait_threshold=settings.POOL_WAIT_SHED_MS / 1000,
+        retry_after=settings.SHED_RETRY_AFTER,
+        deep_offset=settings.DEEP_OFFSET,
     )
+    app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.CORS_ORIGINS,
@@ -34,13 +103,30 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+    if settings.ADMIN_TOKEN:
+        app.add_middleware(RequestProfilingMiddleware, token=settings.ADMIN_TOKEN)
     app.include_router(contracts_router, prefix="/contracts", tags=["contracts"])
     app.include_router(portfolio_router, prefix="/portfolio", tags=["portfolio"])
+    app.include_router(saved_searches_router, prefix="/saved-searches", tags=["saved-searches"])
+    app.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
+    app.include_router(debug_router, prefix="/debug", tags=["debug"])
 
     @app.get("/health")
     async def health():
         return {"status": "ok"}
 
+    @app.get("/ready")
+    async def ready(db_engine: AsyncEngine = Depends(get_engine)):
+        try:
+            await readiness.check(db_engine, settings.READY_WARM_CONNECTIONS)
+        except Exception:
+            logger.exception("Readiness check failed")
+            return JSONResponse(
+                {"status": "unavailable"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return {"status": "ready"}
+
     return app
 
 
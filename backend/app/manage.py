@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from alembic.config import Config
+
+from alembic import command
+from app.core.db import engine, wait_for_db
+from app.seed import seed_database
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def _run(coro) -> None:
+    # Each step gets its own event loop (alembic starts one of its own in between),
+    # so pooled connections must not outlive the loop that opened them.
+    async def step():
+        try:
+            await coro
+        finally:
+            await engine.dispose()
+
+    asyncio.run(step())
+
+
+def _wait_db(timeout: float) -> None:
+    started = time.monotonic()
+    _run(wait_for_db(engine, timeout))
+    print(f"Database ready after {time.monotonic() - started:.2f}s")
+
+
+def _migrate() -> None:
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+
+
+def _seed() -> None:
+    _run(seed_database())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    parser.add_argument("--timeout", type=float, default=60, help="database wait timeout (s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("wait-db", help="block until the database accepts connections")
+    sub.add_parser("migrate", help="wait for the database, then apply migrations")
+    sub.add_parser("seed", help="wait for the database, then seed an empty contracts table")
+    sub.add_parser("bootstrap", help="wait, migrate and seed")
+    args = parser.parse_args()
+
+    _wait_db(args.timeout)
+    if args.command in ("migrate", "bootstrap"):
+        _migrate()
+    if args.command in ("seed", "bootstrap"):
+        _seed()
+
+
+if __name__ == "__main__":
+    main()
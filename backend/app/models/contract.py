@@ -31,3 +31,19 @@ class Contract(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class ContractArchive(Base):
+    __tablename__ = "contracts_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    energy_type: Mapped[str] = mapped_column(String(50))
+    quantity_mwh: Mapped[Decimal] = mapped_column(Numeric(12, 2))
+    price_per_mwh: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    delivery_start: Mapped[date] = mapped_column(Date)
+    delivery_end: Mapped[date] = mapped_column(Date)
+    location: Mapped[str] = mapped_column(String(100))
+    status: Mapped[ContractStatus] = mapped_column(Enum(ContractStatus), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
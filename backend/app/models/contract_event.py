@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class ContractEvent(Base):
+    __tablename__ = "contract_events"
+    __table_args__ = (UniqueConstraint("contract_id", "seq"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    contract_id: Mapped[int] = mapped_column(Integer)
+    seq: Mapped[int] = mapped_column(Integer)
+    kind: Mapped[str] = mapped_column(String(20))
+    changes: Mapped[dict] = mapped_column(JSON, default=dict)
+    state: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ContractCheckpoint(Base):
+    __tablename__ = "contract_checkpoints"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    through_event_id: Mapped[int] = mapped_column(Integer)
+    through_occurred_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ContractCheckpointState(Base):
+    __tablename__ = "contract_checkpoint_states"
+
+    checkpoint_id: Mapped[int] = mapped_column(
+        ForeignKey("contract_checkpoints.id", ondelete="CASCADE"), primary_key=True
+    )
+    contract_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    state: Mapped[dict] = mapped_column(JSON)
@@ -1,17 +1,29 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
 
 
+class Portfolio(Base):
+    __tablename__ = "portfolios"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class PortfolioItem(Base):
     __tablename__ = "portfolio_items"
+    __table_args__ = (UniqueConstraint("portfolio_id", "contract_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    portfolio_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("portfolios.id", ondelete="CASCADE")
+    )
     contract_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("contracts.id", ondelete="RESTRICT"), unique=True
+        Integer, ForeignKey("contracts.id", ondelete="RESTRICT"), index=True
     )
     added_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     contract = relationship("Contract", lazy="joined")
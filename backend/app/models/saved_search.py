@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100))
+    criteria: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SavedSearchMatch(Base):
+    __tablename__ = "saved_search_matches"
+    __table_args__ = (
+        Index("ix_saved_search_matches_search_id_id", "search_id", "id"),
+        Index("ix_saved_search_matches_contract_id", "contract_id"),
+        Index("ix_saved_search_matches_matched_at", "matched_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    search_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("saved_searches.id", ondelete="CASCADE")
+    )
+    contract_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("contracts.id", ondelete="CASCADE")
+    )
+    kind: Mapped[str] = mapped_column(String(20))
+    matched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
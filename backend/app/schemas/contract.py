@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -72,3 +72,66 @@ class ContractFilter(BaseModel):
     offset: int = Field(0, ge=0)
     sort_by: Optional[str] = Field("id", pattern="^(price_per_mwh|quantity_mwh|delivery_start|id)$")
     sort_dir: Optional[str] = Field("asc", pattern="^(asc|desc)$")
+
+    @field_validator("status")
+    @classmethod
+    def validate_status(cls, v):
+        return ContractUpdate.validate_status(v)
+
+
+class ContractPatch(ContractUpdate):
+    id: int
+
+
+class FieldAdjustment(BaseModel):
+    op: str = Field(..., pattern="^(multiply|add)$")
+    value: Decimal
+
+
+class ContractBatchUpdate(BaseModel):
+    """Either per-contract ``items``, or a ``where`` filter with ``set`` and/or ``adjust``."""
+
+    items: Optional[list[ContractPatch]] = Field(None, min_length=1, max_length=10000)
+    where: Optional[ContractFilter] = None
+    set: Optional[ContractUpdate] = None
+    adjust: dict[Literal["price_per_mwh", "quantity_mwh"], FieldAdjustment] = {}
+
+    @model_validator(mode="after")
+    def validate_mode(self):
+        if (self.items is None) == (self.where is None):
+            raise ValueError("provide either items or where")
+        if self.items is not None and (self.set is not None or self.adjust):
+            raise ValueError("set and adjust apply only with where")
+        if self.items is not None and len({item.id for item in self.items}) < len(self.items):
+            raise ValueError("each contract id may appear only once")
+        if self.where is not None:
+            fields = self.set.model_dump(exclude_none=True) if self.set else {}
+            if not fields and not self.adjust:
+                raise ValueError("where requires set or adjust")
+            if fields.keys() & self.adjust.keys():
+                raise ValueError("a field cannot be both set and adjusted")
+        return self
+
+
+class ContractBatchUpdateResponse(BaseModel):
+    updated: list[int]
+    skipped: list[int]
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class HistogramBucket(BaseModel):
+    min: Decimal
+    max: Decimal
+    count: int
+
+
+class ContractFacetsResponse(BaseModel):
+    total: int
+    energy_type: list[FacetCount]
+    location: list[FacetCount]
+    price_per_mwh: list[HistogramBucket]
+    quantity_mwh: list[HistogramBucket]
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    kind: str = Field(..., min_length=1, max_length=50)
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str
+    params: dict[str, Any]
+    progress: int
+    total: Optional[int]
+    result: Optional[dict[str, Any]]
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
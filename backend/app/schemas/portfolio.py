@@ -1,17 +1,31 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.contract import ContractResponse
 
 
+class PortfolioCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+
+
+class PortfolioSummary(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class PortfolioItemCreate(BaseModel):
     contract_id: int
 
 
 class PortfolioItemResponse(BaseModel):
     id: int
+    portfolio_id: int
     contract_id: int
     added_at: datetime
     contract: ContractResponse
@@ -36,5 +50,16 @@ class PortfolioMetrics(BaseModel):
 
 
 class PortfolioResponse(BaseModel):
+    id: int
+    name: str
     items: list[PortfolioItemResponse]
     metrics: PortfolioMetrics
+
+
+class PortfolioMetricsBatchRequest(BaseModel):
+    portfolio_ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+
+class PortfolioMetricsEntry(BaseModel):
+    portfolio_id: int
+    metrics: PortfolioMetrics
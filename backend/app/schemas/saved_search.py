@@ -0,0 +1,41 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SavedSearchCriteria(BaseModel):
+    energy_type: Optional[list[str]] = None
+    price_min: Optional[Decimal] = None
+    price_max: Optional[Decimal] = None
+    qty_min: Optional[Decimal] = None
+    qty_max: Optional[Decimal] = None
+    location: Optional[str] = None
+    delivery_start_min: Optional[date] = None
+    delivery_end_max: Optional[date] = None
+
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    criteria: SavedSearchCriteria
+
+
+class SavedSearchResponse(BaseModel):
+    id: int
+    name: str
+    criteria: SavedSearchCriteria
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SavedSearchMatchResponse(BaseModel):
+    id: int
+    contract_id: int
+    kind: str
+    matched_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -2,10 +2,11 @@ import asyncio
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import text
+from sqlalchemy import select
 
 from app.core.db import async_session
 from app.models.contract import Contract, ContractStatus
+from app.services import history_service
 
 SEED_CONTRACTS = [
     {
@@ -139,16 +140,16 @@ SEED_CONTRACTS = [
 ]
 
 
-async def seed_database():
-    async with async_session() as session:
-        result = await session.execute(text("SELECT COUNT(*) FROM contracts"))
-        count = result.scalar()
-        if count > 0:
-            print(f"Database already has {count} contracts, skipping seed")
+async def seed_database(session_factory=async_session):
+    async with session_factory() as session:
+        result = await session.execute(select(Contract.id).limit(1))
+        if result.scalar() is not None:
+            print("Database already has contracts, skipping seed")
             return
-        for data in SEED_CONTRACTS:
-            contract = Contract(**data, status=ContractStatus.AVAILABLE)
-            session.add(contract)
+        contracts = [Contract(**data, status=ContractStatus.AVAILABLE) for data in SEED_CONTRACTS]
+        session.add_all(contracts)
+        await session.flush()
+        await history_service.record_many(session, contracts, "created")
         await session.commit()
         print(f"Seeded {len(SEED_CONTRACTS)} contracts")
 
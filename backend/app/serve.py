@@ -0,0 +1,29 @@
+import os
+
+import uvicorn
+
+from app.core.config import get_settings
+
+
+def worker_count() -> int:
+    settings = get_settings()
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def main() -> None:
+    settings = get_settings()
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=worker_count(),
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        log_level="info",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import logging
+import math
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import stream_partitions
+from app.core.invalidation import CONTRACTS_TOPIC
+from app.models.contract import Contract, ContractStatus
+from app.schemas.contract import ContractResponse
+from app.services.synced_index import SyncedIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+RELOAD_CHUNK_SIZE = 5000
+# Rows updated this long before the newest timestamp seen are re-read on refresh,
+# to tolerate clock skew between workers.
+REFRESH_SKEW = timedelta(seconds=5)
+_COLUMNS = tuple(getattr(Contract, name) for name in ContractResponse.model_fields)
+_SORT_COLUMNS = ("id", "price_per_mwh", "quantity_mwh", "delivery_start")
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _cents(value: Decimal) -> int:
+    return int((value * 100).to_integral_value())
+
+
+class _Columns:
+    """Columnar arrays of available contracts; removed slots are tombstoned."""
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.dead = 0
+        self.slots: dict[int, int] = {}
+        self.rows: list[Optional[ContractResponse]] = []
+        self.energy_types: dict[str, int] = {}
+        self.locations: dict[str, int] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        old = getattr(self, "ids", None)
+        arrays = {
+            "ids": np.int64,
+            "price": np.int64,
+            "qty": np.int64,
+            "start": np.int32,
+            "end": np.int32,
+            "energy_type": np.int32,
+            "location": np.int32,
+            "alive": np.bool_,
+        }
+        for name, dtype in arrays.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[: self.size] = getattr(self, name)[: self.size]
+            setattr(self, name, array)
+
+    @staticmethod
+    def _code(dictionary: dict[str, int], value: str) -> int:
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        return code
+
+    def upsert(self, row: ContractResponse) -> None:
+        if row.status != ContractStatus.AVAILABLE.value:
+            self.remove(row.id)
+            return
+        slot = self.slots.get(row.id)
+        if slot is None:
+            if self.size == len(self.ids):
+                self._allocate(len(self.ids) * 2)
+            slot = self.size
+            self.size += 1
+            self.slots[row.id] = slot
+            self.rows.append(row)
+        else:
+            self.rows[slot] = row
+        self.ids[slot] = row.id
+        self.price[slot] = _cents(row.price_per_mwh)
+        self.qty[slot] = _cents(row.quantity_mwh)
+        self.start[slot] = row.delivery_start.toordinal()
+        self.end[slot] = row.delivery_end.toordinal()
+        self.energy_type[slot] = self._code(self.energy_types, row.energy_type)
+        self.location[slot] = self._code(self.locations, row.location)
+        self.alive[slot] = True
+
+    def remove(self, contract_id: int) -> None:
+        slot = self.slots.pop(contract_id, None)
+        if slot is None:
+            return
+        self.alive[slot] = False
+        self.rows[slot] = None
+        self.dead += 1
+        if self.dead > 1024 and self.dead > len(self.slots):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [row for row in self.rows if row is not None]
+        fresh = _Columns(max(1024, len(live) * 2))
+        for row in live:
+            fresh.upsert(row)
+        self.__dict__.update(fresh.__dict__)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+
+class ContractIndex(SyncedIndex):
+    """In-process index of available contracts answering browse queries.
+
+    Local writes are applied when their session commits; writes from other
+    workers arrive as ``contracts`` invalidations and are picked up by an
+    incremental refresh on ``updated_at``. A periodic full reload reconciles
+    anything missed, such as deletes made by other workers.
+    """
+
+    topic = CONTRACTS_TOPIC
+    session_key = "contract_index"
+    label = "Contract index"
+
+    def __init__(self):
+        super().__init__()
+        self._watermark: Optional[datetime] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.enabled and self._data is not None
+
+    def stats(self) -> dict:
+        columns = self._data
+        return {
+            "ready": self.ready,
+            "contracts": len(columns) if columns is not None else 0,
+            "reloads": self.reloads,
+            "refreshes": self.refreshes,
+        }
+
+    def _reset(self) -> None:
+        self._watermark = None
+
+    async def _load(self) -> _Columns:
+        columns = _Columns()
+        watermark = None
+        async with self._session_factory() as db:
+            query = select(*_COLUMNS).where(Contract.status == ContractStatus.AVAILABLE)
+            async for rows in stream_partitions(db, query, RELOAD_CHUNK_SIZE):
+                for row in rows:
+                    columns.upsert(ContractResponse.model_validate(row))
+                    if watermark is None or row.updated_at > watermark:
+                        watermark = row.updated_at
+        if watermark is not None and (self._watermark is None or watermark > self._watermark):
+            self._watermark = watermark
+        logger.info("Contract index loaded %d available contracts", len(columns))
+        return columns
+
+    async def _refresh(self) -> None:
+        query = select(*_COLUMNS).order_by(Contract.updated_at)
+        if self._watermark is not None:
+            query = query.where(Contract.updated_at >= self._watermark - REFRESH_SKEW)
+        async with self._session_factory() as db:
+            async for rows in stream_partitions(db, query, RELOAD_CHUNK_SIZE):
+                for row in rows:
+                    self._apply("upsert", ContractResponse.model_validate(row))
+                    if self._watermark is None or row.updated_at > self._watermark:
+                        self._watermark = row.updated_at
+
+    @staticmethod
+    def _apply_to(columns: _Columns, op: str, value) -> None:
+        if op == "upsert":
+            columns.upsert(value)
+        else:
+            columns.remove(value)
+
+    def stage(self, db: AsyncSession, *contracts: Contract) -> None:
+        """Apply ``contracts`` to the index once ``db`` commits. Call after a flush."""
+        if self.enabled:
+            self._stage(db, "upsert", *(ContractResponse.model_validate(c) for c in contracts))
+
+    def stage_delete(self, db: AsyncSession, contract_id: int) -> None:
+        self._stage(db, "remove", contract_id)
+
+    def supports(
+        self,
+        location: Optional[str] = None,
+        status: Optional[str] = "Available",
+        sort_by: str = "id",
+        **filters,
+    ) -> bool:
+        if not self.ready or status != ContractStatus.AVAILABLE.value:
+            return False
+        return sort_by in _SORT_COLUMNS
+
+    def search(
+        self,
+        energy_types: Optional[list[str]] = None,
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        qty_min: Optional[Decimal] = None,
+        qty_max: Optional[Decimal] = None,
+        location: Optional[str] = None,
+        delivery_start_min: Optional[date] = None,
+        delivery_end_max: Optional[date] = None,
+        status: Optional[str] = "Available",
+        limit: int = 20,
+        offset: int = 0,
+        sort_by: str = "id",
+        sort_dir: str = "asc",
+    ) -> tuple[list[ContractResponse], int]:
+        """Same contract as ``contract_service.list_contracts`` for supported queries."""
+        c = self._data
+        n = c.size
+        mask = c.alive[:n].copy()
+        if energy_types:
+            codes = [c.energy_types[t] for t in set(energy_types) if t in c.energy_types]
+            mask &= np.isin(c.energy_type[:n], codes)
+        if price_min is not None:
+            mask &= c.price[:n] >= math.ceil(price_min * 100)
+        if price_max is not None:
+            mask &= c.price[:n] <= math.floor(price_max * 100)
+        if qty_min is not None:
+            mask &= c.qty[:n] >= math.ceil(qty_min * 100)
+        if qty_max is not None:
+            mask &= c.qty[:n] <= math.floor(qty_max * 100)
+        if location:
+            needle = location.lower()
+            codes = [code for name, code in c.locations.items() if needle in name.lower()]
+            mask &= np.isin(c.location[:n], codes)
+        if delivery_start_min:
+            mask &= c.start[:n] >= delivery_start_min.toordinal()
+        if delivery_end_max:
+            mask &= c.end[:n] <= delivery_end_max.toordinal()
+
+        matches = np.flatnonzero(mask)
+        total = len(matches)
+        ids = c.ids[matches]
+        if sort_by == "id":
+            order = np.argsort(-ids if sort_dir == "desc" else ids, kind="stable")
+        else:
+            column = {"price_per_mwh": c.price, "quantity_mwh": c.qty, "delivery_start": c.start}
+            keys = column[sort_by][matches].astype(np.int64)
+            order = np.lexsort((ids, -keys if sort_dir == "desc" else keys))
+        page = matches[order[offset : offset + limit]]
+        return [c.rows[slot] for slot in page], total
+
+
+contract_index = ContractIndex()
+contract_index.listen()
@@ -1,11 +1,41 @@
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import asc, desc, func, select
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    Row,
+    Select,
+    Subquery,
+    and_,
+    asc,
+    bindparam,
+    column,
+    delete,
+    desc,
+    exists,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.contract import Contract, ContractStatus
+from app.core.db import stream_partitions
+from app.core.invalidation import CONTRACTS_TOPIC, invalidation_bus
+from app.models.contract import Contract, ContractArchive, ContractStatus
+from app.models.portfolio import PortfolioItem
+from app.services import history_service, saved_search_service
+from app.services.contract_index import contract_index
 
 
 async def create_contract(db: AsyncSession, data: dict) -> Contract:
@@ -13,6 +43,10 @@ async def create_contract(db: AsyncSession, data: dict) -> Contract:
     db.add(contract)
     await db.flush()
     await db.refresh(contract)
+    await history_service.record(db, contract, "created")
+    await saved_search_service.enqueue_matches(db, [(None, contract)])
+    contract_index.stage(db, contract)
+    await invalidation_bus.publish(CONTRACTS_TOPIC, db)
     return contract
 
 
@@ -20,7 +54,12 @@ async def get_contract(db: AsyncSession, contract_id: int) -> Optional[Contract]
     return await db.get(Contract, contract_id)
 
 
+async def get_archived_contract(db: AsyncSession, contract_id: int) -> Optional[ContractArchive]:
+    return await db.get(ContractArchive, contract_id)
+
+
 async def update_contract(db: AsyncSession, contract: Contract, data: dict) -> Contract:
+    before = history_service.contract_state(contract)
     for key, value in data.items():
         if value is not None:
             if key == "status":
@@ -28,15 +67,193 @@ async def update_contract(db: AsyncSession, contract: Contract, data: dict) -> C
             setattr(contract, key, value)
     await db.flush()
     await db.refresh(contract)
+    await history_service.record(db, contract, "updated", before)
+    await saved_search_service.enqueue_matches(db, [(before, contract)])
+    contract_index.stage(db, contract)
+    await invalidation_bus.publish(CONTRACTS_TOPIC, db)
     return contract
 
 
 async def delete_contract(db: AsyncSession, contract: Contract) -> None:
     await db.delete(contract)
+    await history_service.record_deleted(db, contract.id)
+    contract_index.stage_delete(db, contract.id)
+    await invalidation_bus.publish(CONTRACTS_TOPIC, db)
 
 
-async def list_contracts(
-    db: AsyncSession,
+def _batch_invariants(new: dict) -> list:
+    def value(name):
+        return new.get(name, CONTRACT_COLUMNS[name])
+
+    def fits(name):
+        # Checked before assignment, so a value the column cannot hold skips the row
+        # instead of failing the statement with a numeric overflow.
+        column_type = CONTRACT_COLUMNS[name].type
+        return value(name) < 10 ** (column_type.precision - column_type.scale)
+
+    return [
+        value("delivery_end") >= value("delivery_start"),
+        value("price_per_mwh") > 0,
+        value("quantity_mwh") > 0,
+        fits("price_per_mwh"),
+        fits("quantity_mwh"),
+    ]
+
+
+async def _apply_batch(
+    db: AsyncSession, selection, params: dict, new: dict, join: Optional[list] = None
+) -> tuple[list[int], list[int]]:
+    """Lock the rows matching ``selection``, then update them in a single statement.
+
+    Returns the updated ids and the matched ids left unchanged because their new
+    values would end delivery before it starts, make a quantity non-positive or
+    exceed what the column can hold.
+    """
+    locked = select(*CONTRACT_COLUMNS).where(selection).with_for_update()
+    before = {
+        row.id: history_service.contract_state(row)
+        for row in (await db.execute(locked, params)).all()
+    }
+    if not before:
+        return [], []
+    statement = (
+        update(Contract.__table__)
+        .values(new)
+        .where(*(join or [CONTRACT_COLUMNS.id.in_(list(before))]), *_batch_invariants(new))
+        .returning(*CONTRACT_COLUMNS)
+    )
+    rows = (await db.execute(statement)).all()
+    await history_service.record_updates(db, before, rows)
+    await saved_search_service.enqueue_matches(db, ((before[row.id], row) for row in rows))
+    contract_index.stage(db, *rows)
+    await invalidation_bus.publish(CONTRACTS_TOPIC, db)
+    updated = sorted(row.id for row in rows)
+    return updated, sorted(before.keys() - set(updated))
+
+
+async def batch_update_contracts(
+    db: AsyncSession, items: list[dict]
+) -> tuple[list[int], list[int]]:
+    """Apply per-contract changes with one ``UPDATE ... FROM`` a ``VALUES`` list.
+
+    Each item holds ``id`` and the fields to change. Returns the updated ids and
+    the skipped ones (unknown, archived, or failing an invariant).
+    """
+    for item in items:
+        if "status" in item:
+            item["status"] = ContractStatus(item["status"])
+    fields = sorted({key for item in items for key in item} - {"id"})
+    ids = [item["id"] for item in items]
+    if not fields:
+        return [], sorted(set(ids))
+    patch = values(
+        column("id", Integer),
+        *(column(name, CONTRACT_COLUMNS[name].type) for name in fields),
+        name="patch",
+    ).data([(item["id"], *(item.get(name) for name in fields)) for item in items])
+    # As a CTE (``WITH patch(id, ...) AS (VALUES ...)``): SQLite does not accept
+    # column aliases on a VALUES subquery, PostgreSQL inlines either form.
+    patch = patch.cte("patch")
+    new = {name: func.coalesce(patch.c[name], CONTRACT_COLUMNS[name]) for name in fields}
+    updated, skipped = await _apply_batch(
+        db,
+        CONTRACT_COLUMNS.id.in_(ids),
+        {},
+        new,
+        join=[CONTRACT_COLUMNS.id == patch.c.id],
+    )
+    return updated, sorted(set(ids) - set(updated))
+
+
+async def update_matching_contracts(
+    db: AsyncSession, filters: dict, changes: dict, adjust: dict
+) -> tuple[list[int], list[int]]:
+    """Set ``changes`` and apply ``adjust`` (``{field: (op, value)}``) to every match.
+
+    ``filters`` takes the keyword arguments of ``list_contracts``; archived contracts
+    are never touched.
+    """
+    params = _filter_params(**filters)
+    new = {
+        key: ContractStatus(value) if key == "status" else value for key, value in changes.items()
+    }
+    for name, (op, value) in adjust.items():
+        operand = literal(value, CONTRACT_COLUMNS[name].type)
+        current = CONTRACT_COLUMNS[name]
+        new[name] = func.round(current * operand if op == "multiply" else current + operand, 2)
+    return await _apply_batch(db, and_(true(), *_filter_clauses(frozenset(params))), params, new)
+
+
+def _archivable(expired_before: Optional[date]):
+    archivable = Contract.status == ContractStatus.SOLD
+    if expired_before is not None:
+        archivable = or_(archivable, Contract.delivery_end < expired_before)
+    return and_(archivable, ~exists().where(PortfolioItem.contract_id == Contract.id))
+
+
+async def find_archivable_contracts(
+    db: AsyncSession, after_id: int, limit: int, expired_before: Optional[date] = None
+) -> list[int]:
+    """Ids of sold (or, with ``expired_before``, expired) contracts not held in any portfolio."""
+    query = (
+        select(Contract.id)
+        .where(_archivable(expired_before), Contract.id > after_id)
+        .order_by(Contract.id)
+        .limit(limit)
+    )
+    return list((await db.scalars(query)).all())
+
+
+async def archive_contracts(
+    db: AsyncSession, contract_ids: list[int], expired_before: Optional[date] = None
+) -> list[int]:
+    """Archive those of ``contract_ids`` that still qualify; returns the archived ids.
+
+    Candidates may have been relisted or added to a portfolio since they were found,
+    so the rows are locked and the predicate is checked again in every statement.
+    """
+    names = [column.name for column in CONTRACT_COLUMNS]
+    still_archivable = (Contract.id.in_(contract_ids), _archivable(expired_before))
+    locked = select(*CONTRACT_COLUMNS).where(*still_archivable).with_for_update(of=Contract)
+    rows = (await db.execute(locked)).all()
+    if not rows:
+        return []
+    archived = [row.id for row in rows]
+    still_archivable = (Contract.id.in_(archived), _archivable(expired_before))
+    await db.execute(
+        insert(ContractArchive).from_select(
+            names, select(*CONTRACT_COLUMNS).where(*still_archivable)
+        )
+    )
+    await db.execute(delete(Contract).where(*still_archivable))
+    await history_service.record_many(db, rows, "archived", changes={})
+    for contract_id in archived:
+        contract_index.stage_delete(db, contract_id)
+    await invalidation_bus.publish(CONTRACTS_TOPIC, db)
+    return archived
+
+
+FILTERS = {
+    "energy_types": lambda c: c.energy_type.in_(bindparam("energy_types", expanding=True)),
+    "price_min": lambda c: c.price_per_mwh >= bindparam("price_min"),
+    "price_max": lambda c: c.price_per_mwh <= bindparam("price_max"),
+    "qty_min": lambda c: c.quantity_mwh >= bindparam("qty_min"),
+    "qty_max": lambda c: c.quantity_mwh <= bindparam("qty_max"),
+    "location": lambda c: c.location.ilike(bindparam("location"), escape="\\"),
+    "delivery_start_min": lambda c: c.delivery_start >= bindparam("delivery_start_min"),
+    "delivery_end_max": lambda c: c.delivery_end <= bindparam("delivery_end_max"),
+    "status": lambda c: c.status == bindparam("status"),
+}
+CONTRACT_COLUMNS = Contract.__table__.c
+ARCHIVE_COLUMNS = ContractArchive.__table__.c
+
+
+def _escape_like(value: str) -> str:
+    """``value`` with LIKE wildcards escaped, so ``location`` is a plain substring."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _filter_params(
     energy_types: Optional[list[str]] = None,
     price_min: Optional[Decimal] = None,
     price_max: Optional[Decimal] = None,
@@ -46,49 +263,251 @@ async def list_contracts(
     delivery_start_min: Optional[date] = None,
     delivery_end_max: Optional[date] = None,
     status: Optional[str] = "Available",
-    limit: int = 20,
-    offset: int = 0,
-    sort_by: str = "id",
-    sort_dir: str = "asc",
-) -> tuple[list[Contract], int]:
-    query = select(Contract)
-    count_query = select(func.count(Contract.id))
-
+) -> dict:
+    """Bind values for the active filters, keyed like ``FILTER_CLAUSES``."""
+    params = {}
     if energy_types:
-        query = query.where(Contract.energy_type.in_(energy_types))
-        count_query = count_query.where(Contract.energy_type.in_(energy_types))
+        params["energy_types"] = list(energy_types)
     if price_min is not None:
-        query = query.where(Contract.price_per_mwh >= price_min)
-        count_query = count_query.where(Contract.price_per_mwh >= price_min)
+        params["price_min"] = price_min
     if price_max is not None:
-        query = query.where(Contract.price_per_mwh <= price_max)
-        count_query = count_query.where(Contract.price_per_mwh <= price_max)
+        params["price_max"] = price_max
     if qty_min is not None:
-        query = query.where(Contract.quantity_mwh >= qty_min)
-        count_query = count_query.where(Contract.quantity_mwh >= qty_min)
+        params["qty_min"] = qty_min
     if qty_max is not None:
-        query = query.where(Contract.quantity_mwh <= qty_max)
-        count_query = count_query.where(Contract.quantity_mwh <= qty_max)
+        params["qty_max"] = qty_max
     if location:
-        query = query.where(Contract.location.ilike(f"%{location}%"))
-        count_query = count_query.where(Contract.location.ilike(f"%{location}%"))
+        params["location"] = f"%{_escape_like(location)}%"
     if delivery_start_min:
-        query = query.where(Contract.delivery_start >= delivery_start_min)
-        count_query = count_query.where(Contract.delivery_start >= delivery_start_min)
+        params["delivery_start_min"] = delivery_start_min
     if delivery_end_max:
-        query = query.where(Contract.delivery_end <= delivery_end_max)
-        count_query = count_query.where(Contract.delivery_end <= delivery_end_max)
+        params["delivery_end_max"] = delivery_end_max
     if status:
-        query = query.where(Contract.status == ContractStatus(status))
-        count_query = count_query.where(Contract.status == ContractStatus(status))
+        params["status"] = ContractStatus(status)
+    return params
+
+
+def _filter_clauses(active: frozenset[str], columns=CONTRACT_COLUMNS) -> list:
+    return [make(columns) for name, make in FILTERS.items() if name in active]
+
+
+def _includes_archive(status: Optional[str]) -> bool:
+    return status != ContractStatus.AVAILABLE.value
 
-    sort_column = getattr(Contract, sort_by, Contract.id)
+
+def _with_archive(active: frozenset[str]) -> Subquery:
+    live = select(*CONTRACT_COLUMNS).where(*_filter_clauses(active))
+    archived = select(*(ARCHIVE_COLUMNS[column.name] for column in CONTRACT_COLUMNS)).where(
+        *_filter_clauses(active, ARCHIVE_COLUMNS)
+    )
+    return union_all(live, archived).subquery("all_contracts")
+
+
+def _order_by(columns, sort_by: str, sort_dir: str) -> list:
+    sort_column = columns[sort_by] if sort_by in columns else columns.id
     order_func = desc if sort_dir == "desc" else asc
-    query = query.order_by(order_func(sort_column))
-    query = query.limit(limit).offset(offset)
+    order = [order_func(sort_column)]
+    if sort_column.name != "id":
+        order.append(columns.id)
+    return order
+
+
+@lru_cache(maxsize=512)
+def _list_statements(
+    active: frozenset[str], sort_by: str, sort_dir: str, archived: bool
+) -> tuple[Select, Select]:
+    # One statement pair per filter shape: reusing the same objects skips statement
+    # construction and cache-key generation, and the SQL text stays stable so the
+    # driver can reuse its prepared statements.
+    if archived:
+        source = _with_archive(active)
+        query = select(*source.c).order_by(*_order_by(source.c, sort_by, sort_dir))
+        count_query = select(func.count()).select_from(source)
+    else:
+        clauses = _filter_clauses(active)
+        query = (
+            select(Contract)
+            .where(*clauses)
+            .order_by(*_order_by(CONTRACT_COLUMNS, sort_by, sort_dir))
+        )
+        count_query = select(func.count(Contract.id)).where(*clauses)
+    query = query.limit(bindparam("limit")).offset(bindparam("offset"))
+    return query, count_query
 
-    result = await db.execute(query)
-    contracts = list(result.scalars().all())
-    total_result = await db.execute(count_query)
+
+async def list_contracts(
+    db: AsyncSession,
+    energy_types: Optional[list[str]] = None,
+    price_min: Optional[Decimal] = None,
+    price_max: Optional[Decimal] = None,
+    qty_min: Optional[Decimal] = None,
+    qty_max: Optional[Decimal] = None,
+    location: Optional[str] = None,
+    delivery_start_min: Optional[date] = None,
+    delivery_end_max: Optional[date] = None,
+    status: Optional[str] = "Available",
+    limit: int = 20,
+    offset: int = 0,
+    sort_by: str = "id",
+    sort_dir: str = "asc",
+) -> tuple[list[Contract], int]:
+    params = _filter_params(
+        energy_types,
+        price_min,
+        price_max,
+        qty_min,
+        qty_max,
+        location,
+        delivery_start_min,
+        delivery_end_max,
+        status,
+    )
+    archived = _includes_archive(status)
+    query, count_query = _list_statements(frozenset(params), sort_by, sort_dir, archived)
+
+    result = await db.execute(query, {**params, "limit": limit, "offset": offset})
+    contracts = list(result.all() if archived else result.scalars().all())
+    total_result = await db.execute(count_query, params)
     total = total_result.scalar() or 0
     return contracts, total
+
+
+FACETS = ("energy_type", "location", "price_bucket", "qty_bucket")
+
+
+@lru_cache(maxsize=256)
+def _facets_statement(active: frozenset[str], archived: bool, grouping_sets: bool) -> Select:
+    source = _with_archive(active) if archived else None
+    columns = source.c if archived else CONTRACT_COLUMNS
+    matching = (
+        select(
+            columns.energy_type,
+            columns.location,
+            # Unconstrained NUMERIC: bound with the column's type, a width would be
+            # rounded to its scale (0.001 to 0.00) or overflow its precision.
+            func.floor(columns.price_per_mwh / bindparam("price_bucket", type_=Numeric())).label(
+                "price_bucket"
+            ),
+            func.floor(columns.quantity_mwh / bindparam("qty_bucket", type_=Numeric())).label(
+                "qty_bucket"
+            ),
+        )
+        .where(*([] if archived else _filter_clauses(active)))
+        .subquery("matching")
+    )
+    if grouping_sets:
+        sets = [tuple_(matching.c[name]) for name in FACETS] + [tuple_()]
+        return select(*(matching.c[name] for name in FACETS), func.count()).group_by(
+            func.grouping_sets(*sets)
+        )
+    # SQLite has no GROUPING SETS: one grouped branch per facet, plus the total.
+    branches = []
+    for facet in (*FACETS, None):
+        branch = select(
+            *(matching.c[name] if name == facet else null().label(name) for name in FACETS),
+            func.count(),
+        ).select_from(matching)
+        branches.append(branch.group_by(matching.c[facet]) if facet else branch)
+    return union_all(*branches)
+
+
+async def facet_counts(
+    db: AsyncSession, price_bucket: Decimal, qty_bucket: Decimal, **filters
+) -> dict:
+    """Counts per energy type and location, and price/quantity histograms, in one query.
+
+    ``filters`` takes the keyword arguments of ``list_contracts``; histogram buckets
+    are ``[n * width, (n + 1) * width)``.
+    """
+    params = _filter_params(**filters)
+    statement = _facets_statement(
+        frozenset(params),
+        _includes_archive(filters.get("status", "Available")),
+        db.get_bind().dialect.name == "postgresql",
+    )
+    result = await db.execute(
+        statement, {**params, "price_bucket": price_bucket, "qty_bucket": qty_bucket}
+    )
+    facets = {name: [] for name in FACETS}
+    total = 0
+    for *grouped, count in result.all():
+        # Facet columns are never NULL, so the one set column names the grouping.
+        name = next((name for name, value in zip(FACETS, grouped) if value is not None), None)
+        if name is None:
+            total = count
+        else:
+            facets[name].append((grouped[FACETS.index(name)], count))
+
+    def histogram(buckets, width):
+        return [
+            {"min": int(n) * width, "max": (int(n) + 1) * width, "count": count}
+            for n, count in sorted(buckets)
+        ]
+
+    def by_count(counts):
+        return [
+            {"value": value, "count": count}
+            for value, count in sorted(counts, key=lambda item: (-item[1], item[0]))
+        ]
+
+    return {
+        "total": total,
+        "energy_type": by_count(facets["energy_type"]),
+        "location": by_count(facets["location"]),
+        "price_per_mwh": histogram(facets["price_bucket"], price_bucket),
+        "quantity_mwh": histogram(facets["qty_bucket"], qty_bucket),
+    }
+
+
+EXPORT_COLUMNS = (
+    Contract.id,
+    Contract.energy_type,
+    Contract.quantity_mwh,
+    Contract.price_per_mwh,
+    Contract.delivery_start,
+    Contract.delivery_end,
+    Contract.location,
+    Contract.status,
+    Contract.created_at,
+    Contract.updated_at,
+)
+
+
+async def stream_contracts(
+    db: AsyncSession,
+    chunk_size: int = 5000,
+    energy_types: Optional[list[str]] = None,
+    price_min: Optional[Decimal] = None,
+    price_max: Optional[Decimal] = None,
+    qty_min: Optional[Decimal] = None,
+    qty_max: Optional[Decimal] = None,
+    location: Optional[str] = None,
+    delivery_start_min: Optional[date] = None,
+    delivery_end_max: Optional[date] = None,
+    status: Optional[str] = None,
+    sort_by: str = "id",
+    sort_dir: str = "asc",
+) -> AsyncIterator[list[Row]]:
+    params = _filter_params(
+        energy_types,
+        price_min,
+        price_max,
+        qty_min,
+        qty_max,
+        location,
+        delivery_start_min,
+        delivery_end_max,
+        status,
+    )
+    active = frozenset(params)
+    if _includes_archive(status):
+        source = _with_archive(active)
+        query = select(*source.c).order_by(*_order_by(source.c, sort_by, sort_dir))
+    else:
+        query = (
+            select(*EXPORT_COLUMNS)
+            .where(*_filter_clauses(active))
+            .order_by(*_order_by(CONTRACT_COLUMNS, sort_by, sort_dir))
+        )
+    async for partition in stream_partitions(db, query.params(params), chunk_size):
+        yield partition
@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+
+EXPORT_CHUNK_SIZE = 5000
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+COLUMNAR_FORMATS = frozenset({"parquet", "arrow"})
+FIELDS = (
+    "id",
+    "energy_type",
+    "quantity_mwh",
+    "price_per_mwh",
+    "delivery_start",
+    "delivery_end",
+    "location",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _csv_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("energy_type", pa.string()),
+            ("quantity_mwh", pa.decimal128(12, 2)),
+            ("price_per_mwh", pa.decimal128(10, 2)),
+            ("delivery_start", pa.date32()),
+            ("delivery_end", pa.date32()),
+            ("location", pa.string()),
+            ("status", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+        ]
+    )
+
+
+def _arrow_batch(schema, rows: Sequence[Row]):
+    import pyarrow as pa
+
+    columns = dict(zip(FIELDS, zip(*rows)))
+    columns["status"] = [status.value for status in columns["status"]]
+    return pa.record_batch(
+        [pa.array(columns[field.name], type=field.type) for field in schema], schema=schema
+    )
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+async def _export_csv(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    async for rows in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _export_ndjson(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        lines = [
+            json.dumps(dict(zip(FIELDS, row)), default=_json_default, separators=(",", ":"))
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def _export_arrow(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+
+    schema = _arrow_schema()
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        async for rows in chunks:
+            writer.write_batch(_arrow_batch(schema, rows))
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+async def _export_parquet(chunks: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    sink = io.BytesIO()
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for rows in chunks:
+            writer.write_table(pa.Table.from_batches([_arrow_batch(schema, rows)]))
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+_WRITERS = {
+    "csv": _export_csv,
+    "ndjson": _export_ndjson,
+    "parquet": _export_parquet,
+    "arrow": _export_arrow,
+}
+
+
+def export_rows(chunks: AsyncIterator[Sequence[Row]], fmt: str) -> AsyncIterator[bytes]:
+    return _WRITERS[fmt](chunks)
@@ -0,0 +1,277 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, Optional
+
+from sqlalchemy import Row, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import stream_partitions
+from app.models.contract import Contract
+from app.models.contract_event import ContractCheckpoint, ContractCheckpointState, ContractEvent
+
+STATE_FIELDS = (
+    "energy_type",
+    "quantity_mwh",
+    "price_per_mwh",
+    "delivery_start",
+    "delivery_end",
+    "location",
+    "status",
+)
+CHECKPOINT_LAG = timedelta(minutes=5)
+HISTORY_COLUMNS = (
+    ContractEvent.seq,
+    ContractEvent.kind,
+    ContractEvent.changes,
+    ContractEvent.occurred_at,
+)
+
+
+def contract_state(contract) -> dict:
+    """JSON-safe snapshot of the tracked fields of a contract (ORM object or row)."""
+    state = {}
+    for field in STATE_FIELDS:
+        value = getattr(contract, field)
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        elif field == "status":
+            value = getattr(value, "value", value)
+        elif not isinstance(value, str):
+            value = str(value)
+        state[field] = value
+    return state
+
+
+async def _next_seqs(db: AsyncSession, contract_ids: Iterable[int]) -> dict[int, int]:
+    result = await db.execute(
+        select(ContractEvent.contract_id, func.max(ContractEvent.seq))
+        .where(ContractEvent.contract_id.in_(list(contract_ids)))
+        .group_by(ContractEvent.contract_id)
+    )
+    return {contract_id: seq + 1 for contract_id, seq in result.all()}
+
+
+async def record(
+    db: AsyncSession, contract: Contract, kind: str, before: Optional[dict] = None
+) -> None:
+    """Append an event for ``contract``; call after the write is flushed.
+
+    ``before`` is the state prior to the write; without it every field counts as
+    changed. Updates that change nothing are not recorded.
+    """
+    state = contract_state(contract)
+    changes = {k: v for k, v in state.items() if before is None or before[k] != v}
+    if not changes:
+        return
+    seqs = await _next_seqs(db, [contract.id])
+    db.add(
+        ContractEvent(
+            contract_id=contract.id,
+            seq=seqs.get(contract.id, 1),
+            kind=kind,
+            changes=changes,
+            state=state,
+        )
+    )
+
+
+async def record_deleted(db: AsyncSession, contract_id: int) -> None:
+    seqs = await _next_seqs(db, [contract_id])
+    db.add(ContractEvent(contract_id=contract_id, seq=seqs.get(contract_id, 1), kind="deleted"))
+
+
+async def _insert_events(
+    db: AsyncSession, kind: str, events: list[tuple[int, dict, Optional[dict]]]
+) -> None:
+    seqs = await _next_seqs(db, (contract_id for contract_id, _, _ in events))
+    now = datetime.utcnow()
+    await db.execute(
+        insert(ContractEvent),
+        [
+            {
+                "contract_id": contract_id,
+                "seq": seqs.get(contract_id, 1),
+                "kind": kind,
+                "changes": changes,
+                "state": state,
+                "occurred_at": now,
+            }
+            for contract_id, changes, state in events
+        ],
+    )
+
+
+async def record_many(
+    db: AsyncSession, contracts: Iterable, kind: str, changes: Optional[dict] = None
+) -> None:
+    """Append one event per contract (ORM objects or rows with ``id``).
+
+    ``changes`` defaults to the full state, as for a newly created contract.
+    """
+    events = []
+    for c in contracts:
+        state = contract_state(c)
+        events.append((c.id, state if changes is None else changes, state))
+    if events:
+        await _insert_events(db, kind, events)
+
+
+async def record_updates(
+    db: AsyncSession, before: dict[int, dict], contracts: Iterable, kind: str = "updated"
+) -> None:
+    """Bulk ``record``: one event per contract whose state differs from ``before[id]``."""
+    events = []
+    for c in contracts:
+        state = contract_state(c)
+        changes = {k: v for k, v in state.items() if before[c.id][k] != v}
+        if changes:
+            events.append((c.id, changes, state))
+    if events:
+        await _insert_events(db, kind, events)
+
+
+async def has_history(db: AsyncSession, contract_id: int) -> bool:
+    query = select(ContractEvent.id).where(ContractEvent.contract_id == contract_id).limit(1)
+    return (await db.scalar(query)) is not None
+
+
+async def stream_history(
+    db: AsyncSession, contract_id: int, chunk_size: int = 1000
+) -> AsyncIterator[list[Row]]:
+    query = (
+        select(*HISTORY_COLUMNS)
+        .where(ContractEvent.contract_id == contract_id)
+        .order_by(ContractEvent.seq)
+    )
+    async for partition in stream_partitions(db, query, chunk_size):
+        yield partition
+
+
+async def latest_checkpoint(
+    db: AsyncSession, at: Optional[datetime] = None
+) -> Optional[ContractCheckpoint]:
+    query = select(ContractCheckpoint).order_by(ContractCheckpoint.through_event_id.desc())
+    if at is not None:
+        query = query.where(ContractCheckpoint.through_occurred_at <= at)
+    return (await db.scalars(query.limit(1))).first()
+
+
+async def _states_since(
+    db: AsyncSession,
+    after_event_id: int,
+    at: Optional[datetime] = None,
+    through_event_id: Optional[int] = None,
+    chunk_size: int = 5000,
+) -> dict[int, Optional[dict]]:
+    query = (
+        select(ContractEvent.contract_id, ContractEvent.state)
+        .where(ContractEvent.id > after_event_id)
+        .order_by(ContractEvent.id)
+    )
+    if at is not None:
+        query = query.where(ContractEvent.occurred_at <= at)
+    if through_event_id is not None:
+        query = query.where(ContractEvent.id <= through_event_id)
+    states: dict[int, Optional[dict]] = {}
+    async for rows in stream_partitions(db, query, chunk_size):
+        for contract_id, state in rows:
+            states[contract_id] = state
+    return states
+
+
+async def stream_states_as_of(
+    db: AsyncSession, at: Optional[datetime] = None, chunk_size: int = 5000
+) -> AsyncIterator[list[tuple[int, dict]]]:
+    """Yield ``(contract_id, state)`` chunks in id order for contracts that existed at ``at``.
+
+    Starts from the newest checkpoint taken at or before ``at`` and overlays only the
+    events recorded after it, so the cost is bounded by the checkpoint size plus the
+    events since, not by the length of the log.
+    """
+    checkpoint = await latest_checkpoint(db, at)
+    through = checkpoint.through_event_id if checkpoint else 0
+    overlay = await _states_since(db, through, at, chunk_size=chunk_size)
+    keys = sorted(overlay)
+    position = 0
+
+    def overlay_before(limit: Optional[int]) -> list[tuple[int, dict]]:
+        nonlocal position
+        ready = []
+        while position < len(keys) and (limit is None or keys[position] < limit):
+            contract_id = keys[position]
+            position += 1
+            if overlay[contract_id] is not None:
+                ready.append((contract_id, overlay[contract_id]))
+        return ready
+
+    if checkpoint is not None:
+        query = (
+            select(ContractCheckpointState.contract_id, ContractCheckpointState.state)
+            .where(ContractCheckpointState.checkpoint_id == checkpoint.id)
+            .order_by(ContractCheckpointState.contract_id)
+        )
+        async for rows in stream_partitions(db, query, chunk_size):
+            chunk = []
+            for contract_id, state in rows:
+                chunk.extend(overlay_before(contract_id))
+                if position < len(keys) and keys[position] == contract_id:
+                    state = overlay[contract_id]
+                    position += 1
+                if state is not None:
+                    chunk.append((contract_id, state))
+            yield chunk
+    rest = overlay_before(None)
+    for start in range(0, len(rest), chunk_size):
+        yield rest[start : start + chunk_size]
+
+
+async def create_checkpoint(
+    db: AsyncSession, lag: timedelta = CHECKPOINT_LAG, chunk_size: int = 5000
+) -> Optional[int]:
+    """Materialize every contract's state as of the newest event older than ``lag``.
+
+    The lag keeps events from transactions still in flight (whose ids are already
+    allocated) out of the checkpoint; they are picked up by the next one.
+    """
+    cutoff = datetime.utcnow() - lag
+    through = await db.scalar(
+        select(func.max(ContractEvent.id)).where(ContractEvent.occurred_at <= cutoff)
+    )
+    previous = await latest_checkpoint(db)
+    after = previous.through_event_id if previous else 0
+    if through is None or through <= after:
+        return previous.id if previous else None
+    through_occurred_at = await db.scalar(
+        select(func.max(ContractEvent.occurred_at)).where(ContractEvent.id <= through)
+    )
+    checkpoint = ContractCheckpoint(
+        through_event_id=through, through_occurred_at=through_occurred_at
+    )
+    db.add(checkpoint)
+    await db.flush()
+
+    if previous is not None:
+        changed = select(ContractEvent.contract_id).where(
+            ContractEvent.id > after, ContractEvent.id <= through
+        )
+        carried = select(
+            literal(checkpoint.id),
+            ContractCheckpointState.contract_id,
+            ContractCheckpointState.state,
+        ).where(
+            ContractCheckpointState.checkpoint_id == previous.id,
+            ContractCheckpointState.contract_id.not_in(changed),
+        )
+        await db.execute(
+            insert(ContractCheckpointState).from_select(
+                ["checkpoint_id", "contract_id", "state"], carried
+            )
+        )
+    overlay = await _states_since(db, after, through_event_id=through, chunk_size=chunk_size)
+    rows = [
+        {"checkpoint_id": checkpoint.id, "contract_id": contract_id, "state": state}
+        for contract_id, state in overlay.items()
+        if state is not None
+    ]
+    for start in range(0, len(rows), chunk_size):
+        await db.execute(insert(ContractCheckpointState), rows[start : start + chunk_size])
+    return checkpoint.id
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency import IdempotencyKey
+
+
+async def lock_key(db: AsyncSession, key: str) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+
+
+async def get_record(db: AsyncSession, key: str) -> Optional[IdempotencyKey]:
+    record = await db.get(IdempotencyKey, key, populate_existing=True)
+    if record is None or record.expires_at <= datetime.utcnow():
+        return None
+    return record
+
+
+async def save_record(
+    db: AsyncSession,
+    key: str,
+    fingerprint: str,
+    status_code: int,
+    response_body: str,
+    ttl_seconds: int,
+) -> IdempotencyKey:
+    now = datetime.utcnow()
+    record = await db.get(IdempotencyKey, key)
+    if record is None:
+        record = IdempotencyKey(key=key)
+        db.add(record)
+    record.fingerprint = fingerprint
+    record.status_code = status_code
+    record.response_body = response_body
+    record.created_at = now
+    record.expires_at = now + timedelta(seconds=ttl_seconds)
+    await db.flush()
+    return record
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+    )
+    return result.rowcount
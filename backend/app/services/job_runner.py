@@ -0,0 +1,267 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.invalidation import invalidation_bus
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[["JobContext", dict], Awaitable[Optional[dict]]]
+
+JOBS_TOPIC = "jobs"
+LEADER_LOCK_KEY = 0x6A6F6273
+LEADER_RETRY_SECONDS = 5
+LEADER_POLL_SECONDS = 5
+SCHEDULE_POLL_SECONDS = 60
+FAILED_JOB_ERROR = "Job failed; see server logs"
+
+
+class JobError(Exception):
+    """A job failure whose message is safe to store on the job and show to clients."""
+
+
+class JobContext:
+    def __init__(self, runner: "JobRunner", job: Job):
+        self._runner = runner
+        self.job_id = job.id
+        self.params = job.params
+        self.progress = job.progress
+
+    def session(self) -> AsyncSession:
+        return self._runner.session_factory()
+
+    async def set_progress(
+        self, progress: int, total: Optional[int] = None, db: Optional[AsyncSession] = None
+    ) -> None:
+        self.progress = progress
+        fields: dict[str, Any] = {"progress": progress}
+        if total is not None:
+            fields["total"] = total
+        if db is not None:
+            job = await db.get(Job, self.job_id)
+            for key, value in fields.items():
+                setattr(job, key, value)
+            return
+        await self._runner._update(self.job_id, **fields)
+
+    async def run_cpu(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._runner.executor, fn, *args)
+
+
+class JobRunner:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        handlers: dict[str, JobHandler],
+        resumable: frozenset[str] = frozenset(),
+        concurrency: int = 2,
+        process_workers: int = 0,
+        lock_engine: Optional[AsyncEngine] = None,
+        schedule: Optional[dict[str, float]] = None,
+    ):
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.resumable = resumable
+        self.schedule = schedule or {}
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.leader = False
+        self._process_workers = process_workers
+        self._lock_engine = lock_engine
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._leader_task: Optional[asyncio.Task] = None
+        self._schedule_task: Optional[asyncio.Task] = None
+        self._dispatches: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._process_workers > 0:
+            self.executor = ProcessPoolExecutor(max_workers=self._process_workers)
+        invalidation_bus.subscribe(JOBS_TOPIC, self._on_jobs_published)
+        if self._lock_engine is None:
+            await self._become_leader()
+        else:
+            self._leader_task = asyncio.create_task(self._lead())
+        if self.schedule:
+            self._schedule_task = asyncio.create_task(self._schedule_loop())
+
+    async def stop(self) -> None:
+        invalidation_bus.unsubscribe(JOBS_TOPIC, self._on_jobs_published)
+        for task in (self._leader_task, self._schedule_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._leader_task = self._schedule_task = None
+        await self._cancel_tasks()
+        self.leader = False
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def wait(self) -> None:
+        while self._tasks or self._dispatches:
+            pending = [*self._tasks.values(), *self._dispatches]
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def submit(self, kind: str, params: dict) -> Job:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        async with self.session_factory() as db:
+            job = Job(kind=kind, params=params, status=JobStatus.PENDING)
+            db.add(job)
+            await db.flush()
+            if not self.leader:
+                await invalidation_bus.publish(JOBS_TOPIC, db)
+            await db.commit()
+            await db.refresh(job)
+        if self.leader:
+            self._schedule(job.id)
+        return job
+
+    async def submit_scheduled(self) -> list[Job]:
+        """Submit each scheduled kind whose last job was created more than its interval ago.
+
+        Only the leader submits; the check reads the jobs table, so a new leader
+        continues the previous one's schedule instead of restarting it.
+        """
+        if not self.leader:
+            return []
+        submitted = []
+        for kind, interval in self.schedule.items():
+            async with self.session_factory() as db:
+                last = await db.scalar(select(func.max(Job.created_at)).where(Job.kind == kind))
+            if last is None or last <= datetime.utcnow() - timedelta(seconds=interval):
+                submitted.append(await self.submit(kind, {}))
+        return submitted
+
+    async def _schedule_loop(self) -> None:
+        while True:
+            try:
+                await self.submit_scheduled()
+            except Exception:
+                logger.exception("Submitting scheduled jobs failed")
+            await asyncio.sleep(SCHEDULE_POLL_SECONDS)
+
+    async def _become_leader(self) -> None:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Job).where(Job.status == JobStatus.RUNNING).order_by(Job.id)
+            )
+            for job in result.scalars().all():
+                if job.kind in self.resumable:
+                    job.status = JobStatus.PENDING
+                else:
+                    job.status = JobStatus.FAILED
+                    job.error = "Interrupted by restart"
+            await db.commit()
+        self.leader = True
+        await self._dispatch_pending()
+
+    async def _try_lead(self) -> bool:
+        """Hold the leader lock until the connection fails; False if another worker has it.
+
+        Followers close their connection between attempts instead of holding one idle.
+        """
+        async with self._lock_engine.connect() as conn:
+            acquired = await conn.scalar(select(func.pg_try_advisory_lock(LEADER_LOCK_KEY)))
+            await conn.commit()
+            if not acquired:
+                return False
+            logger.info("Acquired job runner leadership")
+            await self._become_leader()
+            while True:
+                await asyncio.sleep(LEADER_POLL_SECONDS)
+                await conn.execute(select(1))
+                await conn.commit()
+                await self._dispatch_pending()
+
+    async def _lead(self) -> None:
+        while True:
+            try:
+                await self._try_lead()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Lost job runner leadership")
+                self.leader = False
+                await self._cancel_tasks()
+            await asyncio.sleep(LEADER_RETRY_SECONDS)
+
+    def _on_jobs_published(self) -> None:
+        if self.leader:
+            task = asyncio.get_running_loop().create_task(self._dispatch_pending())
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch_pending(self) -> None:
+        if not self.leader:
+            return
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Job.id).where(Job.status == JobStatus.PENDING).order_by(Job.id)
+            )
+            job_ids = list(result.scalars().all())
+        for job_id in job_ids:
+            if job_id not in self._tasks:
+                logger.info("Dispatching pending job %s", job_id)
+                self._schedule(job_id)
+
+    async def _cancel_tasks(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _schedule(self, job_id: int) -> None:
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _update(self, job_id: int, **fields) -> None:
+        async with self.session_factory() as db:
+            job = await db.get(Job, job_id)
+            for key, value in fields.items():
+                setattr(job, key, value)
+            await db.commit()
+
+    async def _run(self, job_id: int) -> None:
+        async with self._semaphore:
+            async with self.session_factory() as db:
+                claimed = await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+                    .values(status=JobStatus.RUNNING, error=None)
+                )
+                await db.commit()
+                if claimed.rowcount == 0:
+                    return
+                job = await db.get(Job, job_id)
+            handler = self.handlers.get(job.kind)
+            if handler is None:
+                await self._update(job_id, status=JobStatus.FAILED, error="Unknown job kind")
+                return
+            ctx = JobContext(self, job)
+            try:
+                result = await handler(ctx, job.params)
+            except asyncio.CancelledError:
+                status = JobStatus.PENDING if job.kind in self.resumable else JobStatus.FAILED
+                await asyncio.shield(
+                    self._update(job_id, status=status, error="Interrupted by shutdown")
+                )
+                raise
+            except JobError as exc:
+                logger.warning("Job %s (%s) failed: %s", job_id, job.kind, exc)
+                await self._update(job_id, status=JobStatus.FAILED, error=str(exc))
+                return
+            except Exception:
+                # Raw exception text can carry file paths or contents; keep it in the logs.
+                logger.exception("Job %s (%s) failed", job_id, job.kind)
+                await self._update(job_id, status=JobStatus.FAILED, error=FAILED_JOB_ERROR)
+                return
+            await self._update(job_id, status=JobStatus.SUCCEEDED, result=result or {})
@@ -0,0 +1,238 @@
+import json
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.invalidation import CONTRACTS_TOPIC, invalidation_bus
+from app.models.contract import Contract, ContractStatus
+from app.models.job import Job, JobStatus
+from app.schemas.contract import ContractCreate, ContractFilter
+from app.services import (
+    contract_service,
+    history_service,
+    idempotency_service,
+    saved_search_service,
+)
+from app.services.contract_index import contract_index
+from app.services.contract_service import stream_contracts
+from app.services.export_service import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_rows
+from app.services.job_runner import JobContext, JobError, JobHandler
+
+IMPORT_BATCH_SIZE = 1000
+ARCHIVE_BATCH_SIZE = 1000
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Job]:
+    return await db.get(Job, job_id)
+
+
+def resolve_job_file(directory: str, name) -> Path:
+    """``name`` as a file directly inside ``directory``; anything else is a ValueError."""
+    base = Path(directory).resolve()
+    if not isinstance(name, str) or not name or (base / name).resolve().parent != base:
+        raise ValueError("Expected a plain file name")
+    return base / name
+
+
+def _export_filters(params: dict) -> ContractFilter:
+    filters = params.get("filters", {})
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object")
+    # Unlike browsing, exports default to every status.
+    return ContractFilter.model_validate({"status": None, **filters})
+
+
+def validate_job_params(kind: str, params: dict) -> None:
+    if kind == "import_contracts":
+        resolve_job_file(get_settings().IMPORT_DIR, params.get("file"))
+    elif kind == "export_contracts":
+        if "path" in params:
+            raise ValueError(
+                "Exports are written to EXPORT_DIR; download them from /jobs/{id}/file"
+            )
+        if params.get("format", "csv") not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {params['format']}")
+        _export_filters(params)
+
+
+def export_file(job: Job) -> Optional[Path]:
+    """The file a succeeded export job wrote, if it is still there."""
+    if job.kind != "export_contracts" or job.status != JobStatus.SUCCEEDED or not job.result:
+        return None
+    try:
+        path = resolve_job_file(get_settings().EXPORT_DIR, job.result.get("file"))
+    except ValueError:
+        return None
+    return path if path.is_file() else None
+
+
+async def store_import(chunks: AsyncIterator[bytes], max_bytes: int) -> str:
+    """Save an uploaded import under a generated name in IMPORT_DIR and return the name."""
+    directory = Path(get_settings().IMPORT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"upload-{uuid.uuid4().hex}.json"
+    path = directory / name
+    size = 0
+    try:
+        with open(path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                f.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return name
+
+
+def _load_contract_file(path: str) -> list[dict]:
+    # Messages name the problem, never the path or the offending content.
+    try:
+        with open(path) as f:
+            records = json.load(f)
+    except FileNotFoundError:
+        raise JobError("Import file not found") from None
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise JobError("Import file is not valid JSON") from None
+    if not isinstance(records, list):
+        raise JobError("Import file must contain a JSON array of contracts")
+    contracts = []
+    for index, record in enumerate(records):
+        try:
+            contracts.append(ContractCreate(**record).model_dump())
+        except (TypeError, ValidationError):
+            raise JobError(f"Invalid contract at index {index}") from None
+    return contracts
+
+
+async def import_contracts(ctx: JobContext, params: dict) -> dict:
+    try:
+        path = resolve_job_file(get_settings().IMPORT_DIR, params.get("file"))
+    except ValueError as exc:
+        raise JobError(str(exc)) from None
+    records = await ctx.run_cpu(_load_contract_file, str(path))
+    await ctx.set_progress(ctx.progress, total=len(records))
+    for start in range(ctx.progress, len(records), IMPORT_BATCH_SIZE):
+        batch = records[start : start + IMPORT_BATCH_SIZE]
+        async with ctx.session() as db:
+            contracts = [Contract(**data, status=ContractStatus.AVAILABLE) for data in batch]
+            db.add_all(contracts)
+            await db.flush()
+            await history_service.record_many(db, contracts, "created")
+            await saved_search_service.enqueue_matches(db, ((None, c) for c in contracts))
+            contract_index.stage(db, *contracts)
+            await ctx.set_progress(start + len(batch), db=db)
+            await invalidation_bus.publish(CONTRACTS_TOPIC, db)
+            await db.commit()
+    return {"imported": len(records)}
+
+
+async def export_contracts(ctx: JobContext, params: dict) -> dict:
+    export_format = params.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        raise JobError(f"Unknown export format: {export_format}")
+    try:
+        filters = _export_filters(params)
+    except ValueError:
+        raise JobError("Invalid export filters") from None
+    exported = 0
+
+    async def counted(chunks):
+        nonlocal exported
+        async for rows in chunks:
+            yield rows
+            exported += len(rows)
+            await ctx.set_progress(exported)
+
+    async with ctx.session() as db:
+        chunks = stream_contracts(
+            db,
+            chunk_size=EXPORT_CHUNK_SIZE,
+            energy_types=filters.energy_type,
+            price_min=filters.price_min,
+            price_max=filters.price_max,
+            qty_min=filters.qty_min,
+            qty_max=filters.qty_max,
+            location=filters.location,
+            delivery_start_min=filters.delivery_start_min,
+            delivery_end_max=filters.delivery_end_max,
+            status=filters.status,
+        )
+        # Server-generated name; written under a temporary name until complete.
+        directory = Path(get_settings().EXPORT_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"export-{ctx.job_id}.{EXPORT_FORMATS[export_format][1]}"
+        partial = directory / f".{name}.partial"
+        try:
+            with open(partial, "wb") as f:
+                async for data in export_rows(counted(chunks), export_format):
+                    f.write(data)
+            partial.replace(directory / name)
+        finally:
+            partial.unlink(missing_ok=True)
+    return {"exported": exported, "file": name}
+
+
+async def purge_idempotency_keys(ctx: JobContext, params: dict) -> dict:
+    async with ctx.session() as db:
+        purged = await idempotency_service.purge_expired(db)
+        await db.commit()
+    return {"purged": purged}
+
+
+async def purge_saved_search_matches(ctx: JobContext, params: dict) -> dict:
+    async with ctx.session() as db:
+        purged = await saved_search_service.purge_expired_matches(db)
+        await db.commit()
+    return {"purged": purged}
+
+
+async def archive_contracts(ctx: JobContext, params: dict) -> dict:
+    expired_before = params.get("expired_before")
+    if expired_before is not None:
+        expired_before = date.fromisoformat(expired_before)
+    archived = ctx.progress
+    last_id = 0
+    while True:
+        async with ctx.session() as db:
+            ids = await contract_service.find_archivable_contracts(
+                db, last_id, ARCHIVE_BATCH_SIZE, expired_before
+            )
+            if not ids:
+                break
+            archived += len(await contract_service.archive_contracts(db, ids, expired_before))
+            await ctx.set_progress(archived, db=db)
+            await db.commit()
+        last_id = ids[-1]
+    return {"archived": archived}
+
+
+async def checkpoint_contract_events(ctx: JobContext, params: dict) -> dict:
+    lag = timedelta(
+        seconds=params.get("lag_seconds", history_service.CHECKPOINT_LAG.total_seconds())
+    )
+    async with ctx.session() as db:
+        checkpoint_id = await history_service.create_checkpoint(db, lag)
+        await db.commit()
+    return {"checkpoint_id": checkpoint_id}
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    "import_contracts": import_contracts,
+    "export_contracts": export_contracts,
+    "purge_idempotency_keys": purge_idempotency_keys,
+    "purge_saved_search_matches": purge_saved_search_matches,
+    "archive_contracts": archive_contracts,
+    "checkpoint_contract_events": checkpoint_contract_events,
+}
+RESUMABLE_JOB_KINDS = frozenset({"import_contracts", "archive_contracts"})
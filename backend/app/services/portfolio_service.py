@@ -1,47 +1,122 @@
-from collections import defaultdict
 from decimal import Decimal
-from typing import Optional
+from typing import AsyncIterator, Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Numeric, Row, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager
 
+from app.core.db import stream_partitions
+from app.core.invalidation import CONTRACTS_TOPIC, PORTFOLIOS_TOPIC, invalidation_bus
 from app.models.contract import Contract, ContractStatus
-from app.models.portfolio import PortfolioItem
+from app.models.portfolio import Portfolio, PortfolioItem
 from app.schemas.portfolio import EnergyTypeBreakdown, PortfolioMetrics
+from app.services import history_service
+from app.services.contract_index import contract_index
+
+
+async def create_portfolio(db: AsyncSession, name: str) -> Portfolio:
+    portfolio = Portfolio(name=name)
+    db.add(portfolio)
+    await db.flush()
+    await db.refresh(portfolio)
+    return portfolio
+
+
+async def get_portfolio_by_id(db: AsyncSession, portfolio_id: int) -> Optional[Portfolio]:
+    return await db.get(Portfolio, portfolio_id)
+
+
+async def get_portfolio_item(
+    db: AsyncSession, portfolio_id: int, contract_id: int
+) -> Optional[PortfolioItem]:
+    query = select(PortfolioItem).where(
+        PortfolioItem.portfolio_id == portfolio_id, PortfolioItem.contract_id == contract_id
+    )
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
 
 
 async def get_portfolio_item_by_contract(
     db: AsyncSession, contract_id: int
 ) -> Optional[PortfolioItem]:
-    query = select(PortfolioItem).where(PortfolioItem.contract_id == contract_id)
+    query = select(PortfolioItem).where(PortfolioItem.contract_id == contract_id).limit(1)
     result = await db.execute(query)
-    return result.scalar_one_or_none()
+    return result.scalars().first()
+
 
+async def _publish_portfolio_change(db: AsyncSession) -> None:
+    await invalidation_bus.publish(PORTFOLIOS_TOPIC, db)
+    await invalidation_bus.publish(CONTRACTS_TOPIC, db)
 
-async def add_to_portfolio(db: AsyncSession, contract: Contract) -> PortfolioItem:
+
+async def add_to_portfolio(
+    db: AsyncSession, portfolio_id: int, contract: Contract
+) -> PortfolioItem:
+    before = history_service.contract_state(contract)
     contract.status = ContractStatus.RESERVED
-    item = PortfolioItem(contract_id=contract.id)
+    item = PortfolioItem(portfolio_id=portfolio_id, contract_id=contract.id)
     db.add(item)
     await db.flush()
     await db.refresh(item)
+    await history_service.record(db, contract, "reserved", before)
+    contract_index.stage(db, contract)
+    await _publish_portfolio_change(db)
     return item
 
 
 async def remove_from_portfolio(db: AsyncSession, item: PortfolioItem) -> None:
     contract = await db.get(Contract, item.contract_id)
     if contract:
+        before = history_service.contract_state(contract)
         contract.status = ContractStatus.AVAILABLE
     await db.delete(item)
+    if contract:
+        await db.flush()
+        await history_service.record(db, contract, "released", before)
+        contract_index.stage(db, contract)
+    await _publish_portfolio_change(db)
 
 
-async def get_portfolio(db: AsyncSession) -> tuple[list[PortfolioItem], PortfolioMetrics]:
-    query = select(PortfolioItem).options(joinedload(PortfolioItem.contract))
-    result = await db.execute(query)
-    items = list(result.scalars().all())
+# Metrics are summed as scaled integers: quantities and prices in hundredths (the
+# columns are Numeric(12,2) and Numeric(10,2)), costs in ten-thousandths. Decimals
+# are only built for the response, with the exponents Decimal sums of the columns
+# would have had.
+_HUNDRED = Decimal(100)
+
+
+def _hundredths(value: Decimal) -> int:
+    return int(value * _HUNDRED)
+
+
+def _hundredths_column(column):
+    return cast(func.round(column * 100), BigInteger)
+
+
+def _decimal(value: int, places: int) -> Decimal:
+    return Decimal(value).scaleb(-places)
+
+
+def _build_metrics(rows: Iterable[tuple[str, int, int, int]]) -> PortfolioMetrics:
+    """``rows`` hold each energy type's count, MWh in hundredths and cost in ten-thousandths."""
+    total_contracts = 0
+    total_capacity = 0
+    total_cost = 0
+    breakdown_list = []
+    for energy_type, count, mwh, cost in rows:
+        total_contracts += count
+        total_capacity += mwh
+        total_cost += cost
+        breakdown_list.append(
+            EnergyTypeBreakdown(
+                energy_type=energy_type,
+                count=count,
+                total_mwh=_decimal(mwh, 2),
+                total_cost=_decimal(cost, 4),
+            )
+        )
 
-    if not items:
-        return items, PortfolioMetrics(
+    if not total_contracts:
+        return PortfolioMetrics(
             total_contracts=0,
             total_capacity_mwh=Decimal("0"),
             total_cost=Decimal("0"),
@@ -49,38 +124,124 @@ async def get_portfolio(db: AsyncSession) -> tuple[list[PortfolioItem], Portfoli
             breakdown_by_energy_type=[],
         )
 
-    total_capacity = Decimal("0")
-    total_cost = Decimal("0")
-    breakdown: dict[str, dict] = defaultdict(
-        lambda: {"count": 0, "mwh": Decimal("0"), "cost": Decimal("0")}
+    capacity = _decimal(total_capacity, 2)
+    cost = _decimal(total_cost, 4)
+    # Divided as Decimals, like before, so the average rounds identically.
+    weighted_avg = cost / capacity if total_capacity > 0 else Decimal("0")
+    return PortfolioMetrics(
+        total_contracts=total_contracts,
+        total_capacity_mwh=capacity,
+        total_cost=cost,
+        weighted_avg_price_per_mwh=weighted_avg.quantize(Decimal("0.01")),
+        breakdown_by_energy_type=breakdown_list,
     )
 
-    for item in items:
-        c = item.contract
-        qty = c.quantity_mwh
-        cost = qty * c.price_per_mwh
-        total_capacity += qty
-        total_cost += cost
-        breakdown[c.energy_type]["count"] += 1
-        breakdown[c.energy_type]["mwh"] += qty
-        breakdown[c.energy_type]["cost"] += cost
-
-    weighted_avg = total_cost / total_capacity if total_capacity > 0 else Decimal("0")
-    breakdown_list = [
-        EnergyTypeBreakdown(
-            energy_type=et,
-            count=data["count"],
-            total_mwh=data["mwh"],
-            total_cost=data["cost"],
+
+def _accumulate(breakdown: dict[str, list], energy_type: str, qty: int, price: int) -> None:
+    entry = breakdown.get(energy_type)
+    if entry is None:
+        entry = breakdown[energy_type] = [energy_type, 0, 0, 0]
+    entry[1] += 1
+    entry[2] += qty
+    entry[3] += qty * price
+
+
+async def get_portfolio(
+    db: AsyncSession, portfolio_id: int
+) -> tuple[list[PortfolioItem], PortfolioMetrics]:
+    # The scaled columns come alongside the contracts: converting the loaded Decimals
+    # in Python would cost more than the integer sums save.
+    query = (
+        select(
+            PortfolioItem,
+            _hundredths_column(Contract.quantity_mwh),
+            _hundredths_column(Contract.price_per_mwh),
         )
-        for et, data in breakdown.items()
-    ]
+        .join(PortfolioItem.contract)
+        .options(contains_eager(PortfolioItem.contract))
+        .where(PortfolioItem.portfolio_id == portfolio_id)
+        .order_by(PortfolioItem.id)
+    )
+    result = await db.execute(query)
 
-    metrics = PortfolioMetrics(
-        total_contracts=len(items),
-        total_capacity_mwh=total_capacity,
-        total_cost=total_cost,
-        weighted_avg_price_per_mwh=weighted_avg.quantize(Decimal("0.01")),
-        breakdown_by_energy_type=breakdown_list,
+    items = []
+    breakdown: dict[str, list] = {}
+    for item, qty, price in result.all():
+        items.append(item)
+        _accumulate(breakdown, item.contract.energy_type, qty, price)
+
+    return items, _build_metrics(breakdown.values())
+
+
+PORTFOLIO_ITEM_COLUMNS = (
+    PortfolioItem.id,
+    PortfolioItem.contract_id,
+    PortfolioItem.added_at,
+    Contract.energy_type,
+    Contract.quantity_mwh,
+    Contract.price_per_mwh,
+)
+
+
+async def stream_portfolio_items(
+    db: AsyncSession, portfolio_id: int, chunk_size: int = 5000
+) -> AsyncIterator[list[Row]]:
+    query = (
+        select(*PORTFOLIO_ITEM_COLUMNS)
+        .join(Contract, Contract.id == PortfolioItem.contract_id)
+        .where(PortfolioItem.portfolio_id == portfolio_id)
+        .order_by(PortfolioItem.id)
+    )
+    async for partition in stream_partitions(db, query, chunk_size):
+        yield partition
+
+
+async def compute_portfolio_metrics(
+    db: AsyncSession, portfolio_id: int, chunk_size: int = 5000
+) -> PortfolioMetrics:
+    # The database scales the columns, so no Decimal is built per row.
+    query = (
+        select(
+            Contract.energy_type,
+            _hundredths_column(Contract.quantity_mwh),
+            _hundredths_column(Contract.price_per_mwh),
+        )
+        .select_from(PortfolioItem)
+        .join(Contract, Contract.id == PortfolioItem.contract_id)
+        .where(PortfolioItem.portfolio_id == portfolio_id)
+        .order_by(PortfolioItem.id)
     )
-    return items, metrics
+    breakdown: dict[str, list] = {}
+    async for rows in stream_partitions(db, query, chunk_size):
+        for energy_type, qty, price in rows:
+            _accumulate(breakdown, energy_type, qty, price)
+    return _build_metrics(breakdown.values())
+
+
+async def get_portfolio_metrics_batch(
+    db: AsyncSession, portfolio_ids: list[int]
+) -> dict[int, PortfolioMetrics]:
+    cost = func.sum(Contract.quantity_mwh * Contract.price_per_mwh, type_=Numeric(24, 4))
+    query = (
+        select(
+            Portfolio.id,
+            Contract.energy_type,
+            func.count(PortfolioItem.id),
+            func.sum(Contract.quantity_mwh, type_=Numeric(14, 2)),
+            cost,
+        )
+        .select_from(Portfolio)
+        .outerjoin(PortfolioItem, PortfolioItem.portfolio_id == Portfolio.id)
+        .outerjoin(Contract, Contract.id == PortfolioItem.contract_id)
+        .where(Portfolio.id.in_(portfolio_ids))
+        .group_by(Portfolio.id, Contract.energy_type)
+        .order_by(Portfolio.id, Contract.energy_type)
+    )
+    result = await db.execute(query)
+
+    grouped: dict[int, list[tuple[str, int, int, int]]] = {}
+    for portfolio_id, energy_type, count, mwh, total in result.all():
+        rows = grouped.setdefault(portfolio_id, [])
+        if count:
+            rows.append((energy_type, count, _hundredths(mwh), int(total.scaleb(4))))
+    return {portfolio_id: _build_metrics(rows) for portfolio_id, rows in grouped.items()}
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Integer, String, column, delete, insert, literal, select, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.invalidation import SAVED_SEARCHES_TOPIC, invalidation_bus
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.services.history_service import contract_state
+from app.services.search_index import Probe, search_index
+
+
+async def create_saved_search(db: AsyncSession, name: str, criteria: dict) -> SavedSearch:
+    search = SavedSearch(name=name, criteria=criteria)
+    db.add(search)
+    await db.flush()
+    await db.refresh(search)
+    search_index.stage_add(db, search.id, search.criteria)
+    await invalidation_bus.publish(SAVED_SEARCHES_TOPIC, db)
+    return search
+
+
+async def get_saved_search(db: AsyncSession, search_id: int) -> Optional[SavedSearch]:
+    return await db.get(SavedSearch, search_id)
+
+
+async def delete_saved_search(db: AsyncSession, search: SavedSearch) -> None:
+    await db.delete(search)
+    search_index.stage_remove(db, search.id)
+    await invalidation_bus.publish(SAVED_SEARCHES_TOPIC, db)
+
+
+async def list_matches(
+    db: AsyncSession, search_id: int, after_id: int = 0, limit: int = 100
+) -> list[SavedSearchMatch]:
+    query = (
+        select(SavedSearchMatch)
+        .where(SavedSearchMatch.search_id == search_id, SavedSearchMatch.id > after_id)
+        .order_by(SavedSearchMatch.id)
+        .limit(limit)
+    )
+    return list((await db.scalars(query)).all())
+
+
+async def acknowledge_matches(db: AsyncSession, search_id: int, through_id: int) -> int:
+    result = await db.execute(
+        delete(SavedSearchMatch).where(
+            SavedSearchMatch.search_id == search_id, SavedSearchMatch.id <= through_id
+        )
+    )
+    return result.rowcount
+
+
+async def purge_expired_matches(db: AsyncSession) -> int:
+    """Delete matches older than SAVED_SEARCH_MATCH_TTL_SECONDS, acknowledged or not."""
+    ttl = timedelta(seconds=get_settings().SAVED_SEARCH_MATCH_TTL_SECONDS)
+    result = await db.execute(
+        delete(SavedSearchMatch).where(SavedSearchMatch.matched_at <= datetime.utcnow() - ttl)
+    )
+    return result.rowcount
+
+
+async def enqueue_matches(db: AsyncSession, changes: Iterable[tuple[Optional[dict], Any]]) -> None:
+    """Queue a match for each saved search a created or changed contract now satisfies.
+
+    ``changes`` pairs the contract's state before the write (None when created) with
+    the contract after it. A change that leaves the price alone only notifies the
+    searches the contract did not already match.
+    """
+    if not len(search_index):
+        return
+    pending = []
+    for before, contract in changes:
+        after = contract_state(contract)
+        probe = Probe.from_state(after)
+        matched = search_index.match(probe) if probe is not None else None
+        if not matched:
+            continue
+        if before is None:
+            kind = "created"
+        elif before["price_per_mwh"] != after["price_per_mwh"]:
+            kind = "repriced"
+        else:
+            kind = "updated"
+            previous = Probe.from_state(before)
+            if previous is not None:
+                already = set(search_index.match(previous))
+                matched = [search_id for search_id in matched if search_id not in already]
+        pending.extend((search_id, contract.id, kind) for search_id in matched)
+    if not pending:
+        return
+    rows = values(
+        column("search_id", Integer),
+        column("contract_id", Integer),
+        column("kind", String(20)),
+        name="pending",
+    ).data(pending)
+    # The join drops matches for searches deleted by another worker whose index
+    # has not caught up yet.
+    rows = rows.cte("pending")
+    query = select(rows.c.search_id, rows.c.contract_id, rows.c.kind, literal(datetime.utcnow()))
+    await db.execute(
+        insert(SavedSearchMatch).from_select(
+            ["search_id", "contract_id", "kind", "matched_at"],
+            query.join(SavedSearch, SavedSearch.id == rows.c.search_id),
+        )
+    )
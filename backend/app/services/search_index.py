@@ -0,0 +1,256 @@
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import stream_partitions
+from app.core.invalidation import SAVED_SEARCHES_TOPIC
+from app.models.contract import ContractStatus
+from app.models.saved_search import SavedSearch
+from app.services.synced_index import SyncedIndex
+
+logger = logging.getLogger(__name__)
+
+RELOAD_CHUNK_SIZE = 5000
+# Searches are bucketed by price in 5.00/MWh steps; one with an open price range,
+# or spanning more buckets than this, goes on its energy type's open list instead.
+PRICE_BUCKET_CENTS = 500
+MAX_BUCKETS_PER_SEARCH = 32
+
+
+def _cents(value) -> Optional[int]:
+    return None if value is None else int((Decimal(value) * 100).to_integral_value())
+
+
+def _date(value) -> Optional[date]:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class Probe(NamedTuple):
+    """The fields of one contract that saved searches filter on."""
+
+    energy_type: str
+    price: int
+    quantity: int
+    location: str
+    delivery_start: date
+    delivery_end: date
+
+    @classmethod
+    def from_state(cls, state: dict) -> Optional["Probe"]:
+        """Probe for a ``history_service.contract_state`` dict; None unless Available."""
+        if state["status"] != ContractStatus.AVAILABLE.value:
+            return None
+        return cls(
+            state["energy_type"],
+            _cents(state["price_per_mwh"]),
+            _cents(state["quantity_mwh"]),
+            state["location"].lower(),
+            _date(state["delivery_start"]),
+            _date(state["delivery_end"]),
+        )
+
+
+class Predicate(NamedTuple):
+    search_id: int
+    energy_types: Optional[tuple[str, ...]]
+    price_min: Optional[int]
+    price_max: Optional[int]
+    qty_min: Optional[int]
+    qty_max: Optional[int]
+    location: Optional[str]
+    delivery_start_min: Optional[date]
+    delivery_end_max: Optional[date]
+
+    @classmethod
+    def from_criteria(cls, search_id: int, criteria: dict) -> "Predicate":
+        location = criteria.get("location")
+        return cls(
+            search_id,
+            tuple(criteria["energy_type"]) if criteria.get("energy_type") else None,
+            _cents(criteria.get("price_min")),
+            _cents(criteria.get("price_max")),
+            _cents(criteria.get("qty_min")),
+            _cents(criteria.get("qty_max")),
+            location.lower() if location else None,
+            _date(criteria.get("delivery_start_min")),
+            _date(criteria.get("delivery_end_max")),
+        )
+
+    def matches(self, probe: Probe) -> bool:
+        # Same semantics as the browse filters; energy type and price are already
+        # narrowed by the bucket the predicate was found in, but checked for exactness.
+        return (
+            (self.energy_types is None or probe.energy_type in self.energy_types)
+            and (self.price_min is None or probe.price >= self.price_min)
+            and (self.price_max is None or probe.price <= self.price_max)
+            and (self.qty_min is None or probe.quantity >= self.qty_min)
+            and (self.qty_max is None or probe.quantity <= self.qty_max)
+            and (self.location is None or self.location in probe.location)
+            and (self.delivery_start_min is None or probe.delivery_start >= self.delivery_start_min)
+            and (self.delivery_end_max is None or probe.delivery_end <= self.delivery_end_max)
+        )
+
+    def buckets(self) -> Optional[range]:
+        if self.price_min is None or self.price_max is None:
+            return None
+        buckets = range(
+            self.price_min // PRICE_BUCKET_CENTS, self.price_max // PRICE_BUCKET_CENTS + 1
+        )
+        return buckets if len(buckets) <= MAX_BUCKETS_PER_SEARCH else None
+
+
+class _Tree:
+    """Predicates keyed by energy type (None: any), then by price bucket."""
+
+    def __init__(self):
+        self.predicates: dict[int, Predicate] = {}
+        self.ranged: dict[Optional[str], dict[int, dict[int, Predicate]]] = {}
+        self.open: dict[Optional[str], dict[int, Predicate]] = {}
+
+    def __len__(self) -> int:
+        return len(self.predicates)
+
+    def add(self, predicate: Predicate) -> None:
+        self.remove(predicate.search_id)
+        self.predicates[predicate.search_id] = predicate
+        buckets = predicate.buckets()
+        for key in predicate.energy_types or (None,):
+            if buckets is None:
+                self.open.setdefault(key, {})[predicate.search_id] = predicate
+                continue
+            ranged = self.ranged.setdefault(key, {})
+            for bucket in buckets:
+                ranged.setdefault(bucket, {})[predicate.search_id] = predicate
+
+    def remove(self, search_id: int) -> None:
+        predicate = self.predicates.pop(search_id, None)
+        if predicate is None:
+            return
+        buckets = predicate.buckets()
+        for key in predicate.energy_types or (None,):
+            if buckets is None:
+                self.open[key].pop(search_id, None)
+                continue
+            for bucket in buckets:
+                self.ranged[key][bucket].pop(search_id, None)
+
+    def candidates(self, probe: Probe) -> list[dict[int, Predicate]]:
+        """The (at most four) groups of predicates ``probe`` can possibly satisfy."""
+        bucket = probe.price // PRICE_BUCKET_CENTS
+        groups = []
+        for key in (probe.energy_type, None):
+            ranged = self.ranged.get(key)
+            if ranged is not None and bucket in ranged:
+                groups.append(ranged[bucket])
+            if key in self.open:
+                groups.append(self.open[key])
+        return groups
+
+
+class SearchIndex(SyncedIndex):
+    """In-memory predicate index over saved searches.
+
+    Contract writes probe it to find the searches a new or changed contract matches,
+    examining only the searches filed under its energy type and price bucket. Local
+    changes apply on commit; other workers' creates and deletes arrive through the
+    invalidation bus.
+    """
+
+    topic = SAVED_SEARCHES_TOPIC
+    session_key = "search_index"
+    label = "Search index"
+
+    def __init__(self):
+        super().__init__()
+        self.probes = 0
+        self.examined = 0
+        self.matched = 0
+        self._watermark = 0
+
+    def __len__(self) -> int:
+        return len(self._data) if self._data is not None else 0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "searches": len(self),
+            "reloads": self.reloads,
+            "refreshes": self.refreshes,
+            "probes": self.probes,
+            "examined": self.examined,
+            "matched": self.matched,
+        }
+
+    def _reset(self) -> None:
+        self._watermark = 0
+
+    async def _load(self) -> _Tree:
+        tree = _Tree()
+        watermark = 0
+        async with self._session_factory() as db:
+            query = select(SavedSearch.id, SavedSearch.criteria).order_by(SavedSearch.id)
+            async for rows in stream_partitions(db, query, RELOAD_CHUNK_SIZE):
+                for search_id, criteria in rows:
+                    tree.add(Predicate.from_criteria(search_id, criteria))
+                    watermark = search_id
+        self._watermark = max(self._watermark, watermark)
+        logger.info("Search index loaded %d saved searches", len(tree))
+        return tree
+
+    async def _refresh(self) -> None:
+        # Searches are never updated, so new ids cover creates; deletes are found by
+        # checking which searches indexed before this refresh still exist.
+        indexed = set(self._data.predicates)
+        watermark = self._watermark
+        existing = set()
+        async with self._session_factory() as db:
+            query = select(SavedSearch.id).where(SavedSearch.id <= watermark)
+            async for rows in stream_partitions(db, query, RELOAD_CHUNK_SIZE):
+                existing.update(search_id for (search_id,) in rows)
+            query = (
+                select(SavedSearch.id, SavedSearch.criteria)
+                .where(SavedSearch.id > watermark)
+                .order_by(SavedSearch.id)
+            )
+            async for rows in stream_partitions(db, query, RELOAD_CHUNK_SIZE):
+                for search_id, criteria in rows:
+                    self._apply("add", Predicate.from_criteria(search_id, criteria))
+                    self._watermark = max(self._watermark, search_id)
+        for search_id in indexed - existing:
+            if search_id <= watermark:
+                self._apply("remove", search_id)
+
+    @staticmethod
+    def _apply_to(tree: _Tree, op: str, value) -> None:
+        if op == "add":
+            tree.add(value)
+        else:
+            tree.remove(value)
+
+    def match(self, probe: Probe) -> list[int]:
+        """Ids of the saved searches ``probe`` satisfies."""
+        self.probes += 1
+        matched = []
+        if self._data is None:
+            return []
+        for group in self._data.candidates(probe):
+            self.examined += len(group)
+            matched.extend(p.search_id for p in group.values() if p.matches(probe))
+        self.matched += len(matched)
+        return matched
+
+    def stage_add(self, db: AsyncSession, search_id: int, criteria: dict) -> None:
+        """Index the search once ``db`` commits. Call after a flush."""
+        if self.enabled:
+            self._stage(db, "add", Predicate.from_criteria(search_id, criteria))
+
+    def stage_remove(self, db: AsyncSession, search_id: int) -> None:
+        self._stage(db, "remove", search_id)
+
+
+search_index = SearchIndex()
+search_index.listen()
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+REFRESH_DEBOUNCE_SECONDS = 0.5
+
+
+class SyncedIndex:
+    """Lifecycle shared by the per-worker in-memory indexes.
+
+    Subclasses build their data in ``_load``, apply one staged change with
+    ``_apply_to`` and catch up on other workers' writes in ``_refresh``. Local
+    writes are staged on the session and applied when it commits; ``topic``
+    invalidations trigger a debounced refresh, and a full reload every
+    ``reconcile_seconds`` repairs anything a refresh cannot see.
+    """
+
+    topic: str
+    session_key: str
+    label: str
+
+    def __init__(self):
+        self.enabled = False
+        self.reloads = 0
+        self.refreshes = 0
+        self._data: Any = None
+        self._replay: Optional[list[tuple[str, object]]] = None
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._refresh_needed: Optional[asyncio.Event] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def _load(self) -> Any:
+        raise NotImplementedError
+
+    async def _refresh(self) -> None:
+        raise NotImplementedError
+
+    @staticmethod
+    def _apply_to(data: Any, op: str, value) -> None:
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        """Forget refresh watermarks; called on stop."""
+
+    async def start(self, session_factory: async_sessionmaker, reconcile_seconds: float) -> None:
+        self.enabled = True
+        self._session_factory = session_factory
+        self._refresh_needed = asyncio.Event()
+        invalidation_bus.subscribe(self.topic, self._refresh_needed.set)
+        await self.reload()
+        self._tasks = [
+            asyncio.create_task(self._reconcile_loop(reconcile_seconds)),
+            asyncio.create_task(self._refresh_loop()),
+        ]
+
+    async def stop(self) -> None:
+        invalidation_bus.unsubscribe(self.topic, self._refresh_needed.set)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.enabled = False
+        self._data = None
+        self._reset()
+
+    async def reload(self) -> None:
+        # Writes committed while the reload streams are applied to the old data
+        # and replayed onto the new data before it is swapped in.
+        self._replay = replay = []
+        try:
+            data = await self._load()
+        finally:
+            self._replay = None
+        for op, value in replay:
+            self._apply_to(data, op, value)
+        self._data = data
+        self.reloads += 1
+
+    async def refresh(self) -> None:
+        if self._data is None:
+            return
+        await self._refresh()
+        self.refreshes += 1
+
+    async def _reconcile_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload()
+            except Exception:
+                logger.exception("%s reconciliation failed", self.label)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self._refresh_needed.wait()
+            await asyncio.sleep(REFRESH_DEBOUNCE_SECONDS)
+            self._refresh_needed.clear()
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("%s refresh failed", self.label)
+
+    def _apply(self, op: str, value) -> None:
+        if self._replay is not None:
+            self._replay.append((op, value))
+        if self._data is not None:
+            self._apply_to(self._data, op, value)
+
+    def _stage(self, db: AsyncSession, op: str, *values) -> None:
+        """Apply ``values`` once ``db`` commits. Call after a flush."""
+        if not self.enabled:
+            return
+        db.sync_session.info.setdefault(self.session_key, []).extend(
+            (op, value) for value in values
+        )
+
+    def _on_commit(self, session: Session) -> None:
+        for op, value in session.info.pop(self.session_key, ()):
+            self._apply(op, value)
+
+    def _on_transaction_end(self, session: Session, transaction) -> None:
+        if transaction.parent is None:
+            session.info.pop(self.session_key, None)
+
+    def listen(self) -> None:
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_transaction_end", self._on_transaction_end)
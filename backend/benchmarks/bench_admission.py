@@ -0,0 +1,106 @@
+"""Latency of cheap routes while another client floods expensive searches.
+
+Run from backend/: python -m benchmarks.bench_admission [--concurrency 64]
+
+Starts a single-worker server twice, with admission control disabled and with
+the default limits. The flood comes from 127.0.0.1 and the probe from
+127.0.0.2, so they get separate rate-limit buckets.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.bench_workers import _prepare_sqlite, _wait_ready
+
+FLOOD_PATH = "/contracts?location=Location&limit=100&sort_by=price_per_mwh&offset=200"
+PROBE_PATHS = ("/health", "/contracts/1")
+DISABLED = {
+    "RATE_LIMIT_PER_SECOND": "0",
+    "ROUTE_CONCURRENCY": "{}",
+    "POOL_WAIT_SHED_MS": "1000000",
+}
+
+
+async def _run(base_url: str, concurrency: int, duration: float) -> tuple[Counter, dict]:
+    statuses: Counter = Counter()
+    latencies: dict[str, list[float]] = {path: [] for path in PROBE_PATHS}
+    deadline = time.monotonic() + duration
+    flood_limits = httpx.Limits(max_connections=concurrency)
+    probe_transport = httpx.AsyncHTTPTransport(local_address="127.0.0.2")
+
+    async with (
+        httpx.AsyncClient(base_url=base_url, limits=flood_limits, timeout=60) as flood,
+        httpx.AsyncClient(base_url=base_url, transport=probe_transport, timeout=60) as probe,
+    ):
+
+        async def flooder():
+            while time.monotonic() < deadline:
+                response = await flood.get(FLOOD_PATH)
+                statuses[response.status_code] += 1
+                if response.status_code in (429, 503):
+                    await asyncio.sleep(0.05)
+
+        async def prober():
+            while time.monotonic() < deadline:
+                for path in PROBE_PATHS:
+                    start = time.perf_counter()
+                    (await probe.get(path)).raise_for_status()
+                    latencies[path].append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(prober(), *(flooder() for _ in range(concurrency)))
+    return statuses, latencies
+
+
+def _percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PORT=str(args.port), HOST="127.0.0.1", WEB_CONCURRENCY="1")
+    if "DATABASE_URL" not in env:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        asyncio.run(_prepare_sqlite(env["DATABASE_URL"], 5000))
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    for mode, overrides in (("off", DISABLED), ("on", {})):
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.serve"],
+            env={**env, **overrides},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_wait_ready(base_url))
+            statuses, latencies = asyncio.run(_run(base_url, args.concurrency, args.duration))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+        flood = " ".join(f"{code}={count}" for code, count in sorted(statuses.items()))
+        print(f"admission={mode:<3} flood: {flood}")
+        for path, values in latencies.items():
+            print(
+                f"  {path:<14} n={len(values):<4} p50={_percentile(values, 50):7.1f}ms"
+                f"  p99={_percentile(values, 99):7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Index size and browse latency before and after archiving sold contracts.
+
+Run from backend/: python -m benchmarks.bench_archive [--contracts 200000 --sold 0.8]
+
+Uses DATABASE_URL when set (PostgreSQL: pg_indexes_size); otherwise a
+throwaway SQLite file (dbstat). Tables are vacuumed after archiving so the
+sizes reflect reclaimed pages.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.db import Base
+from app.models import idempotency, job, portfolio  # noqa: F401
+from app.models.contract import Contract, ContractStatus
+from app.services import contract_service
+
+QUERIES = {
+    "default page": {},
+    "solar by price": {"energy_types": ["Solar"], "sort_by": "price_per_mwh"},
+    "location": {"location": "Location 7"},
+    "delivery window": {"delivery_start_min": date(2026, 6, 1), "sort_by": "delivery_start"},
+}
+
+
+async def _seed(engine, count: int, sold: float) -> None:
+    rng = random.Random(1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for start in range(0, count, 10000):
+            await conn.execute(
+                Contract.__table__.insert(),
+                [
+                    {
+                        "energy_type": rng.choice(["Solar", "Wind", "Hydro"]),
+                        "quantity_mwh": Decimal(rng.randrange(100, 1000)),
+                        "price_per_mwh": Decimal(rng.randrange(2000, 9000)) / 100,
+                        "delivery_start": date(2026, 1, 1) + timedelta(days=rng.randrange(365)),
+                        "delivery_end": date(2027, 1, 1),
+                        "location": f"Location {rng.randrange(50)}",
+                        "status": ContractStatus.SOLD
+                        if rng.random() < sold
+                        else ContractStatus.AVAILABLE,
+                    }
+                    for _ in range(start, min(start + 10000, count))
+                ],
+            )
+        await conn.execute(text("ANALYZE"))
+
+
+async def _index_bytes(engine) -> int:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            return await conn.scalar(text("SELECT pg_indexes_size('contracts')"))
+        return await conn.scalar(
+            text(
+                "SELECT sum(pgsize) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'contracts')"
+            )
+        )
+
+
+async def _report(engine, session_factory, label: str, calls: int) -> None:
+    print(f"{label}: contracts indexes {await _index_bytes(engine) / 1e6:.1f} MB")
+    async with session_factory() as db:
+        for name, query in QUERIES.items():
+            start = time.perf_counter()
+            for _ in range(calls):
+                await contract_service.list_contracts(db, **query)
+                db.expunge_all()
+            print(f"  {name:<16} {(time.perf_counter() - start) / calls * 1000:7.2f} ms")
+
+
+async def _archive(engine, session_factory) -> int:
+    archived = 0
+    last_id = 0
+    while ids := await _next_batch(session_factory, last_id):
+        async with session_factory() as db:
+            await contract_service.archive_contracts(db, ids)
+            await db.commit()
+        archived += len(ids)
+        last_id = ids[-1]
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if engine.dialect.name == "postgresql":
+            await conn.execute(text("VACUUM FULL ANALYZE contracts"))
+        else:
+            await conn.execute(text("VACUUM"))
+            await conn.execute(text("ANALYZE"))
+    return archived
+
+
+async def _next_batch(session_factory, last_id: int) -> list[int]:
+    async with session_factory() as db:
+        return await contract_service.find_archivable_contracts(db, last_id, 5000)
+
+
+async def _run(url: str, count: int, sold: float, calls: int, seed: bool) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    if seed:
+        await _seed(engine, count, sold)
+    await _report(engine, session_factory, "before", calls)
+    start = time.perf_counter()
+    archived = await _archive(engine, session_factory)
+    print(f"archived {archived} contracts in {time.perf_counter() - start:.1f}s")
+    await _report(engine, session_factory, "after", calls)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contracts", type=int, default=200000)
+    parser.add_argument("--sold", type=float, default=0.8)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    url = os.environ.get("DATABASE_URL")
+    seed = url is None
+    if url is None:
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    asyncio.run(_run(url, args.contracts, args.sold, args.calls, seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Repricing many contracts: one update per contract vs one batched statement.
+
+Run from backend/: python -m benchmarks.bench_batch_update [--contracts 5000]
+
+Uses a throwaway SQLite file. The per-contract path mirrors PUT /contracts/{id}
+(get_contract + update_contract); the batched path is PATCH /contracts/batch
+with per-contract items, then with a filter and a price adjustment.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.services import contract_service
+from benchmarks.bench_workers import _prepare_sqlite
+
+
+async def _timed(session_factory, label: str, fn) -> None:
+    async with session_factory() as db:
+        start = time.perf_counter()
+        await fn(db)
+        await db.commit()
+        print(f"{label:<22} {time.perf_counter() - start:7.2f}s")
+
+
+async def _run(url: str, count: int) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    ids = range(1, count + 1)
+
+    async def one_by_one(db):
+        for contract_id in ids:
+            contract = await contract_service.get_contract(db, contract_id)
+            await contract_service.update_contract(
+                db, contract, {"price_per_mwh": Decimal("51.00")}
+            )
+
+    async def items(db):
+        await contract_service.batch_update_contracts(
+            db, [{"id": contract_id, "price_per_mwh": Decimal("52.00")} for contract_id in ids]
+        )
+
+    async def adjust(db):
+        await contract_service.update_matching_contracts(
+            db, {"status": None}, {}, {"price_per_mwh": ("multiply", Decimal("1.03"))}
+        )
+
+    await _timed(session_factory, "per-contract updates", one_by_one)
+    await _timed(session_factory, "batch items", items)
+    await _timed(session_factory, "batch where + adjust", adjust)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contracts", type=int, default=5000)
+    args = parser.parse_args()
+
+    url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    asyncio.run(_prepare_sqlite(url, args.contracts))
+    asyncio.run(_run(url, args.contracts))
+
+
+if __name__ == "__main__":
+    main()
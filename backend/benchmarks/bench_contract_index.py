@@ -0,0 +1,84 @@
+"""Browse-query latency: in-memory contract index vs the SQL path.
+
+Run from backend/: python -m benchmarks.bench_contract_index [--contracts 50000]
+
+Uses DATABASE_URL when set; otherwise a throwaway SQLite file seeded with
+--contracts rows. Reports the mean wall time per call for each query shape.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.services import contract_service
+from app.services.contract_index import contract_index
+from benchmarks.bench_workers import _prepare_sqlite
+
+SHAPES = {
+    "default page": {},
+    "energy + price": {
+        "energy_types": ["Solar", "Wind"],
+        "price_min": Decimal("45"),
+        "price_max": Decimal("55"),
+    },
+    "location, by price": {"location": "Location 1", "sort_by": "price_per_mwh"},
+    "deep offset": {"offset": 20000, "sort_by": "quantity_mwh", "sort_dir": "desc"},
+    "delivery window": {"delivery_start_min": date(2026, 1, 1), "sort_by": "delivery_start"},
+}
+
+
+async def _time(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await fn()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+async def _run(url: str, calls: int) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    start = time.perf_counter()
+    await contract_index.start(session_factory, reconcile_seconds=3600)
+    stats = contract_index.stats()
+    print(f"index load: {stats['contracts']} contracts in {time.perf_counter() - start:.2f}s")
+
+    async with session_factory() as db:
+        for name, shape in SHAPES.items():
+
+            async def sql():
+                await contract_service.list_contracts(db, **shape)
+                db.expunge_all()
+
+            async def indexed():
+                contract_index.search(**shape)
+
+            sql_ms = await _time(sql, calls)
+            index_ms = await _time(indexed, calls)
+            print(
+                f"{name:<20} sql={sql_ms:8.2f}ms  index={index_ms:7.3f}ms  x{sql_ms / index_ms:.0f}"
+            )
+    await contract_index.stop()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contracts", type=int, default=50000)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    url = os.environ.get("DATABASE_URL")
+    if url is None:
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        asyncio.run(_prepare_sqlite(url, args.contracts))
+    asyncio.run(_run(url, args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Facet counts: one grouped query vs one count query per facet value.
+
+Run from backend/: python -m benchmarks.bench_facets [--contracts 200000]
+
+Uses DATABASE_URL when set (GROUPING SETS on PostgreSQL); otherwise a
+throwaway SQLite file (UNION ALL fallback). The per-value baseline issues one
+list_contracts count per energy type and location only; the grouped query also
+returns the price and quantity histograms.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.contract import Contract
+from app.services import contract_service
+from benchmarks.bench_workers import _prepare_sqlite
+
+PRICE_BUCKET = Decimal("10")
+QTY_BUCKET = Decimal("100")
+
+
+async def _per_value(db) -> None:
+    energy_types = (await db.scalars(select(Contract.energy_type).distinct())).all()
+    locations = (await db.scalars(select(Contract.location).distinct())).all()
+    for energy_type in energy_types:
+        await contract_service.list_contracts(db, energy_types=[energy_type], limit=1)
+    for location in locations:
+        await contract_service.list_contracts(db, location=location, limit=1)
+    db.expunge_all()
+
+
+async def _grouped(db) -> None:
+    await contract_service.facet_counts(db, PRICE_BUCKET, QTY_BUCKET)
+
+
+async def _run(url: str, calls: int) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        for name, fn in (("per-value counts", _per_value), ("grouped query", _grouped)):
+            start = time.perf_counter()
+            for _ in range(calls):
+                await fn(db)
+            print(f"{name:<18} {(time.perf_counter() - start) / calls * 1000:8.1f} ms")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contracts", type=int, default=200000)
+    parser.add_argument("--calls", type=int, default=5)
+    args = parser.parse_args()
+
+    url = os.environ.get("DATABASE_URL")
+    if url is None:
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        asyncio.run(_prepare_sqlite(url, args.contracts))
+    asyncio.run(_run(url, args.calls))
+
+
+if __name__ == "__main__":
+    main()
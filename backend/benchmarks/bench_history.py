@@ -0,0 +1,111 @@
+"""State-as-of reconstruction with and without a checkpoint.
+
+Run from backend/: python -m benchmarks.bench_history [--contracts 20000 --events 25]
+
+Uses a throwaway SQLite file seeded with --events price changes per contract,
+then times a full as-of read by replaying the log, and again from a checkpoint
+with a further 1% of events recorded after it.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.db import Base
+from app.models import contract, idempotency, job, portfolio  # noqa: F401
+from app.models.contract_event import ContractEvent
+from app.services import history_service
+
+BASE_STATE = {
+    "energy_type": "Solar",
+    "quantity_mwh": "100.00",
+    "delivery_start": "2026-01-01",
+    "delivery_end": "2026-12-31",
+    "location": "CA",
+    "status": "Available",
+}
+
+
+def _events(rng, contract_ids, start: datetime, first_seq: int, count: int):
+    occurred_at = start
+    for seq in range(first_seq, first_seq + count):
+        for contract_id in contract_ids:
+            occurred_at += timedelta(microseconds=10)
+            price = f"{rng.randrange(2000, 9000) / 100:.2f}"
+            yield {
+                "contract_id": contract_id,
+                "seq": seq,
+                "kind": "created" if seq == 1 else "updated",
+                "changes": {"price_per_mwh": price},
+                "state": {**BASE_STATE, "price_per_mwh": price},
+                "occurred_at": occurred_at,
+            }
+
+
+async def _insert(session_factory, rows) -> None:
+    batch = []
+    async with session_factory() as db:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == 10000:
+                await db.execute(insert(ContractEvent), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(ContractEvent), batch)
+        await db.commit()
+
+
+async def _as_of(session_factory) -> tuple[int, float]:
+    start = time.perf_counter()
+    count = 0
+    async with session_factory() as db:
+        async for chunk in history_service.stream_states_as_of(db, datetime.utcnow()):
+            count += len(chunk)
+    return count, time.perf_counter() - start
+
+
+async def _run(url: str, contracts: int, events: int) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(1)
+    ids = range(1, contracts + 1)
+    await _insert(session_factory, _events(rng, ids, datetime(2026, 1, 1), 1, events))
+    print(f"{contracts * events} events for {contracts} contracts")
+
+    count, elapsed = await _as_of(session_factory)
+    print(f"replay:     {count} states in {elapsed:.2f}s")
+
+    start = time.perf_counter()
+    async with session_factory() as db:
+        await history_service.create_checkpoint(db, timedelta(0))
+        await db.commit()
+    print(f"checkpoint: built in {time.perf_counter() - start:.2f}s")
+    recent = rng.sample(ids, max(1, contracts * events // 100))
+    await _insert(session_factory, _events(rng, recent, datetime.utcnow(), events + 1, 1))
+
+    count, elapsed = await _as_of(session_factory)
+    print(f"checkpoint: {count} states in {elapsed:.2f}s (+{len(recent)} events since)")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contracts", type=int, default=20000)
+    parser.add_argument("--events", type=int, default=25)
+    args = parser.parse_args()
+
+    url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    asyncio.run(_run(url, args.contracts, args.events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Portfolio metrics: Decimal arithmetic vs scaled integers.
+
+Run from backend/: python -m benchmarks.bench_portfolio_metrics [--items 1000000]
+
+First aggregates in-memory rows: Decimal sums of the column values, integer
+sums of values already in hundredths, and integer sums converting each Decimal
+in Python. Then, over a throwaway SQLite portfolio of --db-items items (0 skips
+it), times compute_portfolio_metrics and get_portfolio against their previous
+Decimal versions, which read the Decimal columns and summed them.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from app.core.db import Base
+from app.models import contract_event, idempotency, job, saved_search  # noqa: F401
+from app.models.contract import Contract, ContractStatus
+from app.models.portfolio import Portfolio, PortfolioItem
+from app.services import portfolio_service
+from app.services.portfolio_service import _accumulate, _build_metrics, _hundredths
+
+ENERGY_TYPES = ["Solar", "Wind", "Hydro", "Nuclear", "Gas"]
+
+
+def _rows(count: int) -> list[tuple[str, Decimal, Decimal]]:
+    rng = random.Random(1)
+    return [
+        (
+            rng.choice(ENERGY_TYPES),
+            Decimal(rng.randrange(100, 10**7)).scaleb(-2),
+            Decimal(rng.randrange(1000, 20000)).scaleb(-2),
+        )
+        for _ in range(count)
+    ]
+
+
+def _decimal_sums(rows) -> dict:
+    breakdown: dict[str, list] = {}
+    for energy_type, qty, price in rows:
+        entry = breakdown.setdefault(energy_type, [energy_type, 0, Decimal("0"), Decimal("0")])
+        entry[1] += 1
+        entry[2] += qty
+        entry[3] += qty * price
+    return breakdown
+
+
+def _scaled_sums(rows) -> dict:
+    breakdown: dict[str, list] = {}
+    for energy_type, qty, price in rows:
+        _accumulate(breakdown, energy_type, _hundredths(qty), _hundredths(price))
+    return breakdown
+
+
+def _sum_ints(rows) -> dict:
+    breakdown: dict[str, list] = {}
+    for energy_type, qty, price in rows:
+        _accumulate(breakdown, energy_type, qty, price)
+    return breakdown
+
+
+def _timed(label: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    print(f"{label:<28} {time.perf_counter() - start:7.2f}s")
+    return result
+
+
+async def _prepare(url: str, count: int) -> None:
+    engine = create_async_engine(url)
+    rows = _rows(count)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(Portfolio.__table__.insert(), [{"id": 1, "name": "bench"}])
+        await conn.execute(
+            Contract.__table__.insert(),
+            [
+                {
+                    "energy_type": energy_type,
+                    "quantity_mwh": qty,
+                    "price_per_mwh": price,
+                    "delivery_start": date(2026, 1, 1),
+                    "delivery_end": date(2026, 12, 31),
+                    "location": "CA",
+                    "status": ContractStatus.RESERVED,
+                }
+                for energy_type, qty, price in rows
+            ],
+        )
+        await conn.execute(
+            PortfolioItem.__table__.insert(),
+            [{"portfolio_id": 1, "contract_id": i} for i in range(1, count + 1)],
+        )
+    await engine.dispose()
+
+
+async def _run_db(url: str) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        start = time.perf_counter()
+        breakdown: dict[str, list] = {}
+        async for rows in portfolio_service.stream_portfolio_items(db, 1):
+            sums = _decimal_sums(
+                (row.energy_type, row.quantity_mwh, row.price_per_mwh) for row in rows
+            )
+            _merge(breakdown, sums)
+        print(f"{'metrics, Decimal':<28} {time.perf_counter() - start:7.2f}s")
+
+        start = time.perf_counter()
+        await portfolio_service.compute_portfolio_metrics(db, 1)
+        print(f"{'metrics, scaled':<28} {time.perf_counter() - start:7.2f}s")
+
+    async with session_factory() as db:
+        start = time.perf_counter()
+        query = (
+            select(PortfolioItem)
+            .options(joinedload(PortfolioItem.contract))
+            .where(PortfolioItem.portfolio_id == 1)
+            .order_by(PortfolioItem.id)
+        )
+        items = (await db.execute(query)).scalars().all()
+        _decimal_sums(
+            (i.contract.energy_type, i.contract.quantity_mwh, i.contract.price_per_mwh)
+            for i in items
+        )
+        print(f"{'get_portfolio, Decimal':<28} {time.perf_counter() - start:7.2f}s")
+        del items
+
+    async with session_factory() as db:
+        start = time.perf_counter()
+        await portfolio_service.get_portfolio(db, 1)
+        print(f"{'get_portfolio, scaled':<28} {time.perf_counter() - start:7.2f}s")
+    await engine.dispose()
+
+
+def _merge(into: dict, other: dict) -> None:
+    for energy_type, entry in other.items():
+        if energy_type in into:
+            for i in (1, 2, 3):
+                into[energy_type][i] += entry[i]
+        else:
+            into[energy_type] = entry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--db-items", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rows = _rows(args.items)
+    prescaled = [(t, _hundredths(q), _hundredths(p)) for t, q, p in rows]
+    decimal = _timed("Decimal sums", _decimal_sums, rows)
+    scaled = _timed("integer sums", _sum_ints, prescaled)
+    _timed("integer sums, converting", _scaled_sums, rows)
+    metrics = _timed("build metrics", _build_metrics, scaled.values())
+    assert [(b.total_mwh, b.total_cost) for b in metrics.breakdown_by_energy_type] == [
+        (mwh, cost) for _, _, mwh, cost in decimal.values()
+    ]
+
+    if args.db_items:
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        asyncio.run(_prepare(url, args.db_items))
+        asyncio.run(_run_db(url))
+
+
+if __name__ == "__main__":
+    main()
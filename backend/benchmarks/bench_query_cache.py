@@ -0,0 +1,76 @@
+"""Per-call CPU of list_contracts across a rotating mix of filter shapes.
+
+Run from backend/: python -m benchmarks.bench_query_cache [--calls 5000]
+
+Uses an in-memory SQLite database with a handful of rows so that statement
+construction and compilation dominate the measurement rather than I/O.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.db import Base
+from app.models import job, portfolio  # noqa: F401
+from app.models.contract import Contract, ContractStatus
+from app.services import contract_service
+
+SHAPES = [
+    {},
+    {"energy_types": ["Solar", "Wind"]},
+    {"price_min": Decimal("40"), "price_max": Decimal("60"), "sort_by": "price_per_mwh"},
+    {"location": "Loc", "qty_min": Decimal("100"), "sort_dir": "desc"},
+    {
+        "energy_types": ["Hydro"],
+        "delivery_start_min": date(2026, 1, 1),
+        "delivery_end_max": date(2026, 12, 31),
+        "offset": 5,
+    },
+]
+
+
+async def _run(calls: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            Contract.__table__.insert(),
+            [
+                {
+                    "energy_type": ["Solar", "Wind", "Hydro"][i % 3],
+                    "quantity_mwh": Decimal(100 + i),
+                    "price_per_mwh": Decimal(40 + i),
+                    "delivery_start": date(2026, 1, 1),
+                    "delivery_end": date(2026, 12, 31),
+                    "location": f"Location {i}",
+                    "status": ContractStatus.AVAILABLE,
+                }
+                for i in range(10)
+            ],
+        )
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        for shape in SHAPES:
+            await contract_service.list_contracts(db, **shape)
+        start = time.process_time()
+        for i in range(calls):
+            await contract_service.list_contracts(db, **SHAPES[i % len(SHAPES)])
+            db.expunge_all()
+        elapsed = time.process_time() - start
+    await engine.dispose()
+    print(f"list_contracts: {elapsed / calls * 1e6:.0f} us CPU per call ({calls} calls)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
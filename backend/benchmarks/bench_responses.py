@@ -0,0 +1,109 @@
+"""Encode time and bytes on the wire for list and portfolio responses.
+
+Run from backend/: python -m benchmarks.bench_responses
+"""
+
+import gzip
+import json
+import timeit
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from app.core.responses import ORJSONResponse
+from app.schemas.contract import ContractListResponse, ContractResponse
+from app.schemas.portfolio import (
+    EnergyTypeBreakdown,
+    PortfolioItemResponse,
+    PortfolioMetrics,
+    PortfolioResponse,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENERGY_TYPES = ["Solar", "Wind", "Hydro", "Nuclear", "Natural Gas", "Coal"]
+
+
+def _contract(i: int) -> ContractResponse:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return ContractResponse(
+        id=i,
+        energy_type=ENERGY_TYPES[i % len(ENERGY_TYPES)],
+        quantity_mwh=Decimal(100 + i % 900).quantize(Decimal("0.01")),
+        price_per_mwh=Decimal("45.50") + Decimal(i % 50) / 4,
+        delivery_start=date(2026, 1 + i % 12, 1),
+        delivery_end=date(2026, 12, 31),
+        location=f"Location {i % 40}",
+        status="Available",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def contract_page(size: int = 100) -> ContractListResponse:
+    return ContractListResponse(
+        items=[_contract(i) for i in range(size)], total=size, limit=size, offset=0
+    )
+
+
+def portfolio(size: int) -> PortfolioResponse:
+    items = [
+        PortfolioItemResponse(
+            id=i,
+            portfolio_id=1,
+            contract_id=i,
+            added_at=datetime(2026, 1, 1),
+            contract=_contract(i),
+        )
+        for i in range(size)
+    ]
+    metrics = PortfolioMetrics(
+        total_contracts=size,
+        total_capacity_mwh=Decimal("0"),
+        total_cost=Decimal("0"),
+        weighted_avg_price_per_mwh=Decimal("0"),
+        breakdown_by_energy_type=[
+            EnergyTypeBreakdown(
+                energy_type=et, count=0, total_mwh=Decimal("0"), total_cost=Decimal("0")
+            )
+            for et in ENERGY_TYPES
+        ],
+    )
+    return PortfolioResponse(id=1, name="Bench", items=items, metrics=metrics)
+
+
+def _time_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(label: str, model, number: int) -> None:
+    adapter = TypeAdapter(type(model))
+    encoders = {
+        "stdlib json": lambda: json.dumps(model.model_dump(mode="json")).encode(),
+        "orjson": lambda: ORJSONResponse(model.model_dump(mode="json")).body,
+        "pydantic dump_json": lambda: adapter.dump_json(model),
+    }
+    body = encoders["orjson"]()
+    print(f"\n{label}")
+    for name, fn in encoders.items():
+        print(f"  encode {name:<20} {_time_us(fn, number):>10.1f} us")
+    print(f"  bytes  identity             {len(body):>10}")
+    print(f"  bytes  gzip (level 6)       {len(gzip.compress(body, 6)):>10}")
+    if brotli is not None:
+        print(f"  bytes  br (quality 4)       {len(brotli.compress(body, quality=4)):>10}")
+        print(
+            f"  encode br (quality 4)       "
+            f"{_time_us(lambda: brotli.compress(body, quality=4), number):>10.1f} us"
+        )
+    print(
+        f"  encode gzip (level 6)       {_time_us(lambda: gzip.compress(body, 6), number):>10.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    run("GET /contracts (100 items)", contract_page(100), 500)
+    run("GET /portfolio/{id} (5,000 items)", portfolio(5000), 10)
@@ -0,0 +1,102 @@
+"""Matching contract writes against saved searches: predicate index vs full scan.
+
+Run from backend/: python -m benchmarks.bench_saved_searches [--searches 100000 --writes 50000]
+
+Builds the in-memory search index from random criteria (most with a price
+range, some open-ended or with a location), then probes it with random
+contract writes and reports the time per write, the candidates examined and
+the matches found. The baseline evaluates every saved search per write.
+Searches without a price bound (--open) match most writes of their energy
+type, so they dominate the per-write cost.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.services.search_index import Predicate, Probe, SearchIndex, _Tree
+
+ENERGY_TYPES = ["Solar", "Wind", "Hydro", "Nuclear", "Gas"]
+LOCATIONS = [f"region {i}" for i in range(40)]
+
+
+def _criteria(rng: random.Random, open_share: float) -> dict:
+    # Mostly narrow buyer alerts: one energy type and a price band a few euros wide.
+    criteria = {}
+    if rng.random() < 0.9:
+        criteria["energy_type"] = [rng.choice(ENERGY_TYPES)]
+    low = rng.uniform(20, 150)
+    if rng.random() >= open_share:
+        criteria["price_min"] = f"{low:.2f}"
+    if rng.random() >= open_share:
+        criteria["price_max"] = f"{low + rng.uniform(1, 8):.2f}"
+    if rng.random() < 0.3:
+        criteria["qty_min"] = str(rng.randrange(50, 500))
+    if rng.random() < 0.4:
+        criteria["location"] = rng.choice(LOCATIONS)
+    if rng.random() < 0.2:
+        criteria["delivery_end_max"] = (
+            date(2026, 1, 1) + timedelta(days=rng.randrange(730))
+        ).isoformat()
+    return criteria
+
+
+def _probe(rng: random.Random) -> Probe:
+    start = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+    return Probe(
+        rng.choice(ENERGY_TYPES),
+        rng.randrange(2000, 15000),
+        rng.randrange(1000, 100000),
+        rng.choice(LOCATIONS),
+        start,
+        start + timedelta(days=rng.randrange(30, 365)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--searches", type=int, default=100000)
+    parser.add_argument("--writes", type=int, default=50000)
+    parser.add_argument("--scan-writes", type=int, default=200)
+    parser.add_argument("--open", type=float, default=0.05, help="share missing each price bound")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    predicates = [
+        Predicate.from_criteria(i, _criteria(rng, args.open)) for i in range(args.searches)
+    ]
+    start = time.perf_counter()
+    tree = _Tree()
+    for predicate in predicates:
+        tree.add(predicate)
+    print(f"index build: {args.searches} searches in {time.perf_counter() - start:.2f}s")
+
+    index = SearchIndex()
+    index._data = tree
+    probes = [_probe(rng) for _ in range(args.writes)]
+    start = time.perf_counter()
+    for probe in probes:
+        index.match(probe)
+    elapsed = time.perf_counter() - start
+    print(
+        f"index: {elapsed / args.writes * 1e6:8.1f} us/write  "
+        f"{args.writes / elapsed:8.0f} writes/s  "
+        f"{index.examined / args.writes:7.0f} examined  {index.matched / args.writes:5.1f} matches"
+    )
+
+    scan = probes[: args.scan_writes]
+    start = time.perf_counter()
+    scanned = 0
+    for probe in scan:
+        scanned += sum(1 for predicate in predicates if predicate.matches(probe))
+    elapsed = time.perf_counter() - start
+    print(
+        f"scan:  {elapsed / len(scan) * 1e6:8.1f} us/write  "
+        f"{len(scan) / elapsed:8.0f} writes/s  "
+        f"{args.searches:7d} examined  {scanned / len(scan):5.1f} matches"
+    )
+
+
+if __name__ == "__main__":
+    main()
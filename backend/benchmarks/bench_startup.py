@@ -0,0 +1,69 @@
+"""Cold-start time from process launch to the first served request.
+
+Run from backend/: python -m benchmarks.bench_startup
+
+Uses DATABASE_URL when set (schema must already be migrated); otherwise a
+throwaway SQLite file.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_workers import _prepare_sqlite
+
+
+async def _first_success(base_url: str, path: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(path)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.01)
+    raise RuntimeError(f"{path} did not succeed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PORT=str(args.port), HOST="127.0.0.1", WEB_CONCURRENCY="1")
+    if "DATABASE_URL" not in env:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        asyncio.run(_prepare_sqlite(env["DATABASE_URL"], 1000))
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    for run in range(args.runs):
+        started = time.monotonic()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.serve"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_first_success(base_url, "/ready"))
+            ready = time.monotonic() - started
+            asyncio.run(_first_success(base_url, "/contracts"))
+            served = time.monotonic() - started
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+        print(f"run {run + 1}: ready {ready:.2f}s, first GET /contracts {served:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
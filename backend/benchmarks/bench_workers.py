@@ -0,0 +1,118 @@
+"""Throughput scaling of the multi-worker server from 1 to N workers.
+
+Run from backend/: python -m benchmarks.bench_workers [--path /contracts?limit=100]
+
+Uses DATABASE_URL when set; otherwise a throwaway SQLite file seeded with
+1,000 contracts (SQLite serializes writes but handles concurrent reads).
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.db import Base
+from app.models import contract_event, idempotency, job, portfolio  # noqa: F401
+from app.models.contract import Contract, ContractStatus
+
+
+async def _prepare_sqlite(url: str, count: int) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            Contract.__table__.insert(),
+            [
+                {
+                    "energy_type": ["Solar", "Wind", "Hydro"][i % 3],
+                    "quantity_mwh": Decimal(100 + i),
+                    "price_per_mwh": Decimal("40.00") + i % 20,
+                    "delivery_start": date(2026, 1, 1),
+                    "delivery_end": date(2026, 12, 31),
+                    "location": f"Location {i % 50}",
+                    "status": ContractStatus.AVAILABLE,
+                }
+                for i in range(count)
+            ],
+        )
+    await engine.dispose()
+
+
+async def _wait_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def _load(base_url: str, path: str, concurrency: int, duration: float) -> float:
+    done = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker():
+            nonlocal done
+            while time.monotonic() < deadline:
+                response = await client.get(path)
+                response.raise_for_status()
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done / duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="/contracts?limit=100")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PORT=str(args.port), HOST="127.0.0.1")
+    if "DATABASE_URL" not in env:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        asyncio.run(_prepare_sqlite(env["DATABASE_URL"], 1000))
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    baseline = None
+    for workers in counts:
+        env["WEB_CONCURRENCY"] = str(workers)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.serve"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_wait_ready(base_url))
+            rps = asyncio.run(_load(base_url, args.path, args.concurrency, args.duration))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+        baseline = baseline or rps
+        print(f"workers={workers:<3} {rps:>9.1f} req/s  x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
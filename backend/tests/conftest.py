@@ -2,32 +2,89 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.db import Base, get_db
+from app.api.coalescing import facets_cache
+from app.core.db import Base, get_db, get_engine, get_session_factory
 from app.main import app
+from app.services.job_runner import JobRunner
+from app.services.job_service import JOB_HANDLERS, RESUMABLE_JOB_KINDS
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
+def contract_json(**overrides) -> dict:
+    """A valid ``POST /contracts`` body; ``overrides`` replace individual fields."""
+    return {
+        "energy_type": "Solar",
+        "quantity_mwh": "100",
+        "price_per_mwh": "50",
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "CA",
+        **overrides,
+    }
+
+
 @pytest.fixture
-async def db_session():
+async def engine():
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    async with async_session() as session:
-        yield session
+    yield engine
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
 @pytest.fixture
-async def client(db_session):
+def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def db_session(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def job_runner(session_factory):
+    runner = JobRunner(session_factory, JOB_HANDLERS, resumable=RESUMABLE_JOB_KINDS)
+    app.state.job_runner = runner
+    await runner.start()
+    yield runner
+    await runner.stop()
+
+
+@pytest.fixture
+async def client(engine, db_session, session_factory):
     async def override_get_db():
         yield db_session
+        await db_session.commit()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_engine] = lambda: engine
+    app.state.admission.reset()
+    facets_cache.clear()
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def portfolio_id(client):
+    response = await client.post("/portfolio", json={"name": "Test"})
+    return response.json()["id"]
+
+
+@pytest.fixture
+def create_contract(client):
+    """Create a contract through the API and return its id."""
+
+    async def create(**overrides) -> int:
+        response = await client.post("/contracts", json=contract_json(**overrides))
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return create
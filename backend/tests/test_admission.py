@@ -0,0 +1,83 @@
+import pytest
+
+from app.core.admission import AdmissionController, RateLimiter, classify
+from app.core.pool import PoolWaitMonitor
+from app.main import app
+
+
+def test_classify_expensive_routes():
+    assert classify("GET", "/contracts", b"limit=20", 1000) is None
+    assert classify("GET", "/contracts", b"offset=5000", 1000) == "contracts.search"
+    assert classify("GET", "/contracts", b"location=cal", 1000) == "contracts.search"
+    assert classify("GET", "/contracts/export", b"", 1000) == "contracts.export"
+    assert classify("GET", "/contracts/7", b"", 1000) is None
+    assert classify("GET", "/portfolio/1", b"", 1000) == "portfolio.read"
+    assert classify("POST", "/portfolio/1/items", b"", 1000) is None
+    assert classify("POST", "/portfolio/metrics", b"", 1000) == "portfolio.metrics"
+
+
+def test_token_bucket_refills_at_rate():
+    limiter = RateLimiter(rate=2, burst=2)
+    assert limiter.acquire("a", 0.0) == 0
+    assert limiter.acquire("a", 0.0) == 0
+    assert limiter.acquire("a", 0.0) == pytest.approx(0.5)
+    assert limiter.acquire("b", 0.0) == 0
+    assert limiter.acquire("a", 0.5) == 0
+
+
+def test_pool_wait_decays():
+    monitor = PoolWaitMonitor(half_life=1.0, weight=1.0)
+    monitor.observe(0.4, now=10.0)
+    assert monitor.current(10.0) == pytest.approx(0.4)
+    assert monitor.current(11.0) == pytest.approx(0.2)
+
+
+def test_route_concurrency_cap():
+    controller = AdmissionController(
+        rate=0, burst=0, route_limits={"portfolio.read": 1}, pool_wait_threshold=1.0
+    )
+    assert controller.admit("a", "portfolio.read") is None
+    assert controller.admit("b", "portfolio.read") == (503, 1)
+    assert controller.admit("b", None) is None
+    controller.release("portfolio.read")
+    assert controller.admit("b", "portfolio.read") is None
+    assert controller.stats()["shed"] == {"portfolio.read": 1}
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_gets_429(client, monkeypatch):
+    monkeypatch.setattr(app.state.admission, "limiter", RateLimiter(rate=0.5, burst=2))
+    assert (await client.get("/contracts")).status_code == 200
+    assert (await client.get("/contracts")).status_code == 200
+    response = await client.get("/contracts")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2"
+    assert (await client.get("/health")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_pool_pressure_sheds_expensive_routes_only(client, portfolio_id, monkeypatch):
+    contract = await client.post(
+        "/contracts",
+        json={
+            "energy_type": "Solar",
+            "quantity_mwh": "100",
+            "price_per_mwh": "50",
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "CA",
+        },
+    )
+    monitor = PoolWaitMonitor(half_life=60)
+    monkeypatch.setattr(app.state.admission, "monitor", monitor)
+    monitor.observe(5.0)
+
+    response = await client.get(f"/portfolio/{portfolio_id}")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert (await client.get("/contracts", params={"location": "CA"})).status_code == 503
+    assert (await client.get(f"/contracts/{contract.json()['id']}")).status_code == 200
+    assert (await client.get("/health")).status_code == 200
+
+    stats = (await client.get("/debug/admission")).json()
+    assert stats["shed"] == {"portfolio.read": 1, "contracts.search": 1}
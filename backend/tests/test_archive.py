@@ -0,0 +1,81 @@
+import pytest
+
+from app.services import contract_service
+
+
+async def _archive(client, job_runner, **params) -> dict:
+    response = await client.post("/jobs", json={"kind": "archive_contracts", "params": params})
+    await job_runner.wait()
+    return (await client.get(f"/jobs/{response.json()['id']}")).json()
+
+
+@pytest.mark.asyncio
+async def test_sold_contracts_are_archived_transparently(
+    client, job_runner, portfolio_id, create_contract
+):
+    available = await create_contract()
+    sold = await create_contract(energy_type="Wind")
+    held = await create_contract(energy_type="Hydro")
+    await client.put(f"/contracts/{sold}", json={"status": "Sold"})
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": held})
+    await client.put(f"/contracts/{held}", json={"status": "Sold"})
+
+    result = await _archive(client, job_runner)
+    assert result["status"] == "Succeeded"
+    assert result["result"] == {"archived": 1}
+
+    detail = await client.get(f"/contracts/{sold}")
+    assert detail.status_code == 200
+    assert detail.json()["status"] == "Sold"
+
+    sold_listing = (await client.get("/contracts", params={"status": "Sold"})).json()
+    assert [c["id"] for c in sold_listing["items"]] == [sold, held]
+    assert sold_listing["total"] == 2
+    wind = (await client.get("/contracts", params={"status": "Sold", "energy_type": "Wind"})).json()
+    assert [c["id"] for c in wind["items"]] == [sold]
+    assert [c["id"] for c in (await client.get("/contracts")).json()["items"]] == [available]
+
+    items = (await client.get(f"/portfolio/{portfolio_id}")).json()["items"]
+    assert [item["contract_id"] for item in items] == [held]
+
+    assert (await client.put(f"/contracts/{sold}", json={"price_per_mwh": "1"})).status_code == 409
+    assert (await client.delete(f"/contracts/{sold}")).status_code == 409
+    response = await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": sold})
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_expired_contracts_archived_on_request(client, job_runner, create_contract):
+    expired = await create_contract(delivery_start="2025-01-01", delivery_end="2025-03-31")
+    current = await create_contract()
+
+    assert (await _archive(client, job_runner))["result"] == {"archived": 0}
+    result = await _archive(client, job_runner, expired_before="2026-01-01")
+    assert result["result"] == {"archived": 1}
+
+    listing = (await client.get("/contracts")).json()
+    assert [c["id"] for c in listing["items"]] == [current]
+    everything = (await client.get("/contracts", params={"status": ""})).json()
+    assert [c["id"] for c in everything["items"]] == [expired, current]
+
+
+@pytest.mark.asyncio
+async def test_archive_rechecks_candidates(client, db_session, portfolio_id, create_contract):
+    relisted = await create_contract()
+    held = await create_contract(energy_type="Wind")
+    sold = await create_contract(energy_type="Hydro")
+    for contract_id in (relisted, held, sold):
+        await client.put(f"/contracts/{contract_id}", json={"status": "Sold"})
+    candidates = await contract_service.find_archivable_contracts(db_session, 0, 10)
+    assert candidates == [relisted, held, sold]
+
+    # Changed between finding and archiving.
+    await client.put(f"/contracts/{relisted}", json={"status": "Available"})
+    await client.put(f"/contracts/{held}", json={"status": "Available"})
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": held})
+    await client.put(f"/contracts/{held}", json={"status": "Sold"})
+
+    assert await contract_service.archive_contracts(db_session, candidates) == [sold]
+    assert (await client.get(f"/contracts/{relisted}")).json()["status"] == "Available"
+    items = (await client.get(f"/portfolio/{portfolio_id}")).json()["items"]
+    assert [item["contract_id"] for item in items] == [held]
@@ -0,0 +1,127 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.models.contract import Contract, ContractStatus
+from app.services import contract_service
+from app.services.contract_index import contract_index
+from tests.conftest import contract_json
+
+pytest.importorskip("numpy")
+
+LOCATIONS = ["California", "Texas", "New York", "Oregon", "Nevada"]
+QUERIES = [
+    {},
+    {"energy_types": ["Solar", "Wind"]},
+    {"energy_types": ["Unknown"]},
+    {"price_min": Decimal("45.5"), "price_max": Decimal("70")},
+    {"qty_min": Decimal("250.25"), "sort_by": "quantity_mwh", "sort_dir": "desc"},
+    {"location": "ne", "sort_by": "price_per_mwh"},
+    {"delivery_start_min": date(2026, 3, 1), "delivery_end_max": date(2026, 9, 30)},
+    {"energy_types": ["Hydro"], "sort_by": "delivery_start", "sort_dir": "desc"},
+    {"limit": 7, "offset": 30, "sort_by": "price_per_mwh", "sort_dir": "desc"},
+    {"offset": 1000},
+]
+
+
+@pytest.fixture
+async def index(session_factory):
+    await contract_index.start(session_factory, reconcile_seconds=3600)
+    yield contract_index
+    await contract_index.stop()
+
+
+async def _seed(db_session, count: int) -> None:
+    rng = random.Random(7)
+    for _ in range(count):
+        start = date(2026, 1, 1) + timedelta(days=rng.randrange(300))
+        db_session.add(
+            Contract(
+                energy_type=rng.choice(["Solar", "Wind", "Hydro", "Nuclear"]),
+                quantity_mwh=Decimal(rng.randrange(1000, 50000)) / 100,
+                price_per_mwh=Decimal(rng.randrange(2000, 9000)) / 100,
+                delivery_start=start,
+                delivery_end=start + timedelta(days=rng.randrange(1, 120)),
+                location=rng.choice(LOCATIONS),
+                status=rng.choice(list(ContractStatus)),
+            )
+        )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", QUERIES)
+async def test_index_matches_sql(db_session, session_factory, query):
+    await _seed(db_session, 300)
+    await contract_index.start(session_factory, reconcile_seconds=3600)
+    try:
+        assert contract_index.supports(**query)
+        indexed, indexed_total = contract_index.search(**query)
+        expected, expected_total = await contract_service.list_contracts(db_session, **query)
+    finally:
+        await contract_index.stop()
+    assert indexed_total == expected_total
+    assert [c.id for c in indexed] == [c.id for c in expected]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_queries_fall_back(index):
+    assert not index.supports(status="Sold")
+    assert index.supports(location="50%")
+    assert index.supports(location="Cal")
+
+
+@pytest.mark.asyncio
+async def test_service_writes_keep_index_in_sync(client, index, portfolio_id):
+    contract = (await client.post("/contracts", json=contract_json())).json()
+    assert index.search()[1] == 1
+
+    await client.put(f"/contracts/{contract['id']}", json={"price_per_mwh": "75.00"})
+    items, _ = index.search(price_min=Decimal("70"))
+    assert [c.id for c in items] == [contract["id"]]
+
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": contract["id"]})
+    assert index.search()[1] == 0
+    await client.delete(f"/portfolio/{portfolio_id}/items/{contract['id']}")
+    assert index.search()[1] == 1
+
+    await client.delete(f"/contracts/{contract['id']}")
+    assert index.search()[1] == 0
+    assert (await client.get("/debug/contract-index")).json()["contracts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_writes_are_not_applied(session_factory, index):
+    async with session_factory() as db:
+        await contract_service.create_contract(
+            db,
+            {
+                **contract_json(),
+                "delivery_start": date(2026, 1, 1),
+                "delivery_end": date(2026, 6, 30),
+            },
+        )
+        await db.rollback()
+    assert index.search()[1] == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_writes_from_other_workers(db_session, index):
+    await _seed(db_session, 20)
+    expected = await contract_service.list_contracts(db_session, limit=100)
+    assert index.search(limit=100)[1] == 0
+    await index.refresh()
+    items, total = index.search(limit=100)
+    assert total == expected[1]
+    assert [c.id for c in items] == [c.id for c in expected[0]]
+
+
+@pytest.mark.asyncio
+async def test_list_route_uses_index(client, index, create_contract):
+    await create_contract(location="California")
+    await create_contract(location="Texas", energy_type="Wind")
+    response = await client.get("/contracts", params={"location": "cal"})
+    assert response.json()["total"] == 1
+    assert response.json()["items"][0]["location"] == "California"
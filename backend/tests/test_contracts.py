@@ -2,6 +2,8 @@ from decimal import Decimal
 
 import pytest
 
+from app.services import contract_service
+
 
 @pytest.mark.asyncio
 async def test_create_contract_valid(client):
@@ -113,3 +115,178 @@ async def test_filter_multiple_energy_types(client):
 async def test_contract_not_found(client):
     response = await client.get("/contracts/9999")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_contracts_in_chunks(client, db_session):
+    for price in ["40", "30", "50"]:
+        await client.post(
+            "/contracts",
+            json={
+                "energy_type": "Solar",
+                "quantity_mwh": "100",
+                "price_per_mwh": price,
+                "delivery_start": "2026-01-01",
+                "delivery_end": "2026-06-30",
+                "location": "CA",
+            },
+        )
+    chunks = [
+        chunk
+        async for chunk in contract_service.stream_contracts(
+            db_session, chunk_size=2, sort_by="price_per_mwh", sort_dir="desc"
+        )
+    ]
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    prices = [row.price_per_mwh for chunk in chunks for row in chunk]
+    assert prices == [Decimal("50"), Decimal("40"), Decimal("30")]
+
+
+@pytest.mark.asyncio
+async def test_list_contracts_reuses_statements_per_filter_shape(client, db_session):
+    for energy_type, location in [("Solar", "California"), ("Wind", "Texas"), ("Hydro", "Oregon")]:
+        await client.post(
+            "/contracts",
+            json={
+                "energy_type": energy_type,
+                "quantity_mwh": "100",
+                "price_per_mwh": "40",
+                "delivery_start": "2026-01-01",
+                "delivery_end": "2026-06-30",
+                "location": location,
+            },
+        )
+    contract_service._list_statements.cache_clear()
+
+    solar, total = await contract_service.list_contracts(db_session, energy_types=["Solar"])
+    assert total == 1 and solar[0].energy_type == "Solar"
+    both, total = await contract_service.list_contracts(
+        db_session, energy_types=["Wind", "Hydro"], location="o"
+    )
+    assert total == 1 and both[0].location == "Oregon"
+    page, total = await contract_service.list_contracts(db_session, limit=1, offset=2)
+    assert total == 3 and page[0].location == "Oregon"
+
+    info = contract_service._list_statements.cache_info()
+    assert (info.hits, info.misses) == (0, 3)
+    await contract_service.list_contracts(db_session, energy_types=["Wind"], location="x")
+    assert contract_service._list_statements.cache_info().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_update_items(client, create_contract):
+    first, second, third = [await create_contract() for _ in range(3)]
+    response = await client.patch(
+        "/contracts/batch",
+        json={
+            "items": [
+                {"id": first, "price_per_mwh": "42.50"},
+                {"id": second, "location": "NV", "quantity_mwh": "80"},
+                {"id": third, "delivery_start": "2026-12-01"},
+                {"id": 999, "price_per_mwh": "1"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": [first, second], "skipped": [third, 999]}
+
+    first_json = (await client.get(f"/contracts/{first}")).json()
+    assert Decimal(first_json["price_per_mwh"]) == Decimal("42.50")
+    assert first_json["location"] == "CA"
+    second_json = (await client.get(f"/contracts/{second}")).json()
+    assert (second_json["location"], Decimal(second_json["quantity_mwh"])) == ("NV", Decimal("80"))
+    third_json = (await client.get(f"/contracts/{third}")).json()
+    assert third_json["delivery_start"] == "2026-01-01"
+
+    events = (await client.get(f"/contracts/{second}/history")).text.splitlines()
+    assert len(events) == 2
+    duplicate = {"items": [{"id": first, "location": "A"}, {"id": first, "location": "B"}]}
+    assert (await client.patch("/contracts/batch", json=duplicate)).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_update_where(client, create_contract):
+    solar = await create_contract(price_per_mwh="40")
+    wind = await create_contract(energy_type="Wind", price_per_mwh="40")
+    sold = await create_contract()
+    await client.put(f"/contracts/{sold}", json={"status": "Sold"})
+    response = await client.patch(
+        "/contracts/batch",
+        json={
+            "where": {"energy_type": ["Solar"]},
+            "adjust": {"price_per_mwh": {"op": "multiply", "value": "1.03"}},
+            "set": {"location": "AZ"},
+        },
+    )
+    assert response.json() == {"updated": [solar], "skipped": []}
+    solar_json = (await client.get(f"/contracts/{solar}")).json()
+    assert (Decimal(solar_json["price_per_mwh"]), solar_json["location"]) == (
+        Decimal("41.20"),
+        "AZ",
+    )
+    wind_json = (await client.get(f"/contracts/{wind}")).json()
+    assert Decimal(wind_json["price_per_mwh"]) == Decimal("40")
+    sold_json = (await client.get(f"/contracts/{sold}")).json()
+    assert Decimal(sold_json["price_per_mwh"]) == Decimal("50")
+
+    response = await client.patch(
+        "/contracts/batch",
+        json={"where": {}, "adjust": {"price_per_mwh": {"op": "add", "value": "-40.5"}}},
+    )
+    assert response.json() == {"updated": [solar], "skipped": [wind]}
+    # Numeric(10,2): 0.70 * 1e7 still fits, 40 * 1e7 would overflow the column.
+    response = await client.patch(
+        "/contracts/batch",
+        json={"where": {}, "adjust": {"price_per_mwh": {"op": "multiply", "value": "1e7"}}},
+    )
+    assert response.json() == {"updated": [solar], "skipped": [wind]}
+    assert (await client.patch("/contracts/batch", json={"where": {}})).status_code == 422
+    response = await client.patch(
+        "/contracts/batch", json={"where": {"status": "Bogus"}, "set": {"location": "TX"}}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_contract_facets(client, create_contract):
+    await create_contract(price_per_mwh="42", quantity_mwh="150")
+    await create_contract(price_per_mwh="48", location="TX")
+    await create_contract(energy_type="Wind", price_per_mwh="55", location="TX")
+    await create_contract(energy_type="Hydro", price_per_mwh="30")
+    response = await client.get("/contracts/facets", params={"price_min": "40"})
+    assert response.status_code == 200
+    facets = response.json()
+    assert facets["total"] == 3
+    assert facets["energy_type"] == [
+        {"value": "Solar", "count": 2},
+        {"value": "Wind", "count": 1},
+    ]
+    assert facets["location"] == [{"value": "TX", "count": 2}, {"value": "CA", "count": 1}]
+    assert [(Decimal(b["min"]), b["count"]) for b in facets["price_per_mwh"]] == [
+        (Decimal("40"), 2),
+        (Decimal("50"), 1),
+    ]
+    assert [(Decimal(b["max"]), b["count"]) for b in facets["quantity_mwh"]] == [
+        (Decimal("200"), 3)
+    ]
+
+    params = {"price_min": "40", "price_bucket": "0.005", "qty_bucket": "1000000000000"}
+    facets = (await client.get("/contracts/facets", params=params)).json()
+    assert [(Decimal(b["min"]), b["count"]) for b in facets["price_per_mwh"]] == [
+        (Decimal("42"), 1),
+        (Decimal("48"), 1),
+        (Decimal("55"), 1),
+    ]
+    assert [(Decimal(b["min"]), b["count"]) for b in facets["quantity_mwh"]] == [(0, 3)]
+
+    await create_contract(energy_type="Wind", price_per_mwh="60")
+    facets = (await client.get("/contracts/facets", params={"price_min": "40"})).json()
+    assert facets["total"] == 4
+    empty = (await client.get("/contracts/facets", params={"location": "nowhere"})).json()
+    assert empty == {
+        "total": 0,
+        "energy_type": [],
+        "location": [],
+        "price_per_mwh": [],
+        "quantity_mwh": [],
+    }
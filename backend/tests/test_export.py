@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+CONTRACTS = [
+    {
+        "energy_type": "Solar",
+        "quantity_mwh": "100.00",
+        "price_per_mwh": "40.50",
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "CA",
+    },
+    {
+        "energy_type": "Wind",
+        "quantity_mwh": "200.00",
+        "price_per_mwh": "35.25",
+        "delivery_start": "2026-02-01",
+        "delivery_end": "2026-07-31",
+        "location": "TX",
+    },
+]
+
+
+@pytest.fixture
+async def contracts(client, db_session):
+    for c in CONTRACTS:
+        await client.post("/contracts", json=c)
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_export_csv(client, contracts):
+    response = await client.get("/contracts/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["energy_type"] for row in rows] == ["Solar", "Wind"]
+    assert rows[0]["price_per_mwh"] == "40.50"
+    assert rows[0]["status"] == "Available"
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_with_filters(client, contracts):
+    response = await client.get(
+        "/contracts/export", params={"format": "ndjson", "energy_type": "Wind"}
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["location"] == "TX"
+    assert Decimal(rows[0]["quantity_mwh"]) == Decimal("200")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+async def test_export_columnar(client, contracts, export_format):
+    pa = pytest.importorskip("pyarrow")
+    response = await client.get("/contracts/export", params={"format": export_format})
+    assert response.status_code == 200
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(pa.BufferReader(response.content))
+    else:
+        table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 2
+    assert table.column("price_per_mwh").to_pylist() == [Decimal("40.50"), Decimal("35.25")]
@@ -0,0 +1,158 @@
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.core.db import stream_partitions
+from app.models.contract import Contract, ContractStatus
+from app.models.job import Job, JobStatus
+from app.services import history_service
+from app.services.job_runner import JobRunner
+from app.services.job_service import JOB_HANDLERS
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def _as_of(client, at: datetime) -> dict[int, dict]:
+    response = await client.get("/contracts/as-of", params={"at": at.isoformat()})
+    assert response.status_code == 200
+    return {state.pop("id"): state for state in _lines(response)}
+
+
+async def _checkpoint(client, job_runner) -> dict:
+    response = await client.post(
+        "/jobs", json={"kind": "checkpoint_contract_events", "params": {"lag_seconds": 0}}
+    )
+    await job_runner.wait()
+    return (await client.get(f"/jobs/{response.json()['id']}")).json()
+
+
+@pytest.mark.asyncio
+async def test_contract_history(client, portfolio_id, create_contract):
+    contract_id = await create_contract()
+    await client.put(f"/contracts/{contract_id}", json={"price_per_mwh": "60"})
+    await client.put(f"/contracts/{contract_id}", json={"price_per_mwh": "60"})
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id})
+    items = (await client.get(f"/portfolio/{portfolio_id}")).json()["items"]
+    await client.delete(f"/portfolio/{portfolio_id}/items/{items[0]['id']}")
+    await client.delete(f"/contracts/{contract_id}")
+
+    response = await client.get(f"/contracts/{contract_id}/history")
+    assert response.status_code == 200
+    events = _lines(response)
+    assert [(e["seq"], e["kind"]) for e in events] == [
+        (1, "created"),
+        (2, "updated"),
+        (3, "reserved"),
+        (4, "released"),
+        (5, "deleted"),
+    ]
+    assert events[0]["changes"]["status"] == "Available"
+    assert events[1]["changes"] == {"price_per_mwh": "60.00"}
+    assert events[2]["changes"] == {"status": "Reserved"}
+    assert events[4]["changes"] == {}
+
+    assert (await client.get("/contracts/999/history")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_history_of_contract_without_events(client, db_session):
+    contract = Contract(
+        energy_type="Solar",
+        quantity_mwh=Decimal("100"),
+        price_per_mwh=Decimal("50"),
+        delivery_start=date(2026, 1, 1),
+        delivery_end=date(2026, 6, 30),
+        location="CA",
+        status=ContractStatus.AVAILABLE,
+    )
+    db_session.add(contract)
+    await db_session.commit()
+    response = await client.get(f"/contracts/{contract.id}/history")
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+@pytest.mark.asyncio
+async def test_state_as_of(client, job_runner, create_contract):
+    kept = await create_contract()
+    deleted = await create_contract(energy_type="Wind")
+    before_changes = datetime.utcnow()
+    await client.put(f"/contracts/{kept}", json={"price_per_mwh": "70"})
+    await client.delete(f"/contracts/{deleted}")
+    after_changes = datetime.utcnow()
+
+    past = await _as_of(client, before_changes)
+    assert sorted(past) == [kept, deleted]
+    assert past[kept]["price_per_mwh"] == "50.00"
+    assert past[deleted]["energy_type"] == "Wind"
+    assert await _as_of(client, datetime(2000, 1, 1)) == {}
+
+    first = await _checkpoint(client, job_runner)
+    assert first["status"] == "Succeeded"
+    added = await create_contract(energy_type="Hydro")
+    await client.put(f"/contracts/{kept}", json={"location": "TX"})
+    second = await _checkpoint(client, job_runner)
+    assert second["result"]["checkpoint_id"] > first["result"]["checkpoint_id"]
+    await client.put(f"/contracts/{added}", json={"status": "Sold"})
+
+    assert await _as_of(client, before_changes) == past
+    current = await _as_of(client, datetime.utcnow())
+    assert sorted(current) == [kept, added]
+    assert current[kept]["price_per_mwh"] == "70.00"
+    assert current[kept]["location"] == "TX"
+    assert current[added]["status"] == "Sold"
+    middle = await _as_of(client, after_changes)
+    assert sorted(middle) == [kept]
+    assert middle[kept]["location"] == "CA"
+
+
+@pytest.mark.asyncio
+async def test_as_of_reads_only_events_after_checkpoint(
+    client, job_runner, create_contract, monkeypatch
+):
+    ids = [await create_contract() for _ in range(3)]
+    await client.put(f"/contracts/{ids[0]}", json={"price_per_mwh": "70"})
+    assert (await _checkpoint(client, job_runner))["status"] == "Succeeded"
+    await client.put(f"/contracts/{ids[1]}", json={"location": "TX"})
+
+    read = []
+
+    async def counting(db, query, chunk_size):
+        rows = 0
+        async for partition in stream_partitions(db, query, chunk_size):
+            rows += len(partition)
+            yield partition
+        read.append(rows)
+
+    monkeypatch.setattr(history_service, "stream_partitions", counting)
+    current = await _as_of(client, datetime.utcnow())
+    # One event since the checkpoint, then the checkpoint's three states.
+    assert read == [1, 3]
+    assert current[ids[0]]["price_per_mwh"] == "70.00"
+    assert current[ids[1]]["location"] == "TX"
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_scheduled(session_factory):
+    runner = JobRunner(session_factory, JOB_HANDLERS, schedule={"checkpoint_contract_events": 3600})
+    await runner.start()
+    try:
+        for _ in range(100):
+            if runner._tasks:
+                break
+            await asyncio.sleep(0.01)
+        await runner.wait()
+        assert await runner.submit_scheduled() == []
+    finally:
+        await runner.stop()
+    async with session_factory() as db:
+        jobs = (await db.scalars(select(Job))).all()
+    assert [(job.kind, job.status) for job in jobs] == [
+        ("checkpoint_contract_events", JobStatus.SUCCEEDED)
+    ]
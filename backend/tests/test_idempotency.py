@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.idempotency import IdempotencyKey
+
+CONTRACT = {
+    "energy_type": "Solar",
+    "quantity_mwh": "500.00",
+    "price_per_mwh": "45.50",
+    "delivery_start": "2026-03-01",
+    "delivery_end": "2026-05-31",
+    "location": "California",
+}
+
+
+@pytest.mark.asyncio
+async def test_retried_create_returns_original_response(client):
+    headers = {"Idempotency-Key": "create-1"}
+    first = await client.post("/contracts", json=CONTRACT, headers=headers)
+    second = await client.post("/contracts", json=CONTRACT, headers=headers)
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert (await client.get("/contracts")).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reuse_with_different_body_is_rejected(client):
+    headers = {"Idempotency-Key": "create-2"}
+    await client.post("/contracts", json=CONTRACT, headers=headers)
+    response = await client.post(
+        "/contracts", json={**CONTRACT, "location": "Nevada"}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_are_coalesced(client):
+    headers = {"Idempotency-Key": "create-3"}
+    responses = await asyncio.gather(
+        *(client.post("/contracts", json=CONTRACT, headers=headers) for _ in range(5))
+    )
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert (await client.get("/contracts")).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retried_portfolio_add_is_not_a_conflict(client, portfolio_id):
+    contract_id = (await client.post("/contracts", json=CONTRACT)).json()["id"]
+    headers = {"Idempotency-Key": "add-1"}
+    url = f"/portfolio/{portfolio_id}/items"
+    first = await client.post(url, json={"contract_id": contract_id}, headers=headers)
+    second = await client.post(url, json={"contract_id": contract_id}, headers=headers)
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    third = await client.post(url, json={"contract_id": contract_id})
+    assert third.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_expired_key_runs_again(client, db_session):
+    headers = {"Idempotency-Key": "create-4"}
+    first = await client.post("/contracts", json=CONTRACT, headers=headers)
+    record = await db_session.get(IdempotencyKey, "create-4")
+    record.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    await db_session.commit()
+    second = await client.post("/contracts", json=CONTRACT, headers=headers)
+    assert second.status_code == 201
+    assert second.json()["id"] != first.json()["id"]
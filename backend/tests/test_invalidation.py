@@ -0,0 +1,30 @@
+import pytest
+
+from app.core.invalidation import InvalidationBus
+
+
+@pytest.mark.asyncio
+async def test_local_publish_dispatches_to_subscribers():
+    bus = InvalidationBus()
+    calls = []
+    bus.subscribe("contracts", lambda: calls.append("a"))
+    bus.subscribe("contracts", lambda: calls.append("b"))
+    bus.subscribe("other", lambda: calls.append("other"))
+    await bus.start("sqlite+aiosqlite:///:memory:")
+    await bus.publish("contracts")
+    assert calls == ["a", "b"]
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_failing_handler_does_not_block_others():
+    bus = InvalidationBus()
+    calls = []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    bus.subscribe("contracts", broken)
+    bus.subscribe("contracts", lambda: calls.append("ok"))
+    await bus.publish("contracts")
+    assert calls == ["ok"]
@@ -0,0 +1,212 @@
+import json
+
+import pytest
+
+from app.core.config import get_settings
+from app.models.job import Job, JobStatus
+from app.services.job_runner import FAILED_JOB_ERROR, JobRunner
+from app.services.job_service import JOB_HANDLERS, RESUMABLE_JOB_KINDS
+
+
+@pytest.fixture
+def import_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "IMPORT_DIR", str(tmp_path / "imports"))
+    (tmp_path / "imports").mkdir()
+    return tmp_path / "imports"
+
+
+async def _restart(session_factory) -> JobRunner:
+    runner = JobRunner(session_factory, JOB_HANDLERS, resumable=RESUMABLE_JOB_KINDS)
+    await runner.start()
+    await runner.wait()
+    await runner.stop()
+    return runner
+
+
+@pytest.mark.asyncio
+async def test_import_contracts_job(client, job_runner, import_dir):
+    records = [
+        {
+            "energy_type": "Solar",
+            "quantity_mwh": "100",
+            "price_per_mwh": "40",
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "CA",
+        }
+        for _ in range(3)
+    ]
+    (import_dir / "contracts.json").write_text(json.dumps(records))
+    response = await client.post(
+        "/jobs", json={"kind": "import_contracts", "params": {"file": "contracts.json"}}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    await job_runner.wait()
+    result = (await client.get(f"/jobs/{job_id}")).json()
+    assert result["status"] == "Succeeded"
+    assert result["progress"] == result["total"] == 3
+    assert result["result"] == {"imported": 3}
+    listing = (await client.get("/contracts")).json()
+    assert listing["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error(client, job_runner, import_dir):
+    response = await client.post(
+        "/jobs", json={"kind": "import_contracts", "params": {"file": "missing.json"}}
+    )
+    (import_dir / "broken.json").write_text('[{"energy_type": "secret-value"}]')
+    broken = await client.post(
+        "/jobs", json={"kind": "import_contracts", "params": {"file": "broken.json"}}
+    )
+    await job_runner.wait()
+    result = (await client.get(f"/jobs/{response.json()['id']}")).json()
+    assert result["status"] == "Failed"
+    assert result["error"] == "Import file not found"
+    result = (await client.get(f"/jobs/{broken.json()['id']}")).json()
+    assert result["error"] == "Invalid contract at index 0"
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_paths_outside_import_dir(client, job_runner, import_dir):
+    for name in ["/etc/passwd", "../secrets.json", "sub/contracts.json", "", 7]:
+        response = await client.post(
+            "/jobs", json={"kind": "import_contracts", "params": {"file": name}}
+        )
+        assert response.status_code == 422
+    response = await client.post("/jobs", json={"kind": "import_contracts", "params": {}})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_upload_import(client, job_runner, import_dir, monkeypatch):
+    record = {
+        "energy_type": "Gas",
+        "quantity_mwh": "10",
+        "price_per_mwh": "60",
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "NY",
+    }
+    response = await client.post("/jobs/import", content=json.dumps([record] * 2))
+    assert response.status_code == 202
+    assert response.json()["params"]["file"].startswith("upload-")
+    await job_runner.wait()
+    result = (await client.get(f"/jobs/{response.json()['id']}")).json()
+    assert result["result"] == {"imported": 2}
+
+    monkeypatch.setattr(get_settings(), "IMPORT_MAX_BYTES", 10)
+    response = await client.post("/jobs/import", content=json.dumps([record]))
+    assert response.status_code == 413
+    assert len(list(import_dir.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_unexpected_failure_hides_exception_text(session_factory):
+    async def leaky(ctx, params):
+        raise RuntimeError("/srv/secret.txt: top secret contents")
+
+    runner = JobRunner(session_factory, {"leaky": leaky})
+    await runner.start()
+    job = await runner.submit("leaky", {})
+    await runner.wait()
+    await runner.stop()
+    async with session_factory() as db:
+        assert (await db.get(Job, job.id)).error == FAILED_JOB_ERROR
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_kind(client, job_runner):
+    response = await client.post("/jobs", json={"kind": "nope"})
+    assert response.status_code == 422
+    response = await client.get("/jobs/9999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_restart_fails_interrupted_jobs(session_factory):
+    async with session_factory() as db:
+        db.add(Job(kind="purge_idempotency_keys", params={}, status=JobStatus.RUNNING))
+        await db.commit()
+    await _restart(session_factory)
+    async with session_factory() as db:
+        job = await db.get(Job, 1)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Interrupted by restart"
+
+
+@pytest.mark.asyncio
+async def test_restart_resumes_import_from_progress(client, session_factory, import_dir):
+    record = {
+        "energy_type": "Wind",
+        "quantity_mwh": "200",
+        "price_per_mwh": "35",
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "TX",
+    }
+    (import_dir / "contracts.json").write_text(json.dumps([record] * 3))
+    async with session_factory() as db:
+        db.add(
+            Job(
+                kind="import_contracts",
+                params={"file": "contracts.json"},
+                status=JobStatus.RUNNING,
+                progress=2,
+            )
+        )
+        await db.commit()
+    await _restart(session_factory)
+    result = (await client.get("/jobs/1")).json()
+    assert result["status"] == "Succeeded"
+    assert result["progress"] == 3
+    assert (await client.get("/contracts")).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_export_contracts_job(client, job_runner, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "EXPORT_DIR", str(tmp_path / "exports"))
+    await client.post(
+        "/contracts",
+        json={
+            "energy_type": "Hydro",
+            "quantity_mwh": "400",
+            "price_per_mwh": "42.00",
+            "delivery_start": "2026-05-01",
+            "delivery_end": "2026-10-31",
+            "location": "Washington",
+        },
+    )
+    rejected = await client.post(
+        "/jobs",
+        json={"kind": "export_contracts", "params": {"path": str(tmp_path / "x.ndjson")}},
+    )
+    assert rejected.status_code == 422
+    for filters in ({"status": "Bogus"}, ["Solar"]):
+        rejected = await client.post(
+            "/jobs", json={"kind": "export_contracts", "params": {"filters": filters}}
+        )
+        assert rejected.status_code == 422
+    response = await client.post(
+        "/jobs", json={"kind": "export_contracts", "params": {"format": "ndjson"}}
+    )
+    job_id = response.json()["id"]
+    await job_runner.wait()
+    result = (await client.get(f"/jobs/{job_id}")).json()
+    assert result["status"] == "Succeeded"
+    assert result["result"] == {"exported": 1, "file": f"export-{job_id}.ndjson"}
+    download = await client.get(f"/jobs/{job_id}/file")
+    assert download.headers["content-type"] == "application/x-ndjson"
+    assert json.loads(download.text)["location"] == "Washington"
+    assert sorted(p.name for p in (tmp_path / "exports").iterdir()) == [f"export-{job_id}.ndjson"]
+
+
+@pytest.mark.asyncio
+async def test_follower_submission_is_run_by_leader(client, job_runner, session_factory):
+    follower = JobRunner(session_factory, JOB_HANDLERS)
+    job = await follower.submit("purge_idempotency_keys", {})
+    await job_runner.wait()
+    result = (await client.get(f"/jobs/{job.id}")).json()
+    assert result["status"] == "Succeeded"
+    assert not follower._tasks
@@ -2,9 +2,11 @@ from decimal import Decimal
 
 import pytest
 
+from app.services import portfolio_service
+
 
 @pytest.mark.asyncio
-async def test_add_to_portfolio(client):
+async def test_add_to_portfolio(client, portfolio_id):
     data = {
         "energy_type": "Solar",
         "quantity_mwh": "500",
@@ -15,14 +17,16 @@ async def test_add_to_portfolio(client):
     }
     create_resp = await client.post("/contracts", json=data)
     contract_id = create_resp.json()["id"]
-    response = await client.post("/portfolio/items", json={"contract_id": contract_id})
+    response = await client.post(
+        f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id}
+    )
     assert response.status_code == 201
     contract_resp = await client.get(f"/contracts/{contract_id}")
     assert contract_resp.json()["status"] == "Reserved"
 
 
 @pytest.mark.asyncio
-async def test_cannot_add_reserved_contract(client):
+async def test_cannot_add_reserved_contract(client, portfolio_id):
     data = {
         "energy_type": "Wind",
         "quantity_mwh": "300",
@@ -33,13 +37,15 @@ async def test_cannot_add_reserved_contract(client):
     }
     create_resp = await client.post("/contracts", json=data)
     contract_id = create_resp.json()["id"]
-    await client.post("/portfolio/items", json={"contract_id": contract_id})
-    response = await client.post("/portfolio/items", json={"contract_id": contract_id})
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id})
+    response = await client.post(
+        f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id}
+    )
     assert response.status_code == 409
 
 
 @pytest.mark.asyncio
-async def test_portfolio_metrics_weighted_avg(client):
+async def test_portfolio_metrics_weighted_avg(client, portfolio_id):
     contracts = [
         {
             "energy_type": "Solar",
@@ -63,8 +69,8 @@ async def test_portfolio_metrics_weighted_avg(client):
         resp = await client.post("/contracts", json=c)
         contract_ids.append(resp.json()["id"])
     for cid in contract_ids:
-        await client.post("/portfolio/items", json={"contract_id": cid})
-    response = await client.get("/portfolio")
+        await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": cid})
+    response = await client.get(f"/portfolio/{portfolio_id}")
     assert response.status_code == 200
     metrics = response.json()["metrics"]
     assert metrics["total_contracts"] == 2
@@ -77,7 +83,7 @@ async def test_portfolio_metrics_weighted_avg(client):
 
 
 @pytest.mark.asyncio
-async def test_remove_from_portfolio(client):
+async def test_remove_from_portfolio(client, portfolio_id):
     data = {
         "energy_type": "Hydro",
         "quantity_mwh": "400",
@@ -88,15 +94,15 @@ async def test_remove_from_portfolio(client):
     }
     create_resp = await client.post("/contracts", json=data)
     contract_id = create_resp.json()["id"]
-    await client.post("/portfolio/items", json={"contract_id": contract_id})
-    response = await client.delete(f"/portfolio/items/{contract_id}")
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id})
+    response = await client.delete(f"/portfolio/{portfolio_id}/items/{contract_id}")
     assert response.status_code == 204
     contract_resp = await client.get(f"/contracts/{contract_id}")
     assert contract_resp.json()["status"] == "Available"
 
 
 @pytest.mark.asyncio
-async def test_cannot_delete_contract_in_portfolio(client):
+async def test_cannot_delete_contract_in_portfolio(client, portfolio_id):
     data = {
         "energy_type": "Nuclear",
         "quantity_mwh": "1000",
@@ -107,6 +113,94 @@ async def test_cannot_delete_contract_in_portfolio(client):
     }
     create_resp = await client.post("/contracts", json=data)
     contract_id = create_resp.json()["id"]
-    await client.post("/portfolio/items", json={"contract_id": contract_id})
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id})
     response = await client.delete(f"/contracts/{contract_id}")
     assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_portfolios_are_isolated(client, portfolio_id):
+    other_id = (await client.post("/portfolio", json={"name": "Other"})).json()["id"]
+    data = {
+        "energy_type": "Solar",
+        "quantity_mwh": "100",
+        "price_per_mwh": "50",
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "CA",
+    }
+    contract_id = (await client.post("/contracts", json=data)).json()["id"]
+    await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": contract_id})
+    response = await client.get(f"/portfolio/{other_id}")
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    assert response.json()["metrics"]["total_contracts"] == 0
+    response = await client.delete(f"/portfolio/{other_id}/items/{contract_id}")
+    assert response.status_code == 404
+    response = await client.get("/portfolio/9999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_portfolio_metrics_batch(client, portfolio_id):
+    empty_id = (await client.post("/portfolio", json={"name": "Empty"})).json()["id"]
+    contracts = [
+        {
+            "energy_type": "Solar",
+            "quantity_mwh": "100",
+            "price_per_mwh": "50",
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "CA",
+        },
+        {
+            "energy_type": "Wind",
+            "quantity_mwh": "200",
+            "price_per_mwh": "40",
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "TX",
+        },
+    ]
+    for c in contracts:
+        cid = (await client.post("/contracts", json=c)).json()["id"]
+        await client.post(f"/portfolio/{portfolio_id}/items", json={"contract_id": cid})
+    single = (await client.get(f"/portfolio/{portfolio_id}")).json()["metrics"]
+
+    response = await client.post(
+        "/portfolio/metrics", json={"portfolio_ids": [portfolio_id, empty_id, 9999]}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert [entry["portfolio_id"] for entry in result] == [portfolio_id, empty_id]
+    batch = result[0]["metrics"]
+    assert batch["total_contracts"] == single["total_contracts"]
+    assert Decimal(batch["total_cost"]) == Decimal(single["total_cost"])
+    assert Decimal(batch["total_capacity_mwh"]) == Decimal(single["total_capacity_mwh"])
+    assert batch["weighted_avg_price_per_mwh"] == single["weighted_avg_price_per_mwh"]
+    assert len(batch["breakdown_by_energy_type"]) == 2
+    assert result[1]["metrics"]["total_contracts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_compute_portfolio_metrics_streams_rows(client, db_session, portfolio_id):
+    for energy_type, qty, price in [("Solar", "100", "50.25"), ("Wind", "200", "40.10")]:
+        resp = await client.post(
+            "/contracts",
+            json={
+                "energy_type": energy_type,
+                "quantity_mwh": qty,
+                "price_per_mwh": price,
+                "delivery_start": "2026-01-01",
+                "delivery_end": "2026-06-30",
+                "location": "CA",
+            },
+        )
+        await client.post(
+            f"/portfolio/{portfolio_id}/items", json={"contract_id": resp.json()["id"]}
+        )
+    _, expected = await portfolio_service.get_portfolio(db_session, portfolio_id)
+    metrics = await portfolio_service.compute_portfolio_metrics(
+        db_session, portfolio_id, chunk_size=1
+    )
+    assert metrics == expected
@@ -0,0 +1,113 @@
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from app.models.contract import Contract, ContractStatus
+from app.models.portfolio import Portfolio, PortfolioItem
+from app.schemas.portfolio import EnergyTypeBreakdown, PortfolioMetrics
+from app.services import portfolio_service
+from app.services.portfolio_service import _accumulate, _build_metrics, _hundredths
+
+# Column ranges: quantity_mwh Numeric(12,2), price_per_mwh Numeric(10,2), both > 0.
+quantities = st.integers(1, 10**10 - 1).map(lambda n: Decimal(n).scaleb(-2))
+prices = st.integers(1, 10**8 - 1).map(lambda n: Decimal(n).scaleb(-2))
+items = st.lists(
+    st.tuples(st.sampled_from(["Solar", "Wind", "Hydro", "Gas"]), quantities, prices),
+    max_size=60,
+)
+
+
+def _decimal_metrics(items) -> PortfolioMetrics:
+    """The Decimal arithmetic the metrics used before scaled integers."""
+    breakdown: dict[str, list] = {}
+    for energy_type, qty, price in items:
+        entry = breakdown.setdefault(energy_type, [energy_type, 0, Decimal("0"), Decimal("0")])
+        entry[1] += 1
+        entry[2] += qty
+        entry[3] += qty * price
+
+    if not breakdown:
+        return PortfolioMetrics(
+            total_contracts=0,
+            total_capacity_mwh=Decimal("0"),
+            total_cost=Decimal("0"),
+            weighted_avg_price_per_mwh=Decimal("0"),
+            breakdown_by_energy_type=[],
+        )
+    total_contracts = sum(entry[1] for entry in breakdown.values())
+    total_capacity = Decimal("0")
+    total_cost = Decimal("0")
+    for _, _, mwh, cost in breakdown.values():
+        total_capacity += mwh
+        total_cost += cost
+    return PortfolioMetrics(
+        total_contracts=total_contracts,
+        total_capacity_mwh=total_capacity,
+        total_cost=total_cost,
+        weighted_avg_price_per_mwh=(total_cost / total_capacity).quantize(Decimal("0.01")),
+        breakdown_by_energy_type=[
+            EnergyTypeBreakdown(energy_type=t, count=n, total_mwh=mwh, total_cost=cost)
+            for t, n, mwh, cost in breakdown.values()
+        ],
+    )
+
+
+@settings(max_examples=500, deadline=None)
+@given(items)
+def test_scaled_integer_metrics_match_decimal(items):
+    breakdown: dict[str, list] = {}
+    for energy_type, qty, price in items:
+        _accumulate(breakdown, energy_type, _hundredths(qty), _hundredths(price))
+    metrics = _build_metrics(breakdown.values())
+    assert metrics.model_dump_json() == _decimal_metrics(items).model_dump_json()
+
+
+@settings(max_examples=200, deadline=None)
+@given(items)
+def test_grouped_sums_convert_exactly(items):
+    # The batch path gets per-type Decimal sums from SQL (scales 2 and 4).
+    expected = _decimal_metrics(items)
+    rows = [
+        (b.energy_type, b.count, _hundredths(b.total_mwh), int(b.total_cost.scaleb(4)))
+        for b in expected.breakdown_by_energy_type
+    ]
+    assert _build_metrics(rows).model_dump_json() == expected.model_dump_json()
+
+
+@pytest.mark.asyncio
+async def test_database_scaling_is_exact(db_session):
+    # Cents that binary floats cannot represent (SQLite stores REAL) and the column extremes.
+    rng = random.Random(7)
+    values = [Decimal("0.01"), Decimal("0.29"), Decimal("0.57"), Decimal("1.15")]
+    values += [Decimal(rng.randrange(1, 10**8)).scaleb(-2) for _ in range(200)]
+    rows = [
+        (rng.choice(["Solar", "Wind", "Hydro"]), qty, rng.choice(values))
+        for qty in values + [Decimal("9999999999.99")]
+    ]
+    portfolio = Portfolio(name="exact")
+    db_session.add(portfolio)
+    await db_session.flush()
+    for energy_type, qty, price in rows:
+        contract = Contract(
+            energy_type=energy_type,
+            quantity_mwh=qty,
+            price_per_mwh=price,
+            delivery_start=date(2026, 1, 1),
+            delivery_end=date(2026, 12, 31),
+            location="CA",
+            status=ContractStatus.RESERVED,
+        )
+        db_session.add(contract)
+        await db_session.flush()
+        db_session.add(PortfolioItem(portfolio_id=portfolio.id, contract_id=contract.id))
+    await db_session.flush()
+
+    expected = _decimal_metrics(rows).model_dump_json()
+    _, metrics = await portfolio_service.get_portfolio(db_session, portfolio.id)
+    assert metrics.model_dump_json() == expected
+    streamed = await portfolio_service.compute_portfolio_metrics(db_session, portfolio.id)
+    assert streamed.model_dump_json() == expected
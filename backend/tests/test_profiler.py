@@ -0,0 +1,100 @@
+import asyncio
+import base64
+import time
+import zlib
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.profiler import ProfileStore, RequestProfilingMiddleware, request_profiles
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(get_settings(), "ADMIN_TOKEN", "secret")
+    return "secret"
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_is_admin_only(client, monkeypatch):
+    assert (await client.get("/debug/profile?seconds=0.05")).status_code == 404
+    monkeypatch.setattr(get_settings(), "ADMIN_TOKEN", "secret")
+    response = await client.get("/debug/profile?seconds=0.05", headers={"X-Admin-Token": "nope"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_formats(client, admin_token):
+    headers = {"X-Admin-Token": admin_token}
+    response = await client.get("/debug/profile?seconds=0.1&interval_ms=2", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    line = response.text.splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert stack.startswith("thread ") and int(count) > 0
+
+    response = await client.get("/debug/profile?seconds=0.1&format=speedscope", headers=headers)
+    profile = response.json()["profiles"][0]
+    frames = response.json()["shared"]["frames"]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert all(index < len(frames) for sample in profile["samples"] for index in sample)
+
+    response = await client.get("/debug/profile?seconds=600", headers=headers)
+    assert response.status_code == 422
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _child():
+    _spin(0.05)
+
+
+async def _endpoint(scope, receive, send):
+    await asyncio.create_task(_child())
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+@pytest.mark.asyncio
+async def test_request_profile_follows_spawned_tasks():
+    app = RequestProfilingMiddleware(_endpoint, token="secret")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        plain = await client.get("/")
+        assert "X-Profile" not in plain.headers
+        denied = await client.get("/", headers={"X-Profile": "1", "X-Admin-Token": "nope"})
+        assert "X-Profile" not in denied.headers
+
+        response = await client.get("/", headers={"X-Profile": "1", "X-Admin-Token": "secret"})
+    assert response.text == "ok"
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    collapsed = zlib.decompress(base64.b64decode(response.headers["X-Profile"])).decode()
+    assert "_child" in collapsed and "_spin" in collapsed
+    assert request_profiles.get(response.headers["X-Profile-Id"]).collapsed() == collapsed
+    assert asyncio.get_running_loop().get_task_factory() is None
+
+
+@pytest.mark.asyncio
+async def test_large_request_profile_is_fetched_by_id(client, admin_token):
+    app = RequestProfilingMiddleware(_endpoint, token=admin_token, max_header_bytes=0)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as profiled:
+        response = await profiled.get("/", headers={"X-Profile": "1", "X-Admin-Token": "secret"})
+    assert "X-Profile" not in response.headers
+    url = f"/debug/profile/{response.headers['X-Profile-Id']}"
+
+    assert (await client.get(url, headers={"X-Admin-Token": "nope"})).status_code == 403
+    fetched = await client.get(url, headers={"X-Admin-Token": admin_token})
+    assert "_spin" in fetched.text
+    assert fetched.headers["X-Profile-Samples"] == response.headers["X-Profile-Samples"]
+    missing = await client.get("/debug/profile/0", headers={"X-Admin-Token": admin_token})
+    assert missing.status_code == 404
+
+    store = ProfileStore(size=1)
+    first = store.add(request_profiles.get(response.headers["X-Profile-Id"]))
+    store.add(store.get(first))
+    assert store.get(first) is None
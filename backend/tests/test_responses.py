@@ -0,0 +1,64 @@
+import gzip
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.core.compression import negotiate_encoding
+from app.core.responses import ORJSONResponse
+
+
+def test_orjson_response_encodes_decimal_as_string():
+    response = ORJSONResponse({"price": Decimal("45.50"), "qty": Decimal("500.00")})
+    assert json.loads(response.body) == {"price": "45.50", "qty": "500.00"}
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("") is None
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_gzipped(client, create_contract):
+    for i in range(20):
+        await create_contract(price_per_mwh="45.50", location=f"California {i}")
+    response = await client.get(
+        "/contracts", params={"limit": 100}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["total"] == 20
+    assert response.json()["items"][0]["price_per_mwh"] == "45.50"
+
+
+@pytest.mark.asyncio
+async def test_small_response_is_not_compressed(client):
+    response = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_brotli_preferred_when_available(client, create_contract):
+    pytest.importorskip("brotli")
+    for i in range(20):
+        await create_contract(location=f"California {i}")
+    response = await client.get(
+        "/contracts", params={"limit": 100}, headers={"Accept-Encoding": "gzip, br"}
+    )
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["total"] == 20
+
+
+@pytest.mark.asyncio
+async def test_streaming_export_is_gzipped(client, create_contract):
+    for i in range(20):
+        await create_contract(location=f"California {i}")
+    async with client.stream(
+        "GET", "/contracts/export", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert gzip.decompress(raw).decode().count("California") == 20
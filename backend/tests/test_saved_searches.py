@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.core.invalidation import SAVED_SEARCHES_TOPIC, invalidation_bus
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.services.search_index import Predicate, Probe, search_index
+
+
+@pytest.fixture
+async def indexed(session_factory):
+    await search_index.start(session_factory, reconcile_seconds=3600)
+    yield search_index
+    await search_index.stop()
+
+
+async def _save(client, **criteria) -> int:
+    response = await client.post("/saved-searches", json={"name": "alert", "criteria": criteria})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _matches(client, search_id: int) -> list[tuple[int, str]]:
+    response = await client.get(f"/saved-searches/{search_id}/matches")
+    return [(m["contract_id"], m["kind"]) for m in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_writes_enqueue_matches(client, indexed, create_contract):
+    cheap_solar = await _save(client, energy_type=["Solar"], price_max="45")
+    californian = await _save(client, location="calif", qty_min="50")
+    wide = await _save(client, price_min="10", price_max="1000")
+
+    first = await create_contract(location="California")
+    second = await create_contract(energy_type="Wind", price_per_mwh="40", location="TX")
+    await client.put(f"/contracts/{first}", json={"price_per_mwh": "44"})
+    await client.put(f"/contracts/{first}", json={"delivery_end": "2026-07-31"})
+    await client.put(f"/contracts/{second}", json={"status": "Sold"})
+    await client.patch(
+        "/contracts/batch", json={"items": [{"id": second, "location": "Northern California"}]}
+    )
+
+    assert await _matches(client, cheap_solar) == [(first, "repriced")]
+    assert await _matches(client, californian) == [(first, "created"), (first, "repriced")]
+    assert await _matches(client, wide) == [
+        (first, "created"),
+        (second, "created"),
+        (first, "repriced"),
+    ]
+
+    assert (await client.delete(f"/saved-searches/{wide}")).status_code == 204
+    assert len(indexed) == 2
+    await create_contract(price_per_mwh="20")
+    assert await _matches(client, cheap_solar) == [(first, "repriced"), (first + 2, "created")]
+    assert (await client.get(f"/saved-searches/{wide}/matches")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_index_reload_and_bucketing(client, indexed):
+    await _save(client, energy_type=["Wind", "Hydro"], price_min="30", price_max="35")
+    await _save(client, price_min="0.01", price_max="9999")
+    await indexed.reload()
+    assert len(indexed) == 2
+
+    probe = Probe("Wind", 3250, 10000, "tx", *[None] * 2)
+    ranged, open_range = indexed._data.candidates(probe)
+    assert (list(ranged), list(open_range)) == ([1], [2])
+    assert indexed._data.candidates(probe._replace(price=5000)) == [open_range]
+    assert Predicate.from_criteria(9, {"location": "TX"}).matches(probe)
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_other_workers_changes(client, indexed, db_session):
+    published = []
+
+    def record():
+        published.append(1)
+
+    invalidation_bus.subscribe(SAVED_SEARCHES_TOPIC, record)
+    try:
+        kept = await _save(client, energy_type=["Wind"])
+        assert (await client.delete(f"/saved-searches/{kept}")).status_code == 204
+    finally:
+        invalidation_bus.unsubscribe(SAVED_SEARCHES_TOPIC, record)
+    assert len(published) == 2
+
+    # Rows written behind the index's back, as another worker would.
+    first = SavedSearch(name="a", criteria={"energy_type": ["Solar"]})
+    second = SavedSearch(name="b", criteria={"price_max": "40"})
+    db_session.add_all([first, second])
+    await db_session.commit()
+    await indexed.refresh()
+    assert sorted(indexed._data.predicates) == [first.id, second.id]
+
+    await db_session.delete(first)
+    await db_session.commit()
+    await indexed.refresh()
+    assert sorted(indexed._data.predicates) == [second.id]
+
+
+@pytest.mark.asyncio
+async def test_matches_are_acknowledged_and_expire(
+    client, indexed, job_runner, db_session, create_contract
+):
+    search_id = await _save(client, energy_type=["Solar"])
+    for _ in range(3):
+        await create_contract()
+    ids = [m["id"] for m in (await client.get(f"/saved-searches/{search_id}/matches")).json()]
+
+    response = await client.delete(f"/saved-searches/{search_id}/matches?through_id={ids[0]}")
+    assert response.status_code == 204
+    assert [m[0] for m in await _matches(client, search_id)] == [2, 3]
+
+    await db_session.execute(
+        update(SavedSearchMatch)
+        .where(SavedSearchMatch.id == ids[1])
+        .values(matched_at=datetime.utcnow() - timedelta(days=8))
+    )
+    await db_session.commit()
+    response = await client.post("/jobs", json={"kind": "purge_saved_search_matches"})
+    await job_runner.wait()
+    job = (await client.get(f"/jobs/{response.json()['id']}")).json()
+    assert job["result"] == {"purged": 1}
+    assert await _matches(client, search_id) == [(3, "created")]
+
+
+@pytest.mark.asyncio
+async def test_location_wildcards_are_literal(client, indexed, create_contract):
+    search_id = await _save(client, location="a_b%")
+    await create_contract(location="AxB1")
+    literal = await create_contract(location="Zone A_B%")
+
+    assert [m[0] for m in await _matches(client, search_id)] == [literal]
+    browse = (await client.get("/contracts", params={"location": "a_b%"})).json()
+    assert [c["id"] for c in browse["items"]] == [literal]
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.api.coalescing import contracts_flight, portfolio_flight
+from app.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+    runs = []
+
+    async def load():
+        runs.append(1)
+        await release.wait()
+        return "value"
+
+    waiters = [asyncio.create_task(flight.do("key", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["value"] * 5
+    assert len(runs) == 1
+    assert flight.stats() == {"calls": 5, "executions": 1, "saved": 4, "inflight": 0}
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_are_not_cached():
+    flight = SingleFlight("test")
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await flight.do("key", fail)
+
+    async def ok():
+        return 1
+
+    assert await flight.do("key", ok) == 1
+    assert flight.executions == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(flight.do("key", load))
+    second = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "value"
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_fresh_execution():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return flight.executions
+
+    stale = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    flight.forget()
+    fresh = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(stale, fresh)
+    assert flight.executions == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_list_requests_are_coalesced(client):
+    await client.post(
+        "/contracts",
+        json={
+            "energy_type": "Solar",
+            "quantity_mwh": "100",
+            "price_per_mwh": "50",
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "CA",
+        },
+    )
+    before = contracts_flight.stats()
+    responses = await asyncio.gather(
+        *[client.get("/contracts?energy_type=Solar&price_min=10.0") for _ in range(10)]
+    )
+    bodies = [response.json() for response in responses]
+    assert all(body == bodies[0] for body in bodies)
+    assert bodies[0]["total"] == 1
+
+    after = (await client.get("/debug/singleflight")).json()["contracts"]
+    assert after["calls"] - before["calls"] == 10
+    assert after["executions"] - before["executions"] < 10
+
+
+@pytest.mark.asyncio
+async def test_portfolio_read_sees_writes_after_invalidation(client, portfolio_id):
+    before = portfolio_flight.executions
+    assert (await client.get(f"/portfolio/{portfolio_id}")).json()["items"] == []
+    contract = await client.post(
+        "/contracts",
+        json={
+            "energy_type": "Wind",
+            "quantity_mwh": "10",
+            "price_per_mwh": "40",
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "TX",
+        },
+    )
+    await client.post(
+        f"/portfolio/{portfolio_id}/items", json={"contract_id": contract.json()["id"]}
+    )
+    items = (await client.get(f"/portfolio/{portfolio_id}")).json()["items"]
+    assert len(items) == 1
+    assert portfolio_flight.executions - before == 2
+    assert (await client.get("/portfolio/9999")).status_code == 404
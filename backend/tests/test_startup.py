@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.db import get_engine, wait_for_db
+from app.core.readiness import readiness
+from app.main import app
+from app.models.contract import Contract
+from app.seed import SEED_CONTRACTS, seed_database
+
+
+@pytest.mark.asyncio
+async def test_ready_warms_once(client, monkeypatch):
+    monkeypatch.setattr(readiness, "warmed", False)
+    calls = []
+
+    async def warmer():
+        calls.append(1)
+
+    monkeypatch.setattr(readiness, "warmers", [warmer])
+    for _ in range(2):
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_ready_unavailable_without_database(client, tmp_path):
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.sqlite")
+    app.dependency_overrides[get_engine] = lambda: broken
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_db_times_out(tmp_path):
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.sqlite")
+    with pytest.raises(Exception):
+        await wait_for_db(broken, timeout=0.2)
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_seed_runs_once(client, session_factory):
+    await seed_database(session_factory)
+    await seed_database(session_factory)
+    async with session_factory() as db:
+        count = await db.scalar(select(func.count(Contract.id)))
+    assert count == len(SEED_CONTRACTS)
+
+    history = (await client.get("/contracts/1/history")).text.splitlines()
+    assert [json.loads(line)["kind"] for line in history] == ["created"]
+    as_of = await client.get("/contracts/as-of", params={"at": "2100-01-01T00:00:00"})
+    as_of = as_of.text.splitlines()
+    assert len(as_of) == len(SEED_CONTRACTS)
@@ -1,6 +1,7 @@
 import { Contract, ContractListResponse, ContractFilters, PortfolioResponse } from './types'
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+const PORTFOLIO_ID = Number(process.env.NEXT_PUBLIC_PORTFOLIO_ID || 1)
 
 async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T> {
   const res = await fetch(`${API_BASE}${endpoint}`, {
@@ -40,19 +41,19 @@ export async function getContract(id: number): Promise<Contract> {
   return fetchApi<Contract>(`/contracts/${id}`)
 }
 
-export async function getPortfolio(): Promise<PortfolioResponse> {
-  return fetchApi<PortfolioResponse>('/portfolio')
+export async function getPortfolio(portfolioId: number = PORTFOLIO_ID): Promise<PortfolioResponse> {
+  return fetchApi<PortfolioResponse>(`/portfolio/${portfolioId}`)
 }
 
-export async function addToPortfolio(contractId: number): Promise<void> {
-  await fetchApi('/portfolio/items', {
+export async function addToPortfolio(contractId: number, portfolioId: number = PORTFOLIO_ID): Promise<void> {
+  await fetchApi(`/portfolio/${portfolioId}/items`, {
     method: 'POST',
     body: JSON.stringify({ contract_id: contractId }),
   })
 }
 
-export async function removeFromPortfolio(contractId: number): Promise<void> {
-  await fetchApi(`/portfolio/items/${contractId}`, { method: 'DELETE' })
+export async function removeFromPortfolio(contractId: number, portfolioId: number = PORTFOLIO_ID): Promise<void> {
+  await fetchApi(`/portfolio/${portfolioId}/items/${contractId}`, { method: 'DELETE' })
 }
 
 export interface MarketStats {
@@ -51,12 +51,15 @@ export interface PortfolioMetrics {
 
 export interface PortfolioItem {
   id: number
+  portfolio_id: number
   contract_id: number
   added_at: string
   contract: Contract
 }
 
 export interface PortfolioResponse {
+  id: number
+  name: string
   items: PortfolioItem[]
   metrics: PortfolioMetrics
 }